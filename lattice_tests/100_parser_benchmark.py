@@ -0,0 +1,142 @@
+"""
+(Unofficial) SAD to XSuite Converter: Parser Benchmark
+=============================================
+Author(s):  John P T Salvesen
+Email:      john.salvesen@cern.ch
+Date:       09-12-2025
+
+Time and memory of parsing the test lattices, with the current parser and
+the parser of a baseline git revision
+The deck is scanned in place from a memory mapped file, so the peak traced
+memory is the parsed lattice data plus a few tokens (no full size copies)
+
+Blocks is the number of memory blocks the parsed lattice data holds, from
+the tracemalloc snapshot statistics of the parse. tracemalloc only records
+blocks that are alive, so Python gives no count of the short lived blocks
+allocated and freed during the parse: the peak memory is the measure of
+those
+"""
+################################################################################
+# Required Packages
+################################################################################
+import os
+import sys
+import glob
+import time
+import subprocess
+import tracemalloc
+import importlib.util
+
+from sad2xs.config import Config
+from sad2xs.converter._001_parser import parse_sad_file
+
+################################################################################
+# User Parameters
+################################################################################
+SAD_LATTICE_PATHS           = sorted(glob.glob('lattices/*.sad'))
+N_REPEATS                   = 5
+BASELINE_REVISION           = 'fba5fb1'
+
+################################################################################
+# Support Functions
+################################################################################
+def load_baseline_parser(revision):
+    """
+    The parse_sad_file function of the parser at a git revision, or None if
+    the revision cannot be read
+    """
+    try:
+        source  = subprocess.run(
+            ['git', 'show', f'{revision}:sad2xs/converter/_001_parser.py'],
+            capture_output = True, check = True, text = True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    # Relative imports of the baseline parser resolve to the current package
+    module_name = 'sad2xs.converter._baseline_parser'
+    spec        = importlib.util.spec_from_loader(module_name, loader = None)
+    module      = importlib.util.module_from_spec(spec)
+    module.__package__  = 'sad2xs.converter'
+    sys.modules[module_name]    = module
+    exec(compile(source, f'{revision}:_001_parser.py', 'exec'), module.__dict__)
+    return module.parse_sad_file
+
+def time_parse(parse_function, sad_lattice_path, config):
+    """
+    Best time of N_REPEATS parses, without tracing
+    """
+    times   = []
+    for _ in range(N_REPEATS):
+        start_time  = time.perf_counter()
+        parse_function(sad_lattice_path, config)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+def trace_parse(parse_function, sad_lattice_path, config):
+    """
+    Lowest peak traced memory of N_REPEATS parses, and the number of blocks
+    of parsed data
+    The interpreter now and then rebuilds its table of interned strings (the
+    parsed names), and the parse that triggers it sees the table in its peak
+    """
+    peak_memories   = []
+    for _ in range(N_REPEATS):
+        tracemalloc.start()
+        parsed_lattice_data = parse_function(sad_lattice_path, config)
+        _, peak_memory      = tracemalloc.get_traced_memory()
+        snapshot            = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        del parsed_lattice_data
+        peak_memories.append(peak_memory)
+
+    n_blocks    = sum(stat.count for stat in snapshot.statistics('filename'))
+    return min(peak_memories), n_blocks
+
+################################################################################
+# Benchmark
+################################################################################
+config          = Config(_verbose = False)
+lazy_config     = Config(_verbose = False, LAZY_ELEMENT_PARAMETERS = True)
+baseline_parse  = load_baseline_parser(BASELINE_REVISION)
+if baseline_parse is None:
+    print(f"Baseline revision {BASELINE_REVISION} not found: no baseline columns")
+
+print(
+    f"{'Lattice':<28}{'Size [kB]':>10}" +\
+    f"{'Time [ms]':>11}{'Base [ms]':>11}{'Lazy [ms]':>11}" +\
+    f"{'Peak [kB]':>11}{'Base [kB]':>11}{'Peak/Size':>11}" +\
+    f"{'Blocks':>9}{'Base':>9}")
+
+for sad_lattice_path in SAD_LATTICE_PATHS:
+
+    file_size   = os.path.getsize(sad_lattice_path)
+
+    ########################################
+    # Current parser, eager and lazy parameters
+    ########################################
+    parse_time              = time_parse(parse_sad_file, sad_lattice_path, config)
+    lazy_time               = time_parse(parse_sad_file, sad_lattice_path, lazy_config)
+    peak_memory, n_blocks   = trace_parse(parse_sad_file, sad_lattice_path, config)
+
+    ########################################
+    # Baseline parser
+    ########################################
+    if baseline_parse is not None:
+        base_time               = time_parse(baseline_parse, sad_lattice_path, config)
+        base_peak, base_blocks  = trace_parse(baseline_parse, sad_lattice_path, config)
+        baseline_columns    = \
+            f"{base_time * 1E3:>11.2f}", f"{base_peak / 1E3:>11.1f}", f"{base_blocks:>9d}"
+    else:
+        baseline_columns    = f"{'-':>11}", f"{'-':>11}", f"{'-':>9}"
+
+    print(
+        f"{os.path.basename(sad_lattice_path):<28}" +\
+        f"{file_size / 1E3:>10.1f}" +\
+        f"{parse_time * 1E3:>11.2f}" +\
+        baseline_columns[0] +\
+        f"{lazy_time * 1E3:>11.2f}" +\
+        f"{peak_memory / 1E3:>11.1f}" +\
+        baseline_columns[1] +\
+        f"{peak_memory / file_size:>11.3f}" +\
+        f"{n_blocks:>9d}" +\
+        baseline_columns[2])
@@ -0,0 +1,102 @@
+"""
+(Unofficial) SAD to XSuite Converter: Tracking Benchmark
+=============================================
+Author(s):  John P T Salvesen
+Email:      john.salvesen@cern.ch
+Date:       09-12-2025
+
+Tracking throughput of the converted FCC-ee lattice
+Multipoles and solenoids are converted with the highest order they use, so
+the tracking kernels loop over fewer orders than with the fixed
+MAX_KNL_ORDER. For comparison, the same line is also tracked with every
+multipole and solenoid at MAX_KNL_ORDER
+The line is taken straight from the converter (test mode), without writing
+and reloading the lattice files
+"""
+################################################################################
+# Required Packages
+################################################################################
+import time
+import numpy as np
+import xtrack as xt
+import sad2xs as s2x
+
+from sad2xs.config import Config
+
+################################################################################
+# User Parameters
+################################################################################
+SAD_LATTICE_PATH            = 'lattices/fccee_sol.sad'
+LINE_NAME                   = 'RING'
+N_PARTICLES                 = 1000
+N_TURNS                     = 10
+N_REPEATS                   = 3
+
+################################################################################
+# Convert Lattice
+################################################################################
+line    = s2x.convert_sad_to_xsuite(
+    sad_lattice_path            = SAD_LATTICE_PATH,
+    line_name                   = LINE_NAME,
+    excluded_elements           = None,
+    user_multipole_replacements = None,
+    reverse_element_order       = False,
+    reverse_bend_direction      = False,
+    reverse_charge              = False,
+    output_directory            = 'out',
+    output_filename             = "fcc_sol_benchmark",
+    output_header               = "FCC-ee Solenoid",
+    _verbose                    = False,
+    _test_mode                  = True)
+
+################################################################################
+# Same line with the fixed order
+################################################################################
+max_order   = Config().MAX_KNL_ORDER
+fixed_line  = line.copy()
+
+for name, element in fixed_line.element_dict.items():
+    if isinstance(element, (xt.Multipole, xt.UniformSolenoid)):
+        element_dict            = element.to_dict()
+        element_dict["order"]   = max_order
+        for key in ("knl", "ksl"):
+            element_dict[key]   = np.pad(
+                getattr(element, key)[:element.order + 1],
+                (0, max_order - element.order))
+        fixed_line.element_dict[name] = element.__class__.from_dict(element_dict)
+
+################################################################################
+# Benchmark
+################################################################################
+def time_tracking(line_to_track: xt.Line) -> float:
+    """
+    Best time of N_REPEATS trackings of N_PARTICLES particles over N_TURNS
+    """
+    line_to_track.build_tracker()
+    times   = []
+    for _ in range(N_REPEATS):
+        particles   = line_to_track.build_particles(
+            x   = np.linspace(-1E-4, 1E-4, N_PARTICLES),
+            y   = np.linspace(-1E-5, 1E-5, N_PARTICLES))
+        start_time  = time.perf_counter()
+        line_to_track.track(particles, num_turns = N_TURNS)
+        times.append(time.perf_counter() - start_time)
+    return min(times)
+
+orders      = [
+    element.order for element in line.element_dict.values()
+    if isinstance(element, (xt.Multipole, xt.UniformSolenoid))]
+fixed_time  = time_tracking(fixed_line)
+time_taken  = time_tracking(line)
+
+print(f"Multipoles and solenoids: {len(orders)}, mean order {np.mean(orders):.2f}")
+print(f"{'Order':<24}{'Time [s]':>12}{'Turns/s':>12}{'Particle turns/s':>20}")
+for label, timing in (
+        (f"Fixed ({max_order})", fixed_time),
+        ("Per element", time_taken)):
+    print(
+        f"{label:<24}" +\
+        f"{timing:>12.3f}" +\
+        f"{N_TURNS / timing:>12.2f}" +\
+        f"{N_PARTICLES * N_TURNS / timing:>20.0f}")
+print(f"Speed up: {fixed_time / time_taken:.2f}")
@@ -11,6 +11,26 @@ Date:       20-11-2025
 ################################################################################
 from .main import convert_sad_to_xsuite
 
+################################################################################
+# Incremental parsing
+################################################################################
+from .converter._001_parser import IncrementalSadParser
+
+################################################################################
+# Variable to element dependency index
+################################################################################
+from .dependency_index import DependencyIndex, build_dependency_index
+
+################################################################################
+# SAD expression translation
+################################################################################
+from .expression_translator import translate_sad_expression
+
+################################################################################
+# Bulk expression evaluation
+################################################################################
+from .expression_evaluation import evaluate_expressions
+
 ################################################################################
 # Lattice and Optics writers
 ################################################################################
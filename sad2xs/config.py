@@ -77,6 +77,68 @@ class Config:
             'cavi', 'apert', 'coord',
             'mark', 'moni', 'beambeam'})
 
+    ########################################
+    # Parse Cache (disabled when the directory is None)
+    ########################################
+    PARSE_CACHE_DIRECTORY:          str | None      = None
+    PARSE_CACHE_MAX_BYTES:          int             = 512 * 1024**2
+
+    ########################################
+    # Parallel Parsing (serial when PARSE_WORKERS is 1)
+    ########################################
+    PARSE_WORKERS:                  int             = 1
+    PARSE_PARALLEL_MIN_BYTES:       int             = 4 * 1024**2
+
+    ########################################
+    # Columnar element storage (see element_store.ElementTable)
+    ########################################
+    COLUMNAR_ELEMENT_STORE:         bool            = False
+
+    ########################################
+    # Lazy element parameters (decoded on first access)
+    ########################################
+    LAZY_ELEMENT_PARAMETERS:        bool            = False
+
+    ########################################
+    # Constant folding of deferred expressions (only knobs stay live)
+    ########################################
+    FOLD_CONSTANT_EXPRESSIONS:      bool            = False
+    KNOB_VARIABLES:                 set[str]        = field(
+        default_factory = set)
+
+    ########################################
+    # Remove variables not used by the selected line
+    ########################################
+    # Knobs (KNOB_VARIABLES) are always kept
+    # Elements outside the selected line that use a removed variable are
+    # removed too, as they could no longer be converted, and so are the
+    # lines using those elements: only the selected line is sure to be in
+    # the output (as with CONVERT_SELECTED_LINE_ONLY)
+    PRUNE_UNUSED_VARIABLES:         bool            = False
+
+    ########################################
+    # Only convert the elements and sub-lines of the selected line
+    ########################################
+    # Without a line name, the longest line is estimated from the parsed
+    # element lengths
+    CONVERT_SELECTED_LINE_ONLY:     bool            = False
+
+    ########################################
+    # Create identical elements as clones of one parent
+    ########################################
+    # Elements are identical if they set the same values, variables and
+    # expressions, so elements with their own strength variables (e.g.
+    # k1_<name>) are kept apart even if the values are equal
+    # Each clone keeps its name, so the written lattice file still defines
+    # every element and is not smaller
+    DEDUPLICATE_ELEMENTS:           bool            = False
+
+    ########################################
+    # Parallel Element Conversion (serial when ELEMENT_WORKERS is 1)
+    ########################################
+    ELEMENT_WORKERS:                int             = 1
+    ELEMENT_PARALLEL_MIN_ELEMENTS:  int             = 20000
+
     ########################################
     # Reference Particle Defaults
     ########################################
@@ -104,6 +166,11 @@ class Config:
     ########################################
     # KNL, KSL array order
     ########################################
+    # Highest order read from SAD multipoles; each multipole is created with
+    # its own highest non-zero order (within KNL_ZERO_TOL) instead
+    # The gain is marginal: the FCC-ee decks simplify almost all multipoles
+    # to quadrupoles, so only ~90 elements are affected and tracking is ~1%
+    # faster (lattice_tests/101_tracking_benchmark.py)
     MAX_KNL_ORDER:                  int             = 21
     KNL_ZERO_TOL:                   float           = 1E-12
 
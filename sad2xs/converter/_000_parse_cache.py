@@ -0,0 +1,188 @@
+"""
+(Unofficial) SAD to XSuite Converter: Parse Cache
+=============================================
+Author(s):  John P T Salvesen
+Email:      john.salvesen@cern.ch
+Date:       09-12-2025
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import os
+import pickle
+import hashlib
+
+from typing import Callable
+
+from ..types import ConfigLike
+
+################################################################################
+# Cache Format
+################################################################################
+# Increase when the parsed lattice data layout changes, so that entries
+# written by an older parser are never reused
+PARSE_CACHE_VERSION = 2
+PARSE_CACHE_SUFFIX  = ".pkl"
+
+################################################################################
+# Cache Key
+################################################################################
+def get_file_hash(sad_lattice_path: str) -> str:
+    """
+    SHA-256 of the file contents
+    """
+    with open(sad_lattice_path, "rb") as sad_file:
+        return hashlib.file_digest(sad_file, "sha256").hexdigest()
+
+def get_parse_cache_key(
+        sad_file_path:  str,
+        config:         ConfigLike) -> str:
+    """
+    Key a parse on the file contents and the config fields the parser reads
+
+    Only the parse of the file itself is cached, before reference particle
+    overrides are applied, so those do not need to be part of the key
+    """
+    key_hash    = hashlib.sha256()
+    key_hash.update(f"version={PARSE_CACHE_VERSION};".encode())
+    key_hash.update(f"file={get_file_hash(sad_file_path)};".encode())
+    key_hash.update(
+        f"elements={sorted(config.SAD_ALLOWED_ELEMENTS)};".encode())
+    key_hash.update(
+        f"columnar={config.COLUMNAR_ELEMENT_STORE};".encode())
+    key_hash.update(
+        f"lazy={config.LAZY_ELEMENT_PARAMETERS};".encode())
+
+    return key_hash.hexdigest()
+
+################################################################################
+# Cache Read and Write
+################################################################################
+def load_cached_parse(cache_path: str) -> list | None:
+    """
+    Load a cached parse, returning None if missing or unreadable
+    Entries written by other versions of the package may refer to classes
+    that have since moved or been removed, so are also treated as missing
+    """
+    try:
+        with open(cache_path, "rb") as cache_file:
+            parsed_segments = pickle.load(cache_file)
+    except (
+            OSError, EOFError, pickle.UnpicklingError,
+            AttributeError, ImportError, IndexError):
+        return None
+
+    # Mark as recently used for the eviction policy
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+
+    return parsed_segments
+
+def store_cached_parse(
+        cache_path:         str,
+        parsed_segments:    list) -> None:
+    """
+    Write a parse to the cache, replacing the file atomically
+    """
+    temp_path   = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as cache_file:
+            pickle.dump(
+                parsed_segments,
+                cache_file,
+                protocol = pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+################################################################################
+# Eviction
+################################################################################
+def evict_parse_cache(
+        cache_directory:    str,
+        max_bytes:          int) -> list[str]:
+    """
+    Remove the least recently used entries until the cache fits in max_bytes
+    Returns the paths of the removed entries
+    """
+    entries = []
+    for entry in os.scandir(cache_directory):
+        if entry.is_file() and entry.name.endswith(PARSE_CACHE_SUFFIX):
+            stat    = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_bytes = sum(size for _, size, _ in entries)
+    removed     = []
+    for _, size, path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_bytes -= size
+        removed.append(path)
+
+    return removed
+
+################################################################################
+# Cached Parsing Function
+################################################################################
+def parse_file_cached(
+        sad_file_path:  str,
+        config:         ConfigLike,
+        parse_function: Callable[[str, ConfigLike], list]) -> list:
+    """
+    Parse one SAD file with parse_function, reusing an earlier parse of the
+    same contents
+
+    The cache is only used if config.PARSE_CACHE_DIRECTORY is set
+    Each call returns a fresh copy, so callers may modify the result
+
+    Parameters:
+    ----------
+    sad_file_path: str
+        Path to the SAD file
+    parse_function: Callable
+        Parser of a single file, returning its parsed segments
+
+    Outputs
+    ----------
+    parsed_segments: list
+        Parsed data of the file, split by the files it includes
+    """
+    if config.PARSE_CACHE_DIRECTORY is None:
+        return parse_function(sad_file_path, config)
+
+    ########################################
+    # Look up the cache entry
+    ########################################
+    os.makedirs(config.PARSE_CACHE_DIRECTORY, exist_ok = True)
+    cache_key   = get_parse_cache_key(sad_file_path, config)
+    cache_path  = os.path.join(
+        config.PARSE_CACHE_DIRECTORY, f"{cache_key}{PARSE_CACHE_SUFFIX}")
+
+    parsed_segments = load_cached_parse(cache_path)
+    if parsed_segments is not None:
+        if config._verbose:
+            print(f"Loaded parsed file from cache: {cache_path}")
+        return parsed_segments
+
+    ########################################
+    # Parse and store before any later stage modifies the data
+    ########################################
+    parsed_segments = parse_function(sad_file_path, config)
+
+    store_cached_parse(cache_path, parsed_segments)
+    evict_parse_cache(
+        cache_directory = config.PARSE_CACHE_DIRECTORY,
+        max_bytes       = config.PARSE_CACHE_MAX_BYTES)
+
+    if config._verbose:
+        print(f"Stored parsed file in cache: {cache_path}")
+
+    return parsed_segments
@@ -9,11 +9,23 @@ Date:       09-12-2025
 ################################################################################
 # Required Packages
 ################################################################################
+import os
+import re
+import sys
+import mmap
+import hashlib
 import xtrack as xt
 import numpy as np
 
+from typing import NamedTuple, Iterator
+from collections.abc import Mapping
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+
 from ..types import ConfigLike
 from ..helpers import print_section_heading
+from ..element_store import ElementTable
+from ._000_parse_cache import parse_file_cached
 
 ################################################################################
 # Electron Volt Conversion
@@ -39,462 +51,1326 @@ def ev_text_to_float(value_in_ev: str):
             return None
 
 ################################################################################
-# Load and Clean Whitespace
+# Lexer
 ################################################################################
-def load_and_clean_whitespace(sad_lattice_path: str):
+
+########################################
+# Token
+########################################
+class Token(NamedTuple):
+    """
+    Single lexical token of a SAD deck
+
+    kind is one of NAME, NUMBER, STRING, EQUALS, LPAREN, RPAREN, SEMICOLON, OP
+    or BODY (the source text of an element or line body, see tokenize_sad)
+    line and column are 1-based positions in the source file
     """
-    Docstring for load_and_clean_whitespace
-    
-    :param sad_lattice_path: Description
-    :type sad_lattice_path: str
+    kind:   str
+    value:  str
+    line:   int
+    column: int
+
+########################################
+# Token patterns
+########################################
+# Each match consumes the whitespace and comments before a token, so the
+# deck is scanned once with one match per token
+# Order matters: numbers must be tried before names so that ".5" is a number
+# Names may contain "$" and "." (e.g. DL$X02, QF1.1) as in SAD
+SAD_TOKEN_PATTERN = re.compile(r"""
+    (?P<SKIP>(?:\s+|![^\n]*)*)
+    (?:(?P<STRING>"[^"\n]*")
+    |(?P<NUMBER>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<NAME>[A-Za-z_$][A-Za-z0-9_$.]*)
+    |(?P<EQUALS>=)
+    |(?P<LPAREN>\()
+    |(?P<RPAREN>\))
+    |(?P<SEMICOLON>;)
+    |(?P<OP>\S)
+    |$)
+    """, re.VERBOSE)
+
+# Maximum number of distinct token values shared between tokens
+TOKEN_VALUE_CACHE_SIZE  = 2**16
+
+# Same pattern for scanning the raw bytes of a memory mapped deck
+SAD_TOKEN_PATTERN_BYTES = re.compile(
+    SAD_TOKEN_PATTERN.pattern.encode("utf-8"), re.VERBOSE)
+
+########################################
+# Token decoding
+########################################
+def decode_token(raw: str | bytes) -> str:
     """
-    ############################################################################
-    # Load SAD File to Python
-    ############################################################################
-    with open(sad_lattice_path, "r", encoding = "utf-8") as sad_file:
-        content = sad_file.read()
+    Token text as a string (tokens from a byte buffer are decoded)
+    """
+    if isinstance(raw, str):
+        return raw
+    return raw.decode("utf-8", errors = "replace")
+
+########################################
+# Element bodies (lazy parameter decoding)
+########################################
+def build_body_pattern(max_depth: int) -> str:
+    """
+    Pattern of a bracketed element body, e.g. (L = 1 K1 = (a + b) / 2),
+    with up to max_depth levels of inner brackets
+    Comments and strings are skipped, so their brackets are not counted
+    Possessive quantifiers keep a failed match from backtracking
+    """
+    body    = r'(?:[^()"!]++|"[^"\n]*"|![^\n]*)*+'
+    for _ in range(max_depth):
+        body    = r'(?:[^()"!]++|"[^"\n]*"|![^\n]*|\(' + body + r'\))*+'
+    return r"\(" + body + r"\)"
+
+# Bodies nested deeper than this are tokenized as usual
+SAD_BODY_MAX_DEPTH          = 4
+SAD_BODY_PATTERN            = re.compile(build_body_pattern(SAD_BODY_MAX_DEPTH))
+SAD_BODY_PATTERN_BYTES      = re.compile(
+    SAD_BODY_PATTERN.pattern.encode("utf-8"))
+
+# Element bodies of only "name = number" parameters, e.g. (L = 1 K1 = -.5),
+# where a sign must be written next to its number as the lexer joins them
+SAD_NUMERIC_VALUE           = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+SAD_NUMERIC_PARAMETER_PATTERN   = re.compile(
+    r"([A-Za-z_$][A-Za-z0-9_$.]*)\s*=\s*(" + SAD_NUMERIC_VALUE + r")(?=[\s)])")
+SAD_NUMERIC_BODY_PATTERN    = re.compile(
+    r"\((?:\s*" + SAD_NUMERIC_PARAMETER_PATTERN.pattern + r")*+\s*\)")
+
+# Line bodies holding any of these are tokenized rather than split
+SAD_LINE_SPECIAL_PATTERN    = re.compile(r'["();]')
+SAD_COMMENT_PATTERN         = re.compile(r"![^\n]*")
+
+def get_body_sections(config: ConfigLike) -> frozenset[str]:
+    """
+    Sections whose bracketed bodies the lexer returns whole, to be decoded
+    with one regular expression match each rather than token by token
+    """
+    return frozenset(config.SAD_ALLOWED_ELEMENTS) | {"line"}
 
-    ############################################################################
-    # Convert Overall Formatting to Xsuite Style
-    ############################################################################
+def get_lazy_sections(config: ConfigLike) -> frozenset[str]:
+    """
+    Element sections whose bodies are kept as source text, to be decoded on
+    first access
+    The columnar store decodes every parameter on insertion, so lazy
+    decoding only applies to dictionary storage
+    """
+    if config.LAZY_ELEMENT_PARAMETERS and not config.COLUMNAR_ELEMENT_STORE:
+        return frozenset(config.SAD_ALLOWED_ELEMENTS)
+    return frozenset()
+
+########################################
+# Tokenizer
+########################################
+def tokenize_sad(
+        content:            str | bytes | mmap.mmap,
+        start:              int                 = 0,
+        end:                int | None          = None,
+        line_number:        int                 = 1,
+        line_start:         int                 = 0,
+        body_sections:      frozenset[str]      = frozenset(),
+        section_command:    str | None          = None) -> Iterator[Token]:
+    """
+    Single pass lexer for SAD decks
+
+    Whitespace and comments are consumed here, and names are lowercased per
+    token, so the deck is never rewritten as a whole
+    Byte buffers (e.g. a memory mapped file) are scanned in place and only
+    the token values are decoded
+    A slice of the content can be scanned with start and end, where
+    line_number and line_start give the line at start and its offset
+
+    In sections whose command is in body_sections, each bracketed element
+    body is returned whole as a single BODY token of source text, without
+    tokenizing its contents
+    section_command is the command of a section the slice starts inside of
+    """
+    if isinstance(content, str):
+        pattern         = SAD_TOKEN_PATTERN
+        body_pattern    = SAD_BODY_PATTERN
+        newline         = "\n"
+    else:
+        pattern         = SAD_TOKEN_PATTERN_BYTES
+        body_pattern    = SAD_BODY_PATTERN_BYTES
+        newline         = b"\n"
 
-    ########################################
-    # Make naming lowercase
-    ########################################
-    content = content.lower()
+    if end is None:
+        end = len(content)
 
-    ########################################
-    # Correct Formatting Issues
-    ########################################
-    while " =" in content:
-        content = content.replace(" =", "=")
-    while "= " in content:
-        content = content.replace("= ", "=")
-    while "( " in content:
-        content = content.replace("( ", "(")
-    while " )" in content:
-        content = content.replace(" )", ")")
-    while "  " in content:
-        content = content.replace("  ", " ")
+    # Token text is decoded and lowercased once per distinct value and then
+    # shared, as names and punctuation repeat throughout a deck
+    # Numbers and strings are rarely repeated so are not kept, and the cache
+    # is bounded to keep memory flat on very large decks
+    token_values    = {}
 
-    ########################################
-    # Angle Handling
-    ########################################
-    # Ensure no spaces between the value and its unit
-    content     = content.replace(" deg", "deg")
+    # Section state, only tracked when element bodies are kept whole
+    at_section_start    = section_command is None
+    depth               = 0
 
-    ########################################
-    # Split the file into sections
-    ########################################
-    # Semicolons are used to separate element sections
-    sections    = content.split(";")
+    position    = start
+    while position is not None:
+        matches     = pattern.finditer(content, position, end)
+        position    = None
 
-    ########################################
-    # Return the section information
-    ########################################
-    return sections
+        for match in matches:
 
-################################################################################
-# Parsing Function
-################################################################################
-def parse_sad_file(
-        sad_lattice_path:       str,
-        config:                 ConfigLike) -> dict:
-    """
-    Parse lattice definitions from SAD
-    Convert a particle accelerator lattice defined in Stratgeic Accelerator 
-    Design (SAD) to the Xtrack format (part of the Xsuite packages)
-
-    Parameters:
-    ----------
-    sad_lattice_path: str
-        Path to the SAD lattice file
-        
-    Outputs
-    ----------
-    parsed_lattice_data: dict
-        Dictionary of markers and their locations
-    """
+            kind    = match.lastgroup
+            if kind == "SKIP":
+                # Trailing whitespace at the end of the file
+                continue
 
-    ############################################################################
-    # Setup
-    ############################################################################
-    parsed_sections     = []
+            ########################################
+            # Track line numbers through the skipped text
+            ########################################
+            match_start = match.start()
+            token_start = match.start(kind)
+            if token_start != match_start:
+                last_newline    = content.rfind(newline, match_start, token_start)
+                if last_newline != -1:
+                    if content.find(newline, match_start, last_newline) == -1:
+                        line_number += 1
+                    else:
+                        line_number += content[match_start:token_start].count(newline)
+                    line_start  = last_newline + 1
 
-    cleaned_globals     = {}
-    cleaned_elements    = {}
-    cleaned_expressions = {}
-    cleaned_lines       = {}
+            ########################################
+            # Keep element bodies whole
+            ########################################
+            if body_sections:
+                if kind == "SEMICOLON":
+                    at_section_start    = True
+                    depth               = 0
+                elif at_section_start:
+                    section_command     = decode_token(match.group(kind)).lower()
+                    at_section_start    = False
+                elif kind == "LPAREN":
+                    body    = None
+                    if depth == 0 and section_command in body_sections:
+                        body    = body_pattern.match(content, token_start, end)
+                    if body is not None:
+                        raw     = body.group()
+                        yield tuple.__new__(Token, (
+                            "BODY",
+                            decode_token(raw),
+                            line_number,
+                            token_start - line_start + 1))
+
+                        last_newline    = raw.rfind(newline)
+                        if last_newline != -1:
+                            line_number += raw.count(newline)
+                            line_start  = token_start + last_newline + 1
+
+                        # Resume scanning after the body
+                        position    = body.end()
+                        break
+                    depth   += 1
+                elif kind == "RPAREN":
+                    depth   -= 1
 
-    ############################################################################
-    # Load lattice and clean whitespace
-    ############################################################################
-    if config._verbose:
-        print_section_heading("Loading and Cleaning SAD File", mode = "subsection")
+            ########################################
+            # Token value
+            ########################################
+            raw     = match.group(kind)
+            value   = token_values.get(raw)
+            if value is None:
+                value   = decode_token(raw)
+                if kind != "STRING":
+                    value   = value.lower()
+                if kind != "NUMBER" and kind != "STRING" \
+                        and len(token_values) < TOKEN_VALUE_CACHE_SIZE:
+                    token_values[raw]   = value
+
+            # tuple.__new__ skips the keyword handling of the NamedTuple constructor
+            yield tuple.__new__(
+                Token, (kind, value, line_number, token_start - line_start + 1))
+
+########################################
+# Streaming file reader
+########################################
+def read_sad_tokens(
+        sad_lattice_path:   str,
+        start:              int         = 0,
+        end:                int | None  = None,
+        line_number:        int         = 1,
+        line_start:         int         = 0,
+        body_sections:      frozenset[str]  = frozenset(),
+        section_command:    str | None      = None) -> Iterator[Token]:
+    """
+    Stream the tokens of a SAD deck from a memory mapped file
 
-    sad_sections = load_and_clean_whitespace(sad_lattice_path)
+    The file is never read into a Python string, so memory use does not
+    grow with the size of the deck
+    """
+    with open(sad_lattice_path, "rb") as sad_file:
+        if os.fstat(sad_file.fileno()).st_size == 0:
+            return
+
+        with mmap.mmap(sad_file.fileno(), 0, access = mmap.ACCESS_READ) as sad_map:
+            yield from tokenize_sad(
+                sad_map, start, end, line_number, line_start,
+                body_sections, section_command)
+
+########################################
+# Token helpers
+########################################
+def tokens_adjacent(first: Token, second: Token) -> bool:
+    """
+    Check if two tokens were written with no whitespace between them
+    """
+    return first.line == second.line and \
+        second.column == first.column + len(first.value)
 
-    ############################################################################
-    # Clean each different section of the file
-    ############################################################################
-    if config._verbose:
-        print_section_heading("Cleaning Element Sections", mode = "subsection")
+def join_tokens(tokens: list[Token]) -> str:
+    """
+    Rebuild the text of a token run, keeping single spaces where the source
+    separated the tokens
+    """
+    text    = ""
+    for i, token in enumerate(tokens):
+        if i > 0 and not tokens_adjacent(tokens[i - 1], token):
+            text    += " "
+        text    += token.value
+    return text
+
+def token_error(token: Token, message: str) -> ValueError:
+    """
+    Create a parsing error that points at the offending token
+    """
+    return ValueError(
+        f"Error parsing SAD file at line {token.line}, column {token.column} " +\
+        f"('{token.value}'): {message}")
+
+########################################
+# Token stream
+########################################
+class TokenStream:
+    """
+    Token iterator with one token of lookahead
 
-    for section in sad_sections:
-        current_section = section
+    The section parsers consume tokens directly from the lexer, so a section
+    is never held in memory as a whole
+    """
+    def __init__(self, tokens: Iterator[Token]):
+        self._tokens    = tokens
+        self._next      = next(tokens, None)
+
+    def peek(self) -> Token | None:
+        """
+        Return the next token without consuming it
+        """
+        return self._next
+
+    def pop(self) -> Token:
+        """
+        Consume and return the next token
+        """
+        token       = self._next
+        if token is None:
+            raise ValueError("Error parsing SAD file: unexpected end of file.")
+        self._next  = next(self._tokens, None)
+        return token
+
+    def at_section_end(self) -> bool:
+        """
+        Check if the current section has been fully consumed
+        """
+        return self._next is None or self._next.kind == "SEMICOLON"
+
+    def iter_until(self, kind: str | None) -> Iterator[Token]:
+        """
+        Consume tokens up to (not including) the next token of this kind or
+        the end of the section, yielding them one at a time
+        The stream must not be used until the iteration is finished
+        """
+        tokens  = self._tokens
+        token   = self._next
+        while token is not None \
+                and token.kind != "SEMICOLON" \
+                and token.kind != kind:
+            yield token
+            token   = next(tokens, None)
+        self._next  = token
+
+    def skip_section(self) -> list[Token]:
+        """
+        Consume the rest of the current section, returning its tokens
+        """
+        return list(self.iter_until(None))
 
-        ########################################
-        # Remove Commented Lines
-        ########################################
-        comment_removed_section = []
-        for line in current_section.split("\n"):
-            if not line.startswith("!"):
-                # Lines that do contain content to pass
-                if "!" in line:
-                    # Trim lines that have comment part way through
-                    line = line.split("!")[0]
-                comment_removed_section.append(line)
-            else:
-                # Lines that are only comments
-                continue
-        current_section = "\n".join(comment_removed_section)
+################################################################################
+# Section Parsers
+################################################################################
 
-        ########################################
-        # Strip newlines and whitespace
-        ########################################
-        current_section = current_section.strip()
+########################################
+# Global values
+########################################
+def parse_global_value(
+        command_token:  Token,
+        stream:         TokenStream) -> str:
+    """
+    Get the value text of a global command, e.g. MOMENTUM = 120 GEV
+    """
+    value_tokens    = stream.skip_section()
+    if len(value_tokens) > 0 and value_tokens[0].kind == "EQUALS":
+        value_tokens    = value_tokens[1:]
+    if len(value_tokens) == 0:
+        raise token_error(command_token, "Missing value.")
+
+    # Units are written separately in SAD (120 GEV), so join without spaces
+    return "".join(token.value for token in value_tokens)
+
+########################################
+# Lines
+########################################
+def parse_line_components(
+        name_token: Token,
+        stream:     TokenStream) -> list[str]:
+    """
+    Components of a line, after its "(" and up to and including the
+    closing ")", split on whitespace (e.g. "-qf" is one component)
+    """
+    line_elements   = []
+    component       = None
+    component_line  = 0
+    component_end   = 0
+    for token in stream.iter_until("RPAREN"):
+        if component is not None \
+                and token.line == component_line \
+                and token.column == component_end:
+            component   += token.value
+        else:
+            if component is not None:
+                line_elements.append(component)
+            component   = token.value
+        component_line  = token.line
+        component_end   = token.column + len(token.value)
+
+    if stream.at_section_end():
+        raise token_error(name_token, "Unclosed line definition.")
+    if component is not None:
+        line_elements.append(component)
+    stream.pop()
+
+    return line_elements
+
+def decode_line_body(
+        name_token: Token,
+        body_token: Token) -> list[str]:
+    """
+    Components of a line from its body text, e.g. "(qf d -qd d)"
 
-        ########################################
-        # Remove Empty Sections
-        ########################################
-        if len(current_section) == 0:
-            continue
+    Bodies without strings, inner brackets or separators are split in one
+    pass, and others tokenized as usual
+    """
+    text    = body_token.value
+    if SAD_LINE_SPECIAL_PATTERN.search(text, 1, len(text) - 1) is None:
+        if "!" in text:
+            text    = SAD_COMMENT_PATTERN.sub(" ", text)
+        # Components repeat throughout the lines, so are shared as the token
+        # values are, one source line at a time to keep few copies alive
+        line_elements   = []
+        for source_line in text[1:-1].lower().splitlines():
+            line_elements.extend(map(sys.intern, source_line.split()))
+        return line_elements
+
+    # The text starts at the body column, so its line starts column - 1
+    # characters before the start of the text
+    stream  = TokenStream(tokenize_sad(
+        body_token.value,
+        line_number = body_token.line,
+        line_start  = 1 - body_token.column))
+    stream.pop()
+    line_elements   = parse_line_components(name_token, stream)
+    if stream.peek() is not None:
+        # Brackets inside a line close it early
+        raise token_error(stream.peek(), "Unexpected token in line definition.")
+    return line_elements
+
+def parse_line_section(stream: TokenStream) -> dict[str, list[str]]:
+    """
+    Parse a LINE section into a dictionary of line name to components
+    """
+    lines   = {}
 
-        ########################################
-        # Get the "Command" of the Section
-        ########################################
-        section_command = current_section.split()[0]
+    while not stream.at_section_end():
 
         ########################################
-        # Output the cleaned section
+        # Line name and opening bracket
         ########################################
-        parsed_sections.append(current_section)
-
-    ############################################################################
-    # Remove SAD simulation commands
-    ############################################################################
-    # e.g. on rad, on cod...
-    for section in parsed_sections[:]:
-        section_command = section.split()[0]
-
-        if section_command.startswith("on"):
-            parsed_sections.remove(section)
-            continue
-
-        if section_command.startswith("off"):
-            parsed_sections.remove(section)
+        name_token  = stream.pop()
+        if name_token.kind != "NAME":
+            raise token_error(name_token, "Expected line name.")
+
+        if not stream.at_section_end() and stream.peek().kind == "EQUALS":
+            stream.pop()
+        if not stream.at_section_end() and stream.peek().kind == "BODY":
+            lines[name_token.value] = decode_line_body(name_token, stream.pop())
             continue
+        if stream.at_section_end() or stream.peek().kind != "LPAREN":
+            raise token_error(name_token, "Expected '(' after line name.")
+        stream.pop()
 
-    ############################################################################
-    # Global Variables
-    ############################################################################
-    if config._verbose:
-        print_section_heading("Parsing Global Variables", mode = "subsection")
+        lines[name_token.value] = parse_line_components(name_token, stream)
 
-    for section in parsed_sections[:]:
-        section_command = section.split()[0]
-
-        ########################################
-        # Momentum
-        ########################################
-        if section_command.startswith("momentum"):
+    return lines
 
-            momentum    = section
-            momentum    = momentum.replace("momentum", "")
-            momentum    = momentum.replace("\n", "")
-            momentum    = momentum.replace("\t", "")
-            momentum    = momentum.replace(" ", "")
-            momentum    = momentum.replace("=", "")
+########################################
+# Element parameter values
+########################################
+def parse_parameter_value(tokens: list[Token]) -> str | float:
+    """
+    Convert the tokens of a parameter value to a float where possible
+    Angles given in degrees are converted to radians
+    """
+    if tokens[-1].kind == "NAME" and tokens[-1].value == "deg" and len(tokens) > 1:
+        return float(np.deg2rad(float("".join(t.value for t in tokens[:-1]))))
+
+    value   = join_tokens(tokens)
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+########################################
+# Element parameters
+########################################
+def parse_element_parameters(stream: TokenStream) -> dict:
+    """
+    Parse the "name = value" pairs of an element, after its "(" and up to
+    and including the closing ")"
+    """
+    ele_dict    = {}
 
-            momentum    = ev_text_to_float(momentum)
+    ########################################
+    # First parameter name
+    ########################################
+    name_token  = None
+    if not stream.at_section_end() and stream.peek().kind != "RPAREN":
+        name_token  = stream.pop()
 
-            cleaned_globals["p0c"] = momentum
+    while name_token is not None:
 
-            parsed_sections.remove(section)
-            continue
+        if name_token.kind != "NAME" \
+                or stream.at_section_end() \
+                or stream.peek().kind != "EQUALS":
+            raise token_error(name_token, "Expected format 'name = value'.")
+        stream.pop()
 
         ########################################
-        # Mass
+        # Value: runs until the next "name =" or the closing bracket
         ########################################
-        if section_command.startswith("mass"):
-
-            mass    = section
-            mass    = mass.replace("mass", "")
-            mass    = mass.replace("\n", "")
-            mass    = mass.replace("\t", "")
-            mass    = mass.replace(" ", "")
-            mass    = mass.replace("=", "")
+        value_tokens    = []
+        next_name_token = None
+        depth           = 0
+        while not stream.at_section_end():
+            if stream.peek().kind == "RPAREN" and depth == 0:
+                break
+
+            token   = stream.pop()
+            if token.kind == "LPAREN":
+                depth   += 1
+            elif token.kind == "RPAREN":
+                depth   -= 1
+            elif depth == 0 \
+                    and token.kind == "NAME" \
+                    and len(value_tokens) > 0 \
+                    and not stream.at_section_end() \
+                    and stream.peek().kind == "EQUALS":
+                next_name_token = token
+                break
+            elif depth == 0 \
+                    and token.kind in ("NAME", "NUMBER") \
+                    and token.value != "deg" \
+                    and len(value_tokens) > 0 \
+                    and value_tokens[-1].kind in ("NAME", "NUMBER", "RPAREN"):
+                # Two operands in a row: a parameter is missing its "="
+                raise token_error(token, "Expected format 'name = value'.")
+            value_tokens.append(token)
+
+        if len(value_tokens) == 0:
+            raise token_error(name_token, "Missing parameter value.")
+
+        ele_dict[name_token.value] = parse_parameter_value(value_tokens)
+        name_token  = next_name_token
+
+    if stream.at_section_end():
+        raise token_error(stream.peek() or Token("EOF", "", 0, 0),
+            "Unclosed element definition.")
+    stream.pop()
+
+    return ele_dict
+
+########################################
+# Element bodies
+########################################
+def decode_element_body(
+        text:   str,
+        line:   int,
+        column: int) -> dict:
+    """
+    Parameters of an element from its body text, e.g. "(L = 1 K1 = 0.1)",
+    which starts at the given line and column of the deck
 
-            mass    = ev_text_to_float(mass)
+    Bodies of only numeric parameters are decoded with one match, and
+    others tokenized as usual
+    """
+    if SAD_NUMERIC_BODY_PATTERN.fullmatch(text) is not None:
+        return {
+            sys.intern(name.lower()): float(value)
+            for name, value in SAD_NUMERIC_PARAMETER_PATTERN.findall(text)}
+
+    # The text starts at the given column, so its line starts column - 1
+    # characters before the start of the text
+    stream  = TokenStream(tokenize_sad(
+        text,
+        line_number = line,
+        line_start  = 1 - column))
+    stream.pop()
+    return parse_element_parameters(stream)
+
+########################################
+# Lazy element parameters
+########################################
+class LazyElementParameters(Mapping):
+    """
+    Parameters of one element, decoded on first access
 
-            cleaned_globals["mass0"] = mass
+    Holds the source text of the bracketed parameters with its position in
+    the deck, so that decoding errors point at the original line and column
+    Behaves as the parameter dictionary of the element, e.g. {"l": 1.0}
+    """
+    __slots__ = ("_text", "_line", "_column", "_parameters")
+
+    def __init__(self, text: str, line: int, column: int):
+        self._text          = text
+        self._line          = line
+        self._column        = column
+        self._parameters    = None
+
+    def _decode(self) -> dict:
+        """
+        Parse the source text into the parameter dictionary, once
+        """
+        if self._parameters is None:
+            self._parameters    = decode_element_body(
+                self._text, self._line, self._column)
+            self._text          = None
+        return self._parameters
+
+    @property
+    def is_decoded(self) -> bool:
+        """
+        Check if the parameters have been decoded
+        """
+        return self._parameters is not None
+
+    def __getitem__(self, parameter: str) -> float | str:
+        return self._decode()[parameter]
+
+    def __contains__(self, parameter: object) -> bool:
+        return parameter in self._decode()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._decode())
+
+    def __len__(self) -> int:
+        return len(self._decode())
+
+    def __repr__(self) -> str:
+        return repr(self._decode())
+
+    def __getstate__(self) -> tuple:
+        return (self._text, self._line, self._column, self._parameters)
+
+    def __setstate__(self, state: tuple) -> None:
+        self._text, self._line, self._column, self._parameters = state
+
+########################################
+# Elements
+########################################
+def parse_element_section(
+        stream:         TokenStream,
+        section_dict:   dict | ElementTable,
+        lazy:           bool = False) -> None:
+    """
+    Parse an element section (e.g. QUAD QF = (L = 1 K1 = 0.1) QD = (...))
+    into the elements of that type, one element at a time
 
-            parsed_sections.remove(section)
+    Element bodies read whole by the lexer (BODY tokens) are decoded by
+    decode_element_body, or with lazy kept as LazyElementParameters,
+    decoded when the element is first read
+    """
+    while not stream.at_section_end():
+        name_token  = stream.pop()
+        if name_token.kind != "NAME":
+            raise token_error(name_token, "Expected element name.")
+
+        if not stream.at_section_end() and stream.peek().kind == "EQUALS":
+            stream.pop()
+        if not stream.at_section_end() and stream.peek().kind == "BODY":
+            body_token  = stream.pop()
+            if lazy:
+                section_dict[name_token.value] = LazyElementParameters(
+                    body_token.value, body_token.line, body_token.column)
+            else:
+                section_dict[name_token.value] = decode_element_body(
+                    body_token.value, body_token.line, body_token.column)
             continue
+        if stream.at_section_end() or stream.peek().kind != "LPAREN":
+            raise token_error(name_token, "Expected '(' after element name.")
+        stream.pop()
 
-        ########################################
-        # Charge
-        ########################################
-        if section_command.startswith("charge"):
+        section_dict[name_token.value] = parse_element_parameters(stream)
 
-            charge  = section
-            charge  = charge.replace("charge", "")
-            charge  = charge.replace("\n", "")
-            charge  = charge.replace("\t", "")
-            charge  = charge.replace(" ", "")
-            charge  = charge.replace("=", "")
+########################################
+# Included files
+########################################
+# SAD commands that read another deck at this point, e.g. GetMAIN["file"]
+SAD_INCLUDE_COMMANDS    = {"getmain"}
 
-            charge  = float(charge)
+def parse_include_path(
+        command_token:  Token,
+        stream:         TokenStream) -> str:
+    """
+    Get the file path of an include command, e.g. GetMAIN["errors.sad"]
+    """
+    tokens  = stream.skip_section()
+    if len(tokens) != 3 \
+            or tokens[0].value != "[" \
+            or tokens[1].kind != "STRING" \
+            or tokens[2].value != "]":
+        raise token_error(command_token, 'Expected format GetMAIN["file"].')
+
+    return tokens[1].value[1:-1]
+
+########################################
+# Deferred expressions
+########################################
+def parse_expression_value(
+        equals_token:   Token,
+        stream:         TokenStream) -> str | float:
+    """
+    Convert the right hand side of an assignment to a float where it is a
+    plain number, otherwise keep the expression text
+    """
+    tokens  = stream.skip_section()
+    if len(tokens) == 0:
+        raise token_error(equals_token, "Expected format 'name = expression'.")
 
-            cleaned_globals["q0"] = charge
+    for token in tokens:
+        if token.kind == "EQUALS":
+            raise token_error(token, "Expected format 'name = expression'.")
 
-            parsed_sections.remove(section)
-            continue
+    if tokens[-1].kind == "NUMBER" and (
+            len(tokens) == 1 or
+            (len(tokens) == 2 and tokens[0].value in ("-", "+"))):
+        return float("".join(token.value for token in tokens))
 
-        ########################################
-        # Frequency Shift
-        ########################################
-        if section_command.startswith("fshift"):
+    return join_tokens(tokens)
 
-            fshift  = section
-            fshift  = fshift.replace("fshift", "")
-            fshift  = fshift.replace("\n", "")
-            fshift  = fshift.replace("\t", "")
-            fshift  = fshift.replace(" ", "")
-            fshift  = fshift.replace("=", "")
+################################################################################
+# Section Handlers
+################################################################################
+# Each handler consumes one section from the stream and writes into its own
+# entry of the parsed lattice data, so every section is classified once
+
+########################################
+# SAD simulation commands (e.g. on rad, off cod)
+########################################
+def handle_simulation_command(
+        command_token:  Token,
+        stream:         TokenStream,
+        parsed_data:    dict,
+        config:         ConfigLike) -> None:
+    """
+    Skip SAD simulation flags, which have no Xsuite equivalent here
+    """
+    stream.skip_section()
+
+########################################
+# Global Variables
+########################################
+def handle_energy_global(
+        command_token:  Token,
+        stream:         TokenStream,
+        parsed_data:    dict,
+        config:         ConfigLike) -> None:
+    """
+    Store MOMENTUM or MASS (with units) in electron volts
+    """
+    key = "p0c" if command_token.value == "momentum" else "mass0"
+    parsed_data["globals"][key] = ev_text_to_float(
+        parse_global_value(command_token, stream))
+
+def handle_scalar_global(
+        command_token:  Token,
+        stream:         TokenStream,
+        parsed_data:    dict,
+        config:         ConfigLike) -> None:
+    """
+    Store CHARGE or FSHIFT as a float
+    """
+    key = "q0" if command_token.value == "charge" else "fshift"
+    parsed_data["globals"][key] = float(
+        parse_global_value(command_token, stream))
+
+########################################
+# Lines
+########################################
+def handle_line_section(
+        command_token:  Token,
+        stream:         TokenStream,
+        parsed_data:    dict,
+        config:         ConfigLike) -> None:
+    """
+    Add the lines of a LINE section
+    """
+    parsed_data["lines"].update(parse_line_section(stream))
 
-            fshift  = float(fshift)
+########################################
+# Elements
+########################################
+def new_element_section(config: ConfigLike) -> dict | ElementTable:
+    """
+    Storage for the elements of one type
+    """
+    if config.COLUMNAR_ELEMENT_STORE:
+        return ElementTable()
+    return {}
+
+def handle_element_section(
+        command_token:  Token,
+        stream:         TokenStream,
+        parsed_data:    dict,
+        config:         ConfigLike) -> None:
+    """
+    Add the elements of an element section to those of the same type
+    """
+    if command_token.value not in parsed_data["elements"]:
+        parsed_data["elements"][command_token.value] = \
+            new_element_section(config)
+
+    parse_element_section(
+        stream          = stream,
+        section_dict    = parsed_data["elements"][command_token.value],
+        lazy            = command_token.value in get_lazy_sections(config))
+
+########################################
+# Unknown sections
+########################################
+def handle_unknown_section(
+        command_token:  Token,
+        stream:         TokenStream,
+        parsed_data:    dict,
+        config:         ConfigLike) -> None:
+    """
+    Skip a section that is not understood by the converter
+    """
+    unknown_section = [command_token] + stream.skip_section()
+    if config._verbose:
+        print("Unknown Section Includes the following information:")
+        print(join_tokens(unknown_section))
+
+########################################
+# Deferred expressions
+########################################
+# A re-assignment that refers to the variable itself (kq = kq * 2) keeps the
+# previous value as a hidden version (kq__v1), which the new expression
+# refers to instead, so expressions never grow with each re-assignment
+EXPRESSION_VERSION_SEPARATOR    = "__v"
+
+def get_variable_pattern(variable: str) -> re.Pattern:
+    """
+    Pattern matching a variable as a whole name in an expression
+    (e.g. kq, but not the kq in kq1)
+    """
+    return re.compile(
+        rf"(?<![A-Za-z0-9_$.]){re.escape(variable)}(?![A-Za-z0-9_$.])")
 
-            cleaned_globals["fshift"] = fshift
+def get_expression_version(
+        expressions:    dict,
+        variable:       str) -> str:
+    """
+    Name of the next free version of a variable
+    """
+    version = 1
+    while f"{variable}{EXPRESSION_VERSION_SEPARATOR}{version}" in expressions:
+        version += 1
+    return f"{variable}{EXPRESSION_VERSION_SEPARATOR}{version}"
+
+def remove_expression_versions(
+        expressions:    dict,
+        variable:       str) -> None:
+    """
+    Remove the versions of a variable
+    """
+    version = 1
+    while f"{variable}{EXPRESSION_VERSION_SEPARATOR}{version}" in expressions:
+        del expressions[f"{variable}{EXPRESSION_VERSION_SEPARATOR}{version}"]
+        version += 1
+
+def merge_expression(
+        expressions:    dict,
+        variable:       str,
+        expression:     str | float) -> None:
+    """
+    Add an assignment to the expressions, resolving re-assignments
+    """
+    if variable not in expressions:
+        expressions[variable] = expression
+        return
 
-            parsed_sections.remove(section)
-            continue
+    ########################################
+    # Re-assignment without the variable itself replaces it
+    ########################################
+    variable_pattern    = get_variable_pattern(variable)
+    if isinstance(expression, float) \
+            or variable_pattern.search(expression) is None:
+        # Only the replaced value referred to the versions
+        remove_expression_versions(expressions, variable)
+        expressions[variable] = expression
+        return
 
-    ############################################################################
-    # Lines
-    ############################################################################
-    if config._verbose:
-        print_section_heading("Parsing Lines", mode = "subsection")
+    ########################################
+    # Otherwise refer to a version holding the previous value
+    ########################################
+    version_name                = get_expression_version(expressions, variable)
+    expressions[version_name]   = expressions[variable]
+    expressions[variable]       = variable_pattern.sub(version_name, expression)
 
-    for section in parsed_sections[:]:
-        section_command = section.split()[0]
+def merge_expressions(
+        expressions:        dict,
+        new_expressions:    dict) -> None:
+    """
+    Add the expressions of a later part of the deck, as if its assignments
+    followed directly
+    Its versions are assigned again in order, so they are numbered after
+    those already in expressions
+    """
+    for variable, expression in new_expressions.items():
 
-        if section_command.startswith("line"):
+        base_name, separator, version = variable.rpartition(
+            EXPRESSION_VERSION_SEPARATOR)
+        if separator and version.isdigit() and base_name in new_expressions:
+            # Assigned again with its variable
+            continue
 
-            line_section    = section
-            line_section    = line_section.replace("line", "")
-            line_section    = line_section.replace("\n", "")
-            line_section    = line_section.replace("\t", "")
+        n_versions  = 0
+        while f"{variable}{EXPRESSION_VERSION_SEPARATOR}{n_versions + 1}" \
+                in new_expressions:
+            n_versions  += 1
+
+        assignments = [
+            new_expressions[f"{variable}{EXPRESSION_VERSION_SEPARATOR}{version}"]
+            for version in range(1, n_versions + 1)] + [expression]
+
+        for version, assignment in enumerate(assignments):
+            if version > 0 and isinstance(assignment, str):
+                # Refer to the variable again, as in the deck
+                assignment  = get_variable_pattern(
+                    f"{variable}{EXPRESSION_VERSION_SEPARATOR}{version}").sub(
+                        variable, assignment)
+            merge_expression(expressions, variable, assignment)
+
+def handle_expression(
+        command_token:  Token,
+        stream:         TokenStream,
+        parsed_data:    dict,
+        config:         ConfigLike) -> None:
+    """
+    Store a variable assignment (e.g. kqf = 0.1 * k0)
+    """
+    merge_expression(
+        expressions = parsed_data["expressions"],
+        variable    = command_token.value,
+        expression  = parse_expression_value(stream.pop(), stream))
+
+########################################
+# Dispatch tables
+########################################
+# Globals may be written with or without "=" (MOMENTUM = 120 GEV)
+GLOBAL_HANDLERS = {
+    "momentum":     handle_energy_global,
+    "mass":         handle_energy_global,
+    "charge":       handle_scalar_global,
+    "fshift":       handle_scalar_global}
+
+# Definitions never take "=" after the command (LINE A = (...))
+DEFINITION_HANDLERS = {
+    "on":           handle_simulation_command,
+    "off":          handle_simulation_command,
+    "line":         handle_line_section}
+
+def build_section_handlers(config: ConfigLike) -> tuple[dict, dict]:
+    """
+    Build the command to handler tables for definitions and assignments
+    """
+    definition_handlers = {
+        **{element_type: handle_element_section
+            for element_type in config.SAD_ALLOWED_ELEMENTS},
+        **DEFINITION_HANDLERS,
+        **GLOBAL_HANDLERS}
+    assignment_handlers = dict(GLOBAL_HANDLERS)
 
-            ########################################
-            # Split into lines by closing bracket
-            ########################################
-            lines   = line_section.split(")")
+    return definition_handlers, assignment_handlers
 
-            ########################################
-            # Process each line
-            ########################################
-            for line in lines:
-                if len(line) == 0:
-                    continue
+################################################################################
+# Section Loop
+################################################################################
+def new_parsed_data() -> dict:
+    """
+    Empty parsed lattice data
+    """
+    return {
+        "globals":      {},
+        "lines":        {},
+        "elements":     {},
+        "expressions":  {}}
 
-                line_name, line_content = line.split("=")
+def copy_parsed_data(parsed_data: dict) -> dict:
+    """
+    Copy of parsed lattice data that later stages may modify
+    The parameters of each element are shared, as no stage modifies them
+    """
+    return {
+        "globals":      dict(parsed_data["globals"]),
+        "lines":        {
+            name: list(components)
+            for name, components in parsed_data["lines"].items()},
+        "elements":     {
+            element_type: dict(section_dict)
+            for element_type, section_dict in parsed_data["elements"].items()},
+        "expressions":  dict(parsed_data["expressions"])}
+
+def parse_sections(
+        tokens:             Iterator[Token],
+        config:             ConfigLike,
+        section_command:    str | None  = None) -> list[dict | str]:
+    """
+    Dispatch every section of a token stream to its handler
 
-                line_name       = line_name.replace(" ", "")
-                line_content    = line_content.replace("(", "")
-                line_content    = line_content.replace("\n", " ")
-                line_content    = line_content.replace("\t", " ")
+    Returns the parsed data as segments: dictionaries of parsed data split
+    by the paths of included files (GetMAIN["file"]), in file order
+    If section_command is given, the stream starts part way through an
+    element section of that type
+    """
+    segments    = []
+    parsed_data = new_parsed_data()
+    definition_handlers, assignment_handlers = build_section_handlers(config)
 
-                line_elements = []
-                for element in line_content.split():
-                    if len(element) > 0:
-                        line_elements.append(element)
+    stream  = TokenStream(tokens)
+    if section_command is not None and stream.peek() is not None:
+        handle_element_section(
+            Token("NAME", section_command, stream.peek().line, 0),
+            stream, parsed_data, config)
 
-                cleaned_lines[line_name] = line_elements
+    while stream.peek() is not None:
 
-            parsed_sections.remove(section)
+        ########################################
+        # Skip the section separators
+        ########################################
+        if stream.peek().kind == "SEMICOLON":
+            stream.pop()
             continue
 
-    ############################################################################
-    # Elements
-    ############################################################################
-    if config._verbose:
-        print_section_heading("Parsing Elements", mode = "subsection")
+        command_token   = stream.pop()
+        if command_token.kind != "NAME":
+            handle_unknown_section(command_token, stream, parsed_data, config)
+            continue
 
-    for section in parsed_sections[:]:
-        section_command = section.split()[0]
+        ########################################
+        # Included files start a new segment
+        ########################################
+        if command_token.value in SAD_INCLUDE_COMMANDS \
+                and not stream.at_section_end() \
+                and stream.peek().value == "[":
+            segments.append(parsed_data)
+            segments.append(parse_include_path(command_token, stream))
+            parsed_data = new_parsed_data()
+            continue
 
-        if section_command in config.SAD_ALLOWED_ELEMENTS:
-            section_dict    = {}
+        ########################################
+        # Dispatch on the command
+        ########################################
+        # Commands such as "mark = 1" are assignments, not definitions
+        if not stream.at_section_end() and stream.peek().kind == "EQUALS":
+            handler = assignment_handlers.get(
+                command_token.value, handle_expression)
+        else:
+            handler = definition_handlers.get(
+                command_token.value, handle_unknown_section)
 
-            ########################################
-            # Convert to Dictionary Style
-            ########################################
-            element_section = section
-            element_section = element_section.removeprefix(section_command)
-            element_section = element_section.replace("\n ", " ")
-            element_section = element_section.replace(" \n", " ")
-            element_section = element_section.replace("\n", " ")
-            element_section = element_section.replace("\t", " ")
-            element_section = element_section.replace(")", "),")
+        handler(command_token, stream, parsed_data, config)
 
-            ########################################
-            # Split the section into elements
-            ########################################
-            elements    = element_section.split(",")
+    segments.append(parsed_data)
+    return segments
 
-            ########################################
-            # Process each element
-            ########################################
-            for element in elements:
-                ele_dict    = {}
+################################################################################
+# Parallel Parsing
+################################################################################
+# Section separators and brackets, skipping comments and strings as the
+# lexer does
+SAD_BOUNDARY_PATTERN    = re.compile(rb'![^\n]*|"[^"\n]*"|[();]')
+# Command at the start of a section, and whether it is an assignment
+SAD_COMMAND_PATTERN     = re.compile(
+    rb'(?:\s+|![^\n]*)*([A-Za-z_$][A-Za-z0-9_$.]*)(?:\s+|![^\n]*)*(=)?')
+PARSE_CHUNKS_PER_WORKER = 4
+
+########################################
+# Section and element boundaries
+########################################
+def get_element_command(
+        content:        bytes | mmap.mmap,
+        section_start:  int,
+        config:         ConfigLike) -> str | None:
+    """
+    Element type of the section starting at this offset, if any
+    """
+    match   = SAD_COMMAND_PATTERN.match(content, section_start)
+    if match is None or match.group(2) is not None:
+        return None
+    command = match.group(1).decode("utf-8").lower()
+    if command not in config.SAD_ALLOWED_ELEMENTS:
+        return None
+    return command
+
+def iter_sad_boundaries(
+        content:    bytes | mmap.mmap,
+        config:     ConfigLike) -> Iterator[tuple[int, str | None]]:
+    """
+    Offsets at which a deck can be split without breaking a definition
 
-                while element.startswith(" "):
-                    element = element[1:]
+    Boundaries are after a ";" or, inside an element section, after a
+    complete element definition, as SAD decks often hold every element of
+    a type in one section
+    Yields (offset, section_command), where section_command is the element
+    type of the section that continues after the offset (None after a ";")
+    """
+    section_command = get_element_command(content, 0, config)
+    depth           = 0
+
+    for match in SAD_BOUNDARY_PATTERN.finditer(content):
+        character   = content[match.start()]
+
+        if character == ord(";"):
+            section_command = get_element_command(content, match.end(), config)
+            depth           = 0
+            yield match.end(), None
+        elif character == ord("("):
+            depth   += 1
+        elif character == ord(")"):
+            depth   -= 1
+            if depth == 0 and section_command is not None:
+                yield match.end(), section_command
+
+########################################
+# Split the file into chunks
+########################################
+def split_sad_file(
+        sad_lattice_path:   str,
+        n_chunks:           int,
+        config:             ConfigLike) -> list[tuple]:
+    """
+    Split a deck into byte ranges of similar size, ending on boundaries
+    from iter_sad_boundaries
 
-                if len(element) == 0:
-                    continue
+    Each chunk is (start, end, line_number, line_start, section_command),
+    where the first four are as taken by read_sad_tokens and
+    section_command is the element type of a section the chunk starts in
+    """
+    with open(sad_lattice_path, "rb") as sad_file:
+        file_size   = os.fstat(sad_file.fileno()).st_size
+        if file_size == 0 or n_chunks < 2:
+            return [(0, file_size, 1, 0, None)]
 
-                ########################################
-                # Split the name and variables
-                ########################################
-                ele_name, ele_vars = element.split("(")
+        with mmap.mmap(sad_file.fileno(), 0, access = mmap.ACCESS_READ) as sad_map:
 
-                ########################################
-                # Handle the element name
-                ########################################
-                ele_name    = ele_name.replace(" ", "")
-                ele_name    = ele_name.replace("=", "")
+            targets         = [file_size * i // n_chunks for i in range(1, n_chunks)]
+            chunks          = []
+            chunk_start     = 0
+            chunk_command   = None
+            line_number     = 1
+            line_start      = 0
 
-                ########################################
-                # Handle the element variables
-                ########################################
-                ele_vars    = ele_vars.replace(")", "")
-                ele_vars    = ele_vars.replace("\n", "")
-                while "= " in ele_vars:
-                    ele_vars    = ele_vars.replace("= ", "=")
+            for split, next_command in iter_sad_boundaries(sad_map, config):
 
                 ########################################
-                # Process data in each element
+                # Split once past the next target
                 ########################################
-                tokens  = ele_vars.split(" ")
-                for token in tokens:
-
-                    if len(token) == 0:
-                        continue
-
-                    ########################################
-                    # Angle handling
-                    ########################################
-                    if "deg" in token:
-                        token_name, token_value = token.split("=")
-
-                        token_value = token_value.replace("deg", "")
-                        token_value = float(token_value)
-                        token_value = np.deg2rad(token_value)
-                        token = token_name + "=" + str(token_value)
-
-                    try:
-                        var_name, var_value = token.split("=")
-                    except ValueError:
-                        raise ValueError(
-                            f"Error parsing token: {token}. "
-                            "Expected format 'name = value'.")
+                if split < targets[0]:
+                    continue
 
-                    try:
-                        var_value = float(var_value)
-                        ele_dict[var_name] = var_value
-                    except ValueError:
-                        ele_dict[var_name] = var_value
+                chunks.append(
+                    (chunk_start, split, line_number, line_start, chunk_command))
+
+                line_number += sad_map[chunk_start:split].count(b"\n")
+                last_newline = sad_map.rfind(b"\n", chunk_start, split)
+                if last_newline != -1:
+                    line_start  = last_newline + 1
+                chunk_start     = split
+                chunk_command   = next_command
+
+                while len(targets) > 0 and targets[0] <= split:
+                    targets.pop(0)
+                if len(targets) == 0:
+                    break
+
+    chunks.append((chunk_start, file_size, line_number, line_start, chunk_command))
+    return chunks
+
+########################################
+# Worker
+########################################
+def parse_sad_chunk(
+        sad_lattice_path:   str,
+        chunk:              tuple,
+        config:             ConfigLike) -> dict:
+    """
+    Parse one chunk of a deck (run in a worker process)
+    """
+    start, end, line_number, line_start, section_command = chunk
+
+    return parse_sections(
+        tokens          = read_sad_tokens(
+            sad_lattice_path, start, end, line_number, line_start,
+            get_body_sections(config), section_command),
+        config          = config,
+        section_command = section_command)
+
+########################################
+# Ordered merge
+########################################
+def merge_parsed_data(
+        parsed_data:    dict,
+        chunk_data:     dict,
+        config:         ConfigLike) -> None:
+    """
+    Merge the parse of a later chunk or file, as if its sections followed
+    directly
+    Entries missing from parsed_data are taken over without copying
+    """
+    parsed_data["globals"].update(chunk_data["globals"])
+    parsed_data["lines"].update(chunk_data["lines"])
 
-                section_dict[ele_name] = ele_dict
+    for element_type, section_dict in chunk_data["elements"].items():
+        if element_type not in parsed_data["elements"]:
+            parsed_data["elements"][element_type] = section_dict
+        else:
+            parsed_data["elements"][element_type].update(section_dict)
 
-            ########################################
-            # Add elements
-            ########################################
-            if section_command in cleaned_elements:
-                cleaned_elements[section_command].update(section_dict)
-            else:
-                cleaned_elements[section_command] = section_dict
+    if len(parsed_data["expressions"]) == 0:
+        parsed_data["expressions"] = chunk_data["expressions"]
+    else:
+        merge_expressions(parsed_data["expressions"], chunk_data["expressions"])
 
-            parsed_sections.remove(section)
-            continue
+def append_segments(
+        segments:       list[dict | str],
+        new_segments:   list[dict | str],
+        config:         ConfigLike) -> None:
+    """
+    Append parsed segments, merging neighbouring parsed data
+    """
+    for segment in new_segments:
+        if isinstance(segment, dict) \
+                and len(segments) > 0 \
+                and isinstance(segments[-1], dict):
+            merge_parsed_data(segments[-1], segment, config)
+        else:
+            segments.append(segment)
+
+########################################
+# Parallel parse
+########################################
+def parse_sections_parallel(
+        sad_file_path:  str,
+        config:         ConfigLike) -> list[dict | str]:
+    """
+    Parse chunks of a deck in a process pool and merge them in file order
+    """
+    chunks  = split_sad_file(
+        sad_lattice_path    = sad_file_path,
+        n_chunks            = config.PARSE_WORKERS * PARSE_CHUNKS_PER_WORKER,
+        config              = config)
 
-    ############################################################################
-    # Deferred expressions
-    ############################################################################
     if config._verbose:
-        print_section_heading("Parsing Deferred Expressions", mode = "subsection")
+        print(f"Parsing {len(chunks)} chunks with {config.PARSE_WORKERS} workers")
 
-    for section in parsed_sections[:]:
-        section_command = section.split()[0]
+    segments    = []
+    with ProcessPoolExecutor(max_workers = config.PARSE_WORKERS) as executor:
+        for chunk_segments in executor.map(
+                parse_sad_chunk,
+                repeat(sad_file_path),
+                chunks,
+                repeat(config)):
+            append_segments(segments, chunk_segments, config)
 
-        ########################################
-        # If no equals sign, skip the section
-        ########################################
-        if "=" not in section:
-            if config._verbose:
-                print("Unknown Section Includes the following information:")
-                print(section)
+    return segments
 
-            parsed_sections.remove(section)
-            continue
-
-        ########################################
-        # Split information based on the equals sign
-        ########################################
-        try:
-            variable, expression = section.split("=")
-        except ValueError:
-            raise ValueError(
-                f"Error parsing section: {section}. "
-                "Expected format 'name = expression'.")
+################################################################################
+# Single File Parsing
+################################################################################
+def parse_sad_file_segments(
+        sad_file_path:  str,
+        config:         ConfigLike) -> list[dict | str]:
+    """
+    Parse one SAD file into segments, without following its includes
+    """
+    # Small decks are parsed serially, as starting workers costs more
+    if config.PARSE_WORKERS > 1 and \
+            os.path.getsize(sad_file_path) >= config.PARSE_PARALLEL_MIN_BYTES:
+        return parse_sections_parallel(sad_file_path, config)
+
+    return parse_sections(
+        tokens  = read_sad_tokens(
+            sad_file_path, body_sections = get_body_sections(config)),
+        config  = config)
+
+def merge_sad_file(
+        parsed_data:    dict,
+        sad_file_path:  str,
+        config:         ConfigLike,
+        including:      tuple[str, ...] = ()) -> None:
+    """
+    Merge a SAD file into the parsed data, following its includes in place
 
-        ########################################
-        # Convert to Float if Possible
-        ########################################
-        if all(char in "0123456789-." for char in expression) \
-                and expression.count(".") <= 1 \
-                and expression.count("-") <= 1:
+    Each file is parsed (or loaded from the parse cache) on its own, so
+    changing one file only re-parses that file
+    Included paths are relative to the including file
+    """
+    file_key    = os.path.realpath(sad_file_path)
+    if file_key in including:
+        raise ValueError(
+            f"Error parsing SAD file: {sad_file_path} includes itself " +\
+            f"(via {' -> '.join(including)}).")
 
-            cleaned_expressions[variable] = float(expression)
-            continue
+    if config._verbose:
+        print(f"Parsing file: {sad_file_path}")
+
+    segments    = parse_file_cached(
+        sad_file_path   = sad_file_path,
+        config          = config,
+        parse_function  = parse_sad_file_segments)
+
+    for segment in segments:
+        if isinstance(segment, str):
+            merge_sad_file(
+                parsed_data     = parsed_data,
+                sad_file_path   = os.path.join(
+                    os.path.dirname(sad_file_path), segment),
+                config          = config,
+                including       = including + (file_key,))
         else:
+            merge_parsed_data(parsed_data, segment, config)
 
-            ########################################
-            # Check if the expression is duplicated
-            ########################################
-            if variable not in cleaned_expressions:
-                cleaned_expressions[variable] = expression
-                continue
-            else:
-                ########################################
-                # If duplicate, create new with all dependencies
-                ########################################
-                previous_expression = cleaned_expressions[variable]
-
-                if isinstance(previous_expression, float):
-                    previous_expression = str(previous_expression)
-
-                new_expression      = expression.replace(
-                    variable, previous_expression)
-
-                cleaned_expressions[variable] = new_expression
-                continue
-
-    ############################################################################
-    # Address missing momentum and mass and charge
-    ############################################################################
+################################################################################
+# Global Defaults
+################################################################################
+def finalise_globals(
+        cleaned_globals:    dict,
+        config:             ConfigLike) -> None:
+    """
+    Fill in missing reference particle globals and apply user overrides
+    """
     if "mass0" not in cleaned_globals and config.ref_particle_mass0 is None:
         cleaned_globals["mass0"] = xt.ELECTRON_MASS_EV
         if config._verbose:
@@ -538,13 +1414,404 @@ def parse_sad_file(
         if config._verbose:
             print("Notice! No fshift found in SAD file or function input: Using fshift of 0.0")
 
+################################################################################
+# Parsing Function
+################################################################################
+def parse_sad_file(
+        sad_lattice_path:       str | list[str],
+        config:                 ConfigLike) -> dict:
+    """
+    Parse lattice definitions from SAD
+    Convert a particle accelerator lattice defined in Stratgeic Accelerator 
+    Design (SAD) to the Xtrack format (part of the Xsuite packages)
+
+    Parameters:
+    ----------
+    sad_lattice_path: str | list[str]
+        Path to the SAD lattice file, or paths of several files to be read
+        in order (e.g. lattice, strengths, errors)
+        
+    Outputs
+    ----------
+    parsed_lattice_data: dict
+        Dictionary of markers and their locations
+    """
+
+    ############################################################################
+    # Stream the file and parse each section as it is read
+    ############################################################################
+    if config._verbose:
+        print_section_heading("Streaming and Parsing SAD File", mode = "subsection")
+
+    # Several files (e.g. lattice, strengths, errors) are merged in order
+    if isinstance(sad_lattice_path, str):
+        sad_file_paths  = [sad_lattice_path]
+    else:
+        sad_file_paths  = list(sad_lattice_path)
+
+    parsed_data = new_parsed_data()
+    for sad_file_path in sad_file_paths:
+        merge_sad_file(parsed_data, sad_file_path, config)
+
+    ############################################################################
+    # Address missing momentum and mass and charge
+    ############################################################################
+    finalise_globals(parsed_data["globals"], config)
+
     ############################################################################
     # Return the Parsed Data
     ############################################################################
-    parsed_lattice_data = {
-        "globals":      cleaned_globals,
-        "lines":        cleaned_lines,
-        "elements":     cleaned_elements,
-        "expressions":  cleaned_expressions}
+    return parsed_data
+
+################################################################################
+# Incremental Parsing
+################################################################################
+class IncrementalSadParser:
+    """
+    Re-parse a deck after edits, re-tokenizing only the parts that changed
+
+    The deck is split into parts on the boundaries of iter_sad_boundaries
+    (each section, and each element of an element section), and every part
+    is fingerprinted by its contents. On the next parse only parts with a
+    new fingerprint are tokenized, and only the names they define (or used
+    to define) are updated in parsed_lattice_data, which is patched in place
+
+    After each parse, changes holds the names that were added, removed or
+    changed, per category ("globals", "lines", "elements", "expressions")
+    """
+    CATEGORIES  = ("globals", "lines", "elements", "expressions")
+
+    # Config settings that change the parsed data
+    PARSE_SETTINGS  = (
+        "SAD_ALLOWED_ELEMENTS",
+        "COLUMNAR_ELEMENT_STORE",
+        "LAZY_ELEMENT_PARAMETERS",
+        "ref_particle_mass0",
+        "ref_particle_q0",
+        "ref_particle_p0c")
+
+    def __init__(self, config: ConfigLike):
+        self.config                 = config
+        self.parsed_lattice_data    = None
+        self.changes                = None
+        self._parts:            list[tuple]         = []
+        self._part_segments:    dict[tuple, list]   = {}
+
+    def check_config(self, config: ConfigLike) -> None:
+        """
+        Raise a ValueError if config parses differently from the config of
+        the parser, as the parser always parses with its own
+        """
+        differences = [
+            setting for setting in self.PARSE_SETTINGS
+            if getattr(config, setting) != getattr(self.config, setting)]
+        if len(differences) > 0:
+            raise ValueError(
+                "Error! The incremental parser was created with different " +\
+                f"parse settings ({', '.join(differences)}). " +\
+                "Create it with the config used for the conversion.")
+
+    ########################################
+    # Collect the parts of a deck
+    ########################################
+    def _collect_parts(
+            self,
+            sad_file_path:  str,
+            parts:          list[tuple],
+            part_segments:  dict[tuple, list],
+            including:      tuple[str, ...] = ()) -> int:
+        """
+        Append the (fingerprint, parsed data) parts of a file in order,
+        following its includes, and return the number of parts tokenized
+        The parsed segments of each fingerprint are added to part_segments
+        """
+        file_key    = os.path.realpath(sad_file_path)
+        if file_key in including:
+            raise ValueError(
+                f"Error parsing SAD file: {sad_file_path} includes itself " +\
+                f"(via {' -> '.join(including)}).")
+
+        with open(sad_file_path, "rb") as sad_file:
+            file_size   = os.fstat(sad_file.fileno()).st_size
+            if file_size == 0:
+                return 0
+
+            with mmap.mmap(sad_file.fileno(), 0, access = mmap.ACCESS_READ) as sad_map:
+
+                n_parsed        = 0
+                part_start      = 0
+                part_command    = None
+                line_number     = 1
+                line_start      = 0
+                boundaries      = list(iter_sad_boundaries(sad_map, self.config))
+                boundaries.append((file_size, None))
+
+                for part_end, next_command in boundaries:
+                    if part_end == part_start:
+                        continue
+
+                    ########################################
+                    # Reuse the last parse of identical contents
+                    ########################################
+                    digest  = hashlib.blake2b(
+                        sad_map[part_start:part_end], digest_size = 16).digest()
+                    key     = (part_command, digest)
+                    if key in self._part_segments:
+                        segments    = self._part_segments[key]
+                    else:
+                        segments    = parse_sections(
+                            tokens          = tokenize_sad(
+                                sad_map, part_start, part_end,
+                                line_number, line_start,
+                                get_body_sections(self.config),
+                                part_command),
+                            config          = self.config,
+                            section_command = part_command)
+                        n_parsed    += 1
+                    part_segments[key]  = segments
+
+                    ########################################
+                    # Add the parts, expanding included files in place
+                    ########################################
+                    for index, segment in enumerate(segments):
+                        parts.append(((*key, index), segment))
+                        if isinstance(segment, str):
+                            n_parsed    += self._collect_parts(
+                                sad_file_path   = os.path.join(
+                                    os.path.dirname(sad_file_path), segment),
+                                parts           = parts,
+                                part_segments   = part_segments,
+                                including       = including + (file_key,))
+
+                    line_number += sad_map[part_start:part_end].count(b"\n")
+                    last_newline = sad_map.rfind(b"\n", part_start, part_end)
+                    if last_newline != -1:
+                        line_start  = last_newline + 1
+                    part_start      = part_end
+                    part_command    = next_command
+
+        return n_parsed
+
+    ########################################
+    # Names defined by a part
+    ########################################
+    @staticmethod
+    def _part_names(segment: dict | str) -> Iterator[tuple[str, str]]:
+        """
+        (category, name) of every definition in a part
+        """
+        if isinstance(segment, str):
+            return
+        for category in ("globals", "lines", "expressions"):
+            for name in segment[category]:
+                yield category, name
+        for section_dict in segment["elements"].values():
+            for name in section_dict:
+                yield "elements", name
+
+    ########################################
+    # Value of a name after all parts
+    ########################################
+    @staticmethod
+    def _resolve(
+            category:   str,
+            name:       str,
+            segments:   list[dict]) -> tuple | None:
+        """
+        Merged definition of a name from the parts defining it, in order
+        Elements resolve to (element type, parameters)
+        """
+        segment = segments[-1]
+        if category == "elements":
+            # A part defines a name for at most one element type
+            for element_type, section_dict in segment["elements"].items():
+                if name in section_dict:
+                    return (element_type, section_dict[name])
+
+        return (segment[category][name], )
+
+    def _current(self, category: str, name: str) -> tuple | None:
+        """
+        Definition of a name in the current parsed lattice data
+        """
+        parsed_data = self.parsed_lattice_data
+        if category == "elements":
+            for element_type, section_dict in parsed_data["elements"].items():
+                if name in section_dict:
+                    return (element_type, dict(section_dict[name]))
+            return None
+
+        if name in parsed_data[category]:
+            return (parsed_data[category][name], )
+        return None
+
+    ########################################
+    # Parse
+    ########################################
+    def parse(self, sad_lattice_path: str | list[str]) -> dict:
+        """
+        Parse the deck, patching the result of the previous parse
+
+        Parameters:
+        ----------
+        sad_lattice_path: str | list[str]
+            Path to the SAD lattice file, or paths of several files
+
+        Outputs
+        ----------
+        parsed_lattice_data: dict
+            The same dictionary on every call, patched in place
+        """
+        config  = self.config
+
+        if isinstance(sad_lattice_path, str):
+            sad_file_paths  = [sad_lattice_path]
+        else:
+            sad_file_paths  = list(sad_lattice_path)
+
+        ########################################
+        # Fingerprint the parts and tokenize new ones
+        ########################################
+        parts           = []
+        part_segments   = {}
+        n_parsed        = 0
+        for sad_file_path in sad_file_paths:
+            n_parsed    += self._collect_parts(
+                sad_file_path, parts, part_segments)
+
+        if config._verbose:
+            print(f"Tokenized {n_parsed} of {len(parts)} parts")
+
+        ########################################
+        # Names whose definition may have changed
+        ########################################
+        old_keys    = {key for key, _ in self._parts}
+        new_keys    = {key for key, _ in parts}
+        affected    = set()
+        for key, segment in self._parts:
+            if key not in new_keys:
+                affected.update(self._part_names(segment))
+        for key, segment in parts:
+            if key not in old_keys:
+                affected.update(self._part_names(segment))
+
+        # Moving a part changes which definition comes last
+        if [key for key, _ in self._parts if key in new_keys] != \
+                [key for key, _ in parts if key in old_keys]:
+            for _, segment in parts:
+                affected.update(self._part_names(segment))
+
+        ########################################
+        # Parts defining each affected name, in order
+        ########################################
+        defining    = {}
+        for _, segment in parts:
+            for category_name in self._part_names(segment):
+                if category_name in affected:
+                    defining.setdefault(category_name, []).append(segment)
+
+        ########################################
+        # Patch the parsed lattice data in place
+        ########################################
+        if self.parsed_lattice_data is None:
+            self.parsed_lattice_data    = new_parsed_data()
+        parsed_data = self.parsed_lattice_data
+        old_globals = dict(parsed_data["globals"])
+
+        changes = {
+            category: {"added": set(), "removed": set(), "changed": set()}
+            for category in self.CATEGORIES}
+
+        for category, name in affected:
+            if category in ("globals", "expressions"):
+                # Rebuilt below from every part
+                continue
+
+            old_value   = self._current(category, name)
+            new_value   = None
+            if (category, name) in defining:
+                new_value   = self._resolve(
+                    category, name, defining[(category, name)])
+
+            ########################################
+            # Remove the old definition
+            ########################################
+            if old_value is not None:
+                if category == "elements":
+                    del parsed_data["elements"][old_value[0]][name]
+                    if len(parsed_data["elements"][old_value[0]]) == 0:
+                        del parsed_data["elements"][old_value[0]]
+                else:
+                    del parsed_data[category][name]
+
+            ########################################
+            # Add the new definition
+            ########################################
+            if new_value is not None:
+                if category == "elements":
+                    element_type, parameters = new_value
+                    if element_type not in parsed_data["elements"]:
+                        parsed_data["elements"][element_type] = \
+                            new_element_section(config)
+                    parsed_data["elements"][element_type][name] = parameters
+                    new_value   = (element_type, dict(parameters))
+                else:
+                    parsed_data[category][name] = new_value[0]
+
+            if old_value is None and new_value is not None:
+                changes[category]["added"].add(name)
+            elif old_value is not None and new_value is None:
+                changes[category]["removed"].add(name)
+            elif old_value != new_value:
+                changes[category]["changed"].add(name)
+
+        ########################################
+        # Expressions, as re-assignments refer to earlier parts
+        ########################################
+        old_expressions = dict(parsed_data["expressions"])
+        if any(category == "expressions" for category, _ in affected):
+            new_expressions = {}
+            for _, segment in parts:
+                if not isinstance(segment, str):
+                    merge_expressions(new_expressions, segment["expressions"])
+            parsed_data["expressions"].clear()
+            parsed_data["expressions"].update(new_expressions)
+
+        new_expressions = parsed_data["expressions"]
+        for name in old_expressions.keys() | new_expressions.keys():
+            if name not in old_expressions:
+                changes["expressions"]["added"].add(name)
+            elif name not in new_expressions:
+                changes["expressions"]["removed"].add(name)
+            elif old_expressions[name] != new_expressions[name]:
+                changes["expressions"]["changed"].add(name)
+
+        ########################################
+        # Globals, including defaults and overrides
+        ########################################
+        new_globals = {}
+        for _, segment in parts:
+            if not isinstance(segment, str):
+                new_globals.update(segment["globals"])
+        finalise_globals(new_globals, config)
+        parsed_data["globals"].clear()
+        parsed_data["globals"].update(new_globals)
+
+        for name in old_globals.keys() | new_globals.keys():
+            if name not in old_globals:
+                changes["globals"]["added"].add(name)
+            elif name not in new_globals:
+                changes["globals"]["removed"].add(name)
+            elif old_globals[name] != new_globals[name]:
+                changes["globals"]["changed"].add(name)
+
+        ########################################
+        # Keep the parts for the next parse
+        ########################################
+        self._parts             = parts
+        self._part_segments     = part_segments
+        self.changes            = {
+            category: {kind: sorted(names) for kind, names in kinds.items()}
+            for category, kinds in changes.items()}
 
-    return parsed_lattice_data
+        return parsed_data
@@ -9,8 +9,11 @@ Date:       09-12-2025
 ################################################################################
 # Required Packages
 ################################################################################
+from graphlib import TopologicalSorter, CycleError
+
 from ..types import ConfigLike
 from ..helpers import print_section_heading
+from ..element_store import get_parameter_values
 
 ################################################################################
 # Exclude particular elements
@@ -74,3 +77,145 @@ def exclude_elements(
         parsed_lines[line] = [comp for comp in components if comp not in excluded_elements]
 
     return parsed_lattice_data
+
+################################################################################
+# Exclude elements and lines outside the selected line
+################################################################################
+def expand_lines(
+        parsed_lines:   dict[str, list[str]],
+        line_names:     list[str]) -> tuple[set[str], set[str]]:
+    """
+    Names of the elements and sub-lines in lines, including the lines
+    """
+    line_elements   = set()
+    expanded_lines  = set()
+    pending_lines   = list(line_names)
+    while pending_lines:
+        line_name   = pending_lines.pop()
+        if line_name in expanded_lines:
+            continue
+        expanded_lines.add(line_name)
+
+        for component in parsed_lines[line_name]:
+            component   = component.lstrip("-")
+            if component in parsed_lines:
+                pending_lines.append(component)
+            else:
+                line_elements.add(component)
+
+    return line_elements, expanded_lines
+
+def get_line_sizes(parsed_lattice_data: dict) -> dict[str, tuple[float, int]]:
+    """
+    Length and number of elements of every parsed line, from the lengths of
+    its elements
+
+    Lengths given by an expression count as their parsed value where that
+    is a number, otherwise as zero
+    Raises a ValueError if lines contain each other in a cycle
+    """
+    parsed_lines        = parsed_lattice_data["lines"]
+    parsed_expressions  = parsed_lattice_data["expressions"]
+
+    element_lengths = {}
+    for section_dict in parsed_lattice_data["elements"].values():
+        for ele_name, length in get_parameter_values(section_dict, "l").items():
+            if isinstance(length, str):
+                length  = parsed_expressions.get(length.strip(), 0.0)
+            element_lengths[ele_name]   = length if isinstance(length, float) else 0.0
+
+    ########################################
+    # Sub-lines before the lines using them
+    ########################################
+    line_graph  = TopologicalSorter()
+    for line_name, components in parsed_lines.items():
+        line_graph.add(line_name, *{
+            component.lstrip("-") for component in components
+            if component.lstrip("-") in parsed_lines})
+
+    try:
+        line_order  = list(line_graph.static_order())
+    except CycleError as error:
+        raise ValueError(
+            "Circular dependency between lines: " +\
+            f"{' -> '.join(error.args[1])}. Check the input data.") from error
+
+    line_sizes  = {}
+    for line_name in line_order:
+        length      = 0.0
+        n_elements  = 0
+        for component in parsed_lines[line_name]:
+            component   = component.lstrip("-")
+            if component in line_sizes:
+                length      += line_sizes[component][0]
+                n_elements  += line_sizes[component][1]
+            else:
+                length      += element_lengths.get(component, 0.0)
+                n_elements  += 1
+        line_sizes[line_name]   = (length, n_elements)
+
+    return line_sizes
+
+def select_line(
+        parsed_lattice_data:    dict,
+        line_name:              str | None,
+        config:                 ConfigLike) -> str:
+    """
+    Name of the line to convert: line_name if given, otherwise the longest
+    line (or with the most elements, if all lines have zero length), as
+    convert_sad_to_xsuite selects after conversion
+    """
+    parsed_lines    = parsed_lattice_data["lines"]
+    if line_name is not None:
+        if line_name.lower() not in parsed_lines:
+            raise ValueError(
+                f"Line {line_name} not found in the SAD file. " +\
+                f"Available lines: {', '.join(parsed_lines)}")
+        return line_name.lower()
+
+    line_sizes  = get_line_sizes(parsed_lattice_data)
+    line_names  = list(parsed_lines)
+    if max(line_sizes[line][0] for line in line_names) != 0:
+        selected_line   = max(line_names, key = lambda line: line_sizes[line][0])
+    else:
+        selected_line   = max(line_names, key = lambda line: line_sizes[line][1])
+
+    if config._verbose:
+        print(f"Longest line: {selected_line}")
+
+    return selected_line
+
+def exclude_unselected_lines(
+        parsed_lattice_data:    dict,
+        line_name:              str,
+        config:                 ConfigLike) -> dict:
+    """
+    Remove the elements and lines that are not part of the selected line,
+    so that only the selected line is converted
+    """
+    if config._verbose:
+        print_section_heading("Excluding Elements outside the Line", mode = "subsection")
+
+    parsed_elements = parsed_lattice_data["elements"]
+    parsed_lines    = parsed_lattice_data["lines"]
+
+    line_elements, used_lines   = expand_lines(parsed_lines, [line_name])
+
+    n_elements  = 0
+    for section_dict in parsed_elements.values():
+        for ele_name in [
+                ele_name for ele_name in section_dict
+                if ele_name not in line_elements]:
+            del section_dict[ele_name]
+            n_elements  += 1
+
+    excluded_lines  = [
+        name for name in parsed_lines if name not in used_lines]
+    for name in excluded_lines:
+        del parsed_lines[name]
+
+    if config._verbose:
+        print(f"Excluded {n_elements} elements and {len(excluded_lines)} " +\
+            f"lines not used by {line_name}")
+
+    return parsed_lattice_data
@@ -9,17 +9,25 @@ Date:       09-12-2025
 ################################################################################
 # Required Packages
 ################################################################################
+import re
 import xtrack as xt
+import xdeps as xd
+
+from graphlib import TopologicalSorter, CycleError
 
 from ..types import ConfigLike
 from ..helpers import print_section_heading
+from ..expression_translator import translate_sad_expression
+from ..environment_staging import set_variables
+from ._002_element_exclusion import expand_lines
 
 ################################################################################
 # Parsing of strings and floats
 ################################################################################
 def parse_expression(expression):
     """
-    Try to convert s to float; if that fails, return s stripped
+    Try to convert s to float; if that fails, return s translated from SAD
+    to xdeps syntax
     """
     if isinstance(expression, float):
         return expression
@@ -30,10 +38,235 @@ def parse_expression(expression):
         try:
             return float(expression_stripped)
         except ValueError:
-            return expression_stripped
+            return translate_sad_expression(expression_stripped)
     else:
         raise TypeError(f"Unsupported type: {type(expression)}. Expected str, int, or float.")
 
+################################################################################
+# Dependency Ordering
+################################################################################
+# Numbers are matched first so that exponents (1e-3) are not read as names
+EXPRESSION_TOKEN_PATTERN    = re.compile(
+    r"(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|(?P<name>[A-Za-z_$][A-Za-z0-9_$.]*)")
+
+def get_expression_names(expression: str | float) -> set[str]:
+    """
+    Get the identifiers used in an expression
+    """
+    if not isinstance(expression, str):
+        return set()
+    return {
+        match.group("name")
+        for match in EXPRESSION_TOKEN_PATTERN.finditer(expression)
+        if match.group("name") is not None}
+
+def order_expressions(
+        expressions:    dict,
+        description:    str) -> list[str]:
+    """
+    Order variables so that each follows the variables it depends on
+    Names not defined in expressions (e.g. functions or existing variables)
+    are not dependencies here
+    Raises a ValueError if the variables depend on each other in a cycle
+    """
+    dependency_graph    = TopologicalSorter()
+    for var_name, var_value in expressions.items():
+        dependency_graph.add(
+            var_name,
+            *sorted(get_expression_names(var_value) & expressions.keys()))
+
+    try:
+        return list(dependency_graph.static_order())
+    except CycleError as error:
+        raise ValueError(
+            f"Circular dependency between {description}: " +\
+            f"{' -> '.join(error.args[1])}. Check the input data.") from error
+
+def create_variables(
+        expressions:    dict,
+        environment:    xt.Environment,
+        description:    str) -> None:
+    """
+    Create the variables in the environment, in dependency order
+    """
+    set_variables(
+        environment = environment,
+        variables   = {
+            var_name: parse_expression(expressions[var_name])
+            for var_name in order_expressions(expressions, description)})
+
+################################################################################
+# Constant Folding
+################################################################################
+def fold_constant_expressions(
+        parsed_lattice_data:    dict,
+        config:                 ConfigLike) -> dict:
+    """
+    Evaluate the deferred expressions that do not depend on a knob
+
+    Knobs are the variables in config.KNOB_VARIABLES. Expressions that
+    depend on a knob (directly or through other expressions) are kept, and
+    all others are replaced by their value, so they become plain variables
+    rather than live expressions in the environment
+    Expressions that cannot be evaluated are kept, to be reported by
+    convert_expressions
+    """
+    if config._verbose:
+        print_section_heading("Evaluating Expressions Without Knobs", mode = "subsection")
+
+    parsed_expressions  = parsed_lattice_data["expressions"]
+
+    ########################################
+    # Values known so far, as for the environment
+    ########################################
+    constants   = {
+        var_name: var_value
+        for var_name, var_value in parsed_lattice_data["globals"].items()
+        if isinstance(var_value, (int, float))}
+    evaluator   = xd.madxutils.MadxEval(
+        variables   = constants,
+        functions   = xt.functions.Functions(),
+        elements    = {},
+        get         = "attr")
+
+    ########################################
+    # Fold in dependency order
+    ########################################
+    # Knobs and the kept expressions, which later expressions may not fold
+    live_variables  = set()
+    n_folded        = 0
+    for var_name in order_expressions(parsed_expressions, "expressions"):
+        var_value   = parse_expression(parsed_expressions[var_name])
+
+        if isinstance(var_value, str):
+            if not get_expression_names(var_value).isdisjoint(live_variables):
+                live_variables.add(var_name)
+                continue
+
+            try:
+                var_value   = float(evaluator.eval(var_value))
+            except Exception:
+                # Unknown names or syntax: leave to convert_expressions
+                live_variables.add(var_name)
+                continue
+            n_folded    += 1
+
+        parsed_expressions[var_name]    = var_value
+        constants[var_name]             = var_value
+        if var_name in config.KNOB_VARIABLES:
+            live_variables.add(var_name)
+
+    if config._verbose:
+        n_kept  = sum(
+            isinstance(var_value, str)
+            for var_value in parsed_expressions.values())
+        print(f"Folded {n_folded} constant expressions, kept {n_kept}")
+
+    return parsed_lattice_data
+
+################################################################################
+# Unused Variable Pruning
+################################################################################
+def get_element_names(element_parameters) -> set[str]:
+    """
+    Identifiers used in the parameters of an element
+    """
+    names   = set()
+    for value in element_parameters.values():
+        names.update(get_expression_names(value))
+    return names
+
+def prune_unused_variables(
+        parsed_lattice_data:    dict,
+        line_name:              str | None,
+        config:                 ConfigLike) -> dict:
+    """
+    Remove the deferred expressions that no element of the selected line
+    uses, directly or through other expressions
+
+    Without a selected line, the elements of every line are used
+    Knobs (config.KNOB_VARIABLES) are always kept
+    Elements and lines outside the selected lines that use a removed
+    variable are removed too, as they could no longer be converted
+    """
+    parsed_lines        = parsed_lattice_data["lines"]
+    parsed_elements     = parsed_lattice_data["elements"]
+    parsed_expressions  = parsed_lattice_data["expressions"]
+
+    if line_name is not None and line_name.lower() in parsed_lines:
+        line_names  = [line_name.lower()]
+    else:
+        line_names  = list(parsed_lines)
+    line_elements, used_lines   = expand_lines(parsed_lines, line_names)
+
+    ########################################
+    # Variables used by the elements of the line
+    ########################################
+    used_variables  = set(config.KNOB_VARIABLES) & parsed_expressions.keys()
+    for section_dict in parsed_elements.values():
+        for ele_name in line_elements & section_dict.keys():
+            used_variables.update(
+                get_element_names(section_dict[ele_name]) & parsed_expressions.keys())
+
+    ########################################
+    # And the variables those depend on
+    ########################################
+    pending_variables   = list(used_variables)
+    while pending_variables:
+        for var_name in get_expression_names(parsed_expressions[pending_variables.pop()]):
+            if var_name in parsed_expressions and var_name not in used_variables:
+                used_variables.add(var_name)
+                pending_variables.append(var_name)
+
+    ########################################
+    # Remove the rest
+    ########################################
+    pruned_variables    = [
+        var_name for var_name in parsed_expressions
+        if var_name not in used_variables]
+    for var_name in pruned_variables:
+        del parsed_expressions[var_name]
+
+    pruned_elements     = []
+    if len(pruned_variables) > 0:
+        for section_dict in parsed_elements.values():
+            for ele_name in [
+                    ele_name for ele_name, ele_vars in section_dict.items()
+                    if ele_name not in line_elements
+                    and not get_element_names(ele_vars).isdisjoint(pruned_variables)]:
+                del section_dict[ele_name]
+                pruned_elements.append(ele_name)
+
+    # Lines using the removed elements, or lines using those lines
+    pruned_lines        = []
+    removed_components  = set(pruned_elements)
+    while len(removed_components) > 0:
+        removed_lines   = [
+            name for name, components in parsed_lines.items()
+            if name not in used_lines
+            and any(component.lstrip("-") in removed_components
+                for component in components)]
+        for name in removed_lines:
+            del parsed_lines[name]
+        pruned_lines.extend(removed_lines)
+        removed_components  = set(removed_lines)
+
+    ########################################
+    # Report
+    ########################################
+    if config._verbose:
+        print(f"Kept {len(parsed_expressions)} variables used by: {', '.join(line_names)}")
+        print(f"Pruned {len(pruned_variables)} unused variables: " +\
+            ", ".join(pruned_variables))
+        if len(pruned_elements) > 0:
+            print(f"Pruned {len(pruned_elements)} elements outside the line " +\
+                "using them: " + ", ".join(pruned_elements))
+        if len(pruned_lines) > 0:
+            print(f"Pruned {len(pruned_lines)} lines using those elements: " +\
+                ", ".join(pruned_lines))
+
+    return parsed_lattice_data
+
 ################################################################################
 # Convert Deferred Expressions
 ################################################################################
@@ -64,24 +297,8 @@ def convert_expressions(
     if config._verbose:
         print_section_heading("Converting Global Variable Expressions", mode = "subsection")
 
-    # Variables may depend on other variables, so have to parse them in order
-    # Here, just try a few times to parse them
-    converted_globals = []
-    for _ in range(10):
-        for var_name, var_value in parsed_globals.items():
-
-            if var_name in converted_globals:
-                continue
-
-            var_value   = parse_expression(var_value)
-            try:
-                environment[var_name] = var_value
-                converted_globals.append(var_name)
-            except KeyError:
-                continue
-
-    if len(converted_globals) != len(parsed_globals):
-        raise ValueError("Not all global variables could be parsed. Check the input data.")
+    # Variables may depend on other variables, so are created in order
+    create_variables(parsed_globals, environment, "global variables")
 
     ########################################
     # Create expressions
@@ -89,21 +306,5 @@ def convert_expressions(
     if config._verbose:
         print_section_heading("Converting Deferred Expressions", mode = "subsection")
 
-    # Variables may depend on other variables, so have to parse them in order
-    # Here, just try a few times to parse them
-    converted_expressions = []
-    for i in range(10):
-        for var_name, var_value in parsed_expressions.items():
-
-            if var_name in converted_expressions:
-                continue
-
-            var_value   = parse_expression(var_value)
-            try:
-                environment[var_name] = var_value
-                converted_expressions.append(var_name)
-            except KeyError:
-                continue
-
-    if len(converted_expressions) != len(parsed_expressions):
-        raise ValueError("Not all expressions could be parsed. Check the input data.")
+    # Variables may depend on other variables, so are created in order
+    create_variables(parsed_expressions, environment, "expressions")
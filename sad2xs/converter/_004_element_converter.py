@@ -9,14 +9,23 @@ Date:       09-12-2025
 ################################################################################
 # Required Packages
 ################################################################################
+import re
+import fnmatch
 import xtrack as xt
 import numpy as np
 
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
 from scipy.constants import c as clight
 from scipy.constants import e as qe
 
 from ..types import ConfigLike
 from ..helpers import print_section_heading
+from ..expression_translator import translate_sad_expression
+from ..environment_staging import ElementSpecs, StagedEnvironment
+from ..element_store import get_parameter_values
 
 ################################################################################
 # RAD2DEG Constant
@@ -28,7 +37,8 @@ RAD2DEG = 180.0 / np.pi
 ################################################################################
 def parse_expression(expression: str):
     """
-    Try to convert s to float; if that fails, return s stripped
+    Try to convert s to float; if that fails, return s translated from SAD
+    to xdeps syntax
     """
     if isinstance(expression, float):
         return expression
@@ -39,7 +49,7 @@ def parse_expression(expression: str):
         try:
             return float(expression_stripped)
         except ValueError:
-            return expression_stripped
+            return translate_sad_expression(expression_stripped)
     else:
         raise TypeError(f"Unsupported type: {type(expression)}. Expected str, int, or float.")
 
@@ -89,6 +99,32 @@ def only_index_nonzero(
         return False
     return True
 
+################################################################################
+# Highest non zero order of the knl and ksl arrays
+################################################################################
+def get_multipole_order(
+    knl:    list,
+    ksl:    list,
+    tol:    float) -> int:
+    """
+    Highest index at which knl or ksl is non zero (within tol), or 0 if all
+    are zero
+    Elements may be floats or strings; non-numeric strings count as non-zero,
+    as their value may change
+    """
+    order   = 0
+    for arr in (knl, ksl):
+        for i, v in enumerate(arr):
+            if i <= order:
+                continue
+            try:
+                if abs(float(v)) <= tol:
+                    continue
+            except (ValueError, TypeError):
+                pass
+            order   = i
+    return order
+
 ################################################################################
 # Get element misalignments
 ################################################################################
@@ -120,7 +156,7 @@ def get_element_misalignments(ele_vars, rotation_correction = 0.0):
     # Rotations in SAD are negative w.r.t. Xsuite
     ########################################
     if isinstance(rotation, str):
-        rotation    = f"-{rotation} + {rotation_correction}"
+        rotation    = f"-({rotation}) + {rotation_correction}"
     elif isinstance(rotation, (float, int)):
         rotation    = -rotation + rotation_correction
     else:
@@ -174,142 +210,138 @@ def convert_elements(
     ########################################
     parsed_elements = parsed_lattice_data["elements"]
 
-    ########################################
-    # Drifts
-    ########################################
-    if "drift" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Drifts", mode = "subsection")
-        convert_drifts(
-            parsed_elements = parsed_elements,
-            environment     = environment)
-
-    ########################################
-    # Bends
-    ########################################
-    if "bend" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Bends", mode = "subsection")
-        convert_bends(
-            parsed_elements = parsed_elements,
-            environment     = environment)
-        convert_correctors(
-            parsed_elements = parsed_elements,
-            environment     = environment)
+    # Variables and elements of each stage are added to the environment
+    # together, once the stage is converted
+    staged_environment  = StagedEnvironment(
+        environment = environment,
+        deduplicate = config.DEDUPLICATE_ELEMENTS)
 
     ########################################
-    # Quadrupoles
+    # Conversion stages, in order
     ########################################
-    if "quad" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Quadrupoles", mode = "subsection")
-        convert_quadrupoles(
-            parsed_elements = parsed_elements,
-            environment     = environment)
+    # (element type, heading, converters of the stage)
+    stages  = [
+        ("drift",       "Drifts",       [convert_drifts]),
+        ("bend",        "Bends",        [convert_bends, convert_correctors]),
+        ("quad",        "Quadrupoles",  [convert_quadrupoles]),
+        ("sext",        "Sextupoles",   [convert_sextupoles]),
+        ("oct",         "Octupoles",    [convert_octupoles]),
+        ("mult",        "Multipoles",   [partial(
+            convert_multipoles,
+            user_multipole_replacements = user_multipole_replacements,
+            config                      = config)]),
+        ("cavi",        "Cavities",     [convert_cavities]),
+        ("apert",       "Apertures",    [convert_apertures]),
+        ("sol",         "Solenoids",    [partial(convert_solenoids, config = config)]),
+        ("coord",       "Coordinate Transformations", [partial(
+            convert_coordinate_transformations, config = config)]),
+        ("mark",        "Markers",      [convert_markers]),
+        ("moni",        "Monitors",     [convert_monitors]),
+        ("beambeam",    "Beam-Beam Interactions", [convert_beam_beam])]
+    stages  = [stage for stage in stages if stage[0] in parsed_elements]
 
     ########################################
-    # Sextupoles
+    # Convert in worker processes
     ########################################
-    if "sext" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Sextupoles", mode = "subsection")
-        convert_sextupoles(
-            parsed_elements = parsed_elements,
-            environment     = environment)
+    # Small lattices are converted serially, as starting workers costs more
+    n_elements  = sum(len(parsed_elements[stage[0]]) for stage in stages)
+    if config.ELEMENT_WORKERS > 1 and \
+            n_elements >= config.ELEMENT_PARALLEL_MIN_ELEMENTS:
+        convert_elements_parallel(
+            parsed_elements     = parsed_elements,
+            stages              = stages,
+            staged_environment  = staged_environment,
+            config              = config)
 
     ########################################
-    # Octupoles
+    # Convert serially
     ########################################
-    if "oct" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Octupoles", mode = "subsection")
-        convert_octupoles(
-            parsed_elements = parsed_elements,
-            environment     = environment)
+    else:
+        for element_type, heading, converters in stages:
+            if config._verbose:
+                print_section_heading(f"Converting {heading}", mode = "subsection")
+            for converter in converters:
+                converter(
+                    parsed_elements = parsed_elements,
+                    environment     = staged_environment)
+            staged_environment.commit()
 
-    ########################################
-    # Multipoles
-    ########################################
-    if "mult" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Multipoles", mode = "subsection")
-        convert_multipoles(
-            parsed_elements             = parsed_elements,
-            environment                 = environment,
-            user_multipole_replacements = user_multipole_replacements,
-            config                      = config)
+    if config._verbose and config.DEDUPLICATE_ELEMENTS:
+        print(f"Created {staged_environment.n_clones} identical elements as clones")
 
-    ########################################
-    # Cavities
-    ########################################
-    if "cavi" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Cavities", mode = "subsection")
-        convert_cavities(
-            parsed_elements = parsed_elements,
-            environment     = environment)
+################################################################################
+# Parallel conversion
+################################################################################
+# Environment variables the converters read
+REFERENCE_VARIABLES         = ("p0c", "q0")
+ELEMENT_SHARDS_PER_WORKER   = 2
 
-    ########################################
-    # Apertures
-    ########################################
-    if "apert" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Apertures", mode = "subsection")
-        convert_apertures(
-            parsed_elements = parsed_elements,
-            environment     = environment)
+def split_elements(section: Mapping, n_shards: int) -> list[dict]:
+    """
+    Split the elements of a section into contiguous ranges of names, as
+    plain (picklable) dicts
+    """
+    names       = list(section)
+    shard_size  = max(1, -(-len(names) // n_shards))
+    return [
+        {name: dict(section[name]) for name in names[start:start + shard_size]}
+        for start in range(0, len(names), shard_size)]
+
+def get_element_specs(
+        converter,
+        element_type:   str,
+        elements:       dict,
+        values:         dict[str, float]) -> ElementSpecs:
+    """
+    Stage the conversion of some elements of one type, in a worker process
+    """
+    specs   = ElementSpecs(values)
+    converter(parsed_elements = {element_type: elements}, environment = specs)
+    return specs
+
+def convert_elements_parallel(
+        parsed_elements:    dict,
+        stages:             list[tuple],
+        staged_environment: StagedEnvironment,
+        config:             ConfigLike) -> None:
+    """
+    Compute the element specs of every stage in a process pool, then add
+    them to the environment stage by stage
 
-    ########################################
-    # Solenoids
-    ########################################
-    if "sol" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Solenoids", mode = "subsection")
-        convert_solenoids(
-            parsed_elements = parsed_elements,
-            environment     = environment,
-            config          = config)
+    Each section is split into contiguous ranges of names, and the specs
+    are staged in the order of the stages, converters and ranges, so the
+    result is the same as converting serially
+    """
+    values  = {name: staged_environment[name] for name in REFERENCE_VARIABLES}
 
-    ########################################
-    # Coordinate Transformations
-    ########################################
-    if "coord" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Coordinate Transformations", mode = "subsection")
-        convert_coordinate_transformations(
-            parsed_elements = parsed_elements,
-            environment     = environment,
-            config          = config)
+    if config._verbose:
+        print(f"Converting elements with {config.ELEMENT_WORKERS} workers")
 
-    ########################################
-    # Markers
-    ########################################
-    if "mark" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Markers", mode = "subsection")
-        convert_markers(
-            parsed_elements = parsed_elements,
-            environment     = environment)
+    with ProcessPoolExecutor(max_workers = config.ELEMENT_WORKERS) as executor:
 
-    ########################################
-    # Monitors
-    ########################################
-    if "moni" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Monitors", mode = "subsection")
-        convert_monitors(
-            parsed_elements = parsed_elements,
-            environment     = environment)
+        ########################################
+        # Submit every stage first
+        ########################################
+        stage_futures   = []
+        for element_type, _, converters in stages:
+            shards  = split_elements(
+                parsed_elements[element_type],
+                config.ELEMENT_WORKERS * ELEMENT_SHARDS_PER_WORKER)
+            stage_futures.append([
+                executor.submit(
+                    get_element_specs, converter, element_type, shard, values)
+                for converter in converters
+                for shard in shards])
 
-    ########################################
-    # Beam-Beam Interactions
-    ########################################
-    if "beambeam" in parsed_elements:
-        if config._verbose:
-            print_section_heading("Converting Beam-Beam Interactions", mode = "subsection")
-        convert_beam_beam(
-            parsed_elements = parsed_elements,
-            environment     = environment)
+        ########################################
+        # Add them in order
+        ########################################
+        for (_, heading, _), futures in zip(stages, stage_futures):
+            if config._verbose:
+                print_section_heading(f"Converting {heading}", mode = "subsection")
+            for future in futures:
+                staged_environment.extend(future.result())
+            staged_environment.commit()
 
 ################################################################################
 # Convert drift
@@ -514,93 +546,220 @@ def convert_correctors(parsed_elements, environment):
             continue
 
 ################################################################################
-# Convert Quadrupoles
+# Table-Driven Magnet Conversion
 ################################################################################
-def convert_quadrupoles(parsed_elements, environment):
+# Each SAD magnet type is described by a schema, and converted by one engine
+#   parent:             xtrack class of the element
+#   description:        name used in messages
+#   strength:           SAD key of the integrated strength (K1, K2, K3)
+#   normal, skew:       xtrack attributes of the normal and skew strengths,
+#                       set per unit length
+#   skew_angle:         SAD rotation that makes the magnet skew, where the
+#                       skew strength is -K at +skew_angle and +K at -skew_angle
+#   misalignments:      SAD key: (xtrack attribute, sign)
+#   variable:           name template of the strength variables
+#   missing_length:     "error", or "marker" to install the element as a marker
+MISALIGNMENT_SCHEMA = {
+    "dx":       ("shift_x",     +1.0),
+    "dy":       ("shift_y",     +1.0),
+    "rotate":   ("rot_s_rad",   -1.0)}
+
+MAGNET_SCHEMAS  = {
+    "quad": {
+        "parent":           xt.Quadrupole,
+        "description":      "Quadrupole",
+        "strength":         "k1",
+        "normal":           "k1",
+        "skew":             "k1s",
+        "skew_angle":       np.pi / 4,
+        "misalignments":    MISALIGNMENT_SCHEMA,
+        "variable":         "{attribute}_{name}",
+        "missing_length":   "error"},
+    "sext": {
+        "parent":           xt.Sextupole,
+        "description":      "Sextupole",
+        "strength":         "k2",
+        "normal":           "k2",
+        "skew":             "k2s",
+        "skew_angle":       np.pi / 6,
+        "misalignments":    MISALIGNMENT_SCHEMA,
+        "variable":         "{attribute}_{name}",
+        "missing_length":   "error"},
+    "oct": {
+        "parent":           xt.Octupole,
+        "description":      "Octupole",
+        "strength":         "k3",
+        "normal":           "k3",
+        "skew":             "k3s",
+        "skew_angle":       np.pi / 8,
+        "misalignments":    MISALIGNMENT_SCHEMA,
+        "variable":         "{attribute}_{name}",
+        "missing_length":   "marker"}}
+
+def get_parameter_columns(
+        section:    Mapping,
+        names:      list[str],
+        keys:       list[str]) -> tuple[dict, dict, dict]:
     """
-    Convert quadrupoles from the SAD parsed data
+    Parameters of all elements of a section as arrays: whether each element
+    sets the key, its numeric value (zero if unset, nan if an expression),
+    and the expressions by element name
     """
-
-    quads  = parsed_elements["quad"]
-
-    for ele_name, ele_vars in quads.items():
-
-        ########################################
-        # Initialise parameters
-        ########################################
-        length      = 0.0
-        k1l         = 0.0
-        k1sl        = 0.0
-
-        ########################################
-        # Read values
-        ########################################
-        if "l" in ele_vars:
-            length      = parse_expression(ele_vars["l"])
+    is_set      = {}
+    numbers     = {}
+    expressions = {}
+    for key in keys:
+        column          = get_parameter_values(section, key)
+        is_set[key]     = np.array([name in column for name in names], dtype = bool)
+        numbers[key]    = np.array([
+            np.nan if isinstance(value := column.get(name, 0.0), str) else value
+            for name in names], dtype = float)
+        expressions[key]    = {
+            name: value for name, value in column.items() if isinstance(value, str)}
+    return is_set, numbers, expressions
+
+def get_magnet_expressions(
+        ele_vars:   Mapping,
+        schema:     dict) -> dict:
+    """
+    Attributes of a magnet with parameters given by expressions
+    """
+    length                      = parse_expression(ele_vars["l"])
+    shift_x, shift_y, rotation  = get_element_misalignments(ele_vars)
+    skew_angle                  = schema["skew_angle"]
+
+    normal  = 0.0
+    skew    = 0.0
+    if schema["strength"] in ele_vars:
+        strength    = parse_expression(ele_vars[schema["strength"]])
+        if isinstance(rotation, str):
+            normal  = strength
+        elif np.isclose(rotation, +skew_angle, atol = 1E-6):
+            skew    = -strength if isinstance(strength, float) else f"-({strength})"
+            shift_x, shift_y, rotation  = get_element_misalignments(
+                ele_vars            = ele_vars,
+                rotation_correction = -skew_angle)
+        elif np.isclose(rotation, -skew_angle, atol = 1E-6):
+            skew    = strength
+            shift_x, shift_y, rotation  = get_element_misalignments(
+                ele_vars            = ele_vars,
+                rotation_correction = +skew_angle)
         else:
-            raise ValueError(f"Error! Quadrupole {ele_name} missing length.")
-
-        shift_x, shift_y, rotation  = get_element_misalignments(ele_vars)
+            normal  = strength
+
+    def per_length(integrated):
+        if isinstance(integrated, float) and isinstance(length, float):
+            return integrated / length
+        if isinstance(integrated, float) and integrated == 0:
+            return 0.0
+        return f"({integrated}) / ({length})"
+
+    return {
+        "length":           length,
+        schema["normal"]:   per_length(normal),
+        schema["skew"]:     per_length(skew),
+        "shift_x":          shift_x,
+        "shift_y":          shift_y,
+        "rot_s_rad":        rotation}
+
+def convert_magnets(
+        section:        Mapping,
+        schema:         dict,
+        environment:    StagedEnvironment) -> None:
+    """
+    Convert all magnets of a SAD type, as described by its schema
 
-        if "k1" in ele_vars:
-            if not isinstance(rotation, float):
-                k1l     = f"{ele_vars["k1"]}"
-            else:
+    The strengths, skew rotations and misalignments of all magnets with
+    numeric parameters are computed together as arrays, and magnets with
+    expressions are converted one by one
+    """
+    names       = list(section)
+    strength    = schema["strength"]
+    skew_angle  = schema["skew_angle"]
+    keys        = ["l", strength, *schema["misalignments"]]
+    is_set, numbers, expressions    = get_parameter_columns(section, names, keys)
 
-                if np.isclose(rotation, +np.pi / 4, atol = 1E-6):
-                    if isinstance(ele_vars["k1"], (float, int)):
-                        k1sl    = -ele_vars["k1"]
-                    else:
-                        k1sl    = f"-{ele_vars["k1"]}"
-                    shift_x, shift_y, rotation  = get_element_misalignments(
-                        ele_vars            = ele_vars,
-                        rotation_correction = -np.pi / 4)
-
-                elif np.isclose(rotation, -np.pi / 4, atol = 1E-6):
-                    if isinstance(ele_vars["k1"], (float, int)):
-                        k1sl    = +ele_vars["k1"]
-                    else:
-                        k1sl    = f"+{ele_vars["k1"]}"
-                    shift_x, shift_y, rotation  = get_element_misalignments(
-                        ele_vars            = ele_vars,
-                        rotation_correction = +np.pi / 4)
+    ########################################
+    # Numeric parameters, all magnets at once
+    ########################################
+    length      = numbers["l"]
+    misaligned  = {
+        attribute: sign * numbers[key]
+        for key, (attribute, sign) in schema["misalignments"].items()}
+    rotation    = misaligned["rot_s_rad"]
+
+    has_strength    = is_set[strength]
+    skew_plus       = has_strength & np.isclose(rotation, +skew_angle, atol = 1E-6)
+    skew_minus      = has_strength & np.isclose(rotation, -skew_angle, atol = 1E-6)
+    is_normal       = has_strength & ~skew_plus & ~skew_minus
+
+    integrated_normal   = np.where(is_normal, numbers[strength], 0.0)
+    integrated_skew     = np.where(skew_plus, -numbers[strength],
+        np.where(skew_minus, numbers[strength], 0.0))
+    misaligned["rot_s_rad"] = rotation + np.where(skew_plus, -skew_angle,
+        np.where(skew_minus, +skew_angle, 0.0))
+
+    # Magnets without a length or with a zero length are not divided here
+    has_length  = length != 0
+    attributes  = {
+        "length":           length,
+        schema["normal"]:   np.divide(integrated_normal, length,
+            out = np.zeros_like(length), where = has_length),
+        schema["skew"]:     np.divide(integrated_skew, length,
+            out = np.zeros_like(length), where = has_length),
+        **misaligned}
+    columns     = {attribute: values.tolist() for attribute, values in attributes.items()}
+    is_numeric  = ~np.any([
+        np.isin(names, list(expressions[key])) for key in keys], axis = 0)
 
-                else:
-                    k1l     = ele_vars["k1"]
+    ########################################
+    # Create the magnets
+    ########################################
+    for index, ele_name in enumerate(names):
 
-        if isinstance(k1l, float):
-            k1  = k1l / ele_vars["l"]
-        else:
-            k1  = f"{k1l} / {ele_vars["l"]}"
+        if not is_set["l"][index]:
+            if schema["missing_length"] == "marker":
+                print(f"Warning! {schema['description']} {ele_name} missing length and installed as marker")
+                environment.new(
+                    name    = ele_name,
+                    parent  = xt.Marker)
+                continue
+            raise ValueError(f"Error! {schema['description']} {ele_name} missing length.")
+        if length[index] == 0:
+            raise ValueError(f"Error! {schema['description']} {ele_name} has zero length.")
 
-        if isinstance(k1sl, float):
-            k1s = k1sl / ele_vars["l"]
+        if is_numeric[index]:
+            ele_attributes  = {
+                attribute: column[index] for attribute, column in columns.items()}
         else:
-            k1s = f"{k1sl} / {ele_vars["l"]}"
+            ele_attributes  = get_magnet_expressions(section[ele_name], schema)
 
         ########################################
         # Create variables
         ########################################
-        if k1 != 0:
-            environment[f"k1_{ele_name}"]   = k1
-            k1                              = f"k1_{ele_name}"
-        if k1s != 0:
-            environment[f"k1s_{ele_name}"]  = k1s
-            k1s                             = f"k1s_{ele_name}"
+        for attribute in (schema["normal"], schema["skew"]):
+            if ele_attributes[attribute] != 0:
+                variable    = schema["variable"].format(
+                    attribute = attribute, name = ele_name)
+                environment[variable]       = ele_attributes[attribute]
+                ele_attributes[attribute]   = variable
 
         ########################################
         # Create Element
         ########################################
         environment.new(
-            name        = ele_name,
-            parent      = xt.Quadrupole,
-            length      = length,
-            k1          = k1,
-            k1s         = k1s,
-            shift_x     = shift_x,
-            shift_y     = shift_y,
-            rot_s_rad   = rotation)
-        continue
+            name    = ele_name,
+            parent  = schema["parent"],
+            **ele_attributes)
+
+################################################################################
+# Convert Quadrupoles
+################################################################################
+def convert_quadrupoles(parsed_elements, environment):
+    """
+    Convert quadrupoles from the SAD parsed data
+    """
+    convert_magnets(parsed_elements["quad"], MAGNET_SCHEMAS["quad"], environment)
 
 ################################################################################
 # Convert Sextupoles
@@ -609,87 +768,7 @@ def convert_sextupoles(parsed_elements, environment):
     """
     Convert sextupoles from the SAD parsed data
     """
-
-    sexts  = parsed_elements["sext"]
-
-    for ele_name, ele_vars in sexts.items():
-
-        ########################################
-        # Initialise parameters
-        ########################################
-        length      = 0.0
-        k2l         = 0.0
-        k2sl        = 0.0
-
-        ########################################
-        # Read values
-        ########################################
-        if "l" in ele_vars:
-            length      = parse_expression(ele_vars["l"])
-        else:
-            raise ValueError(f"Error! Sextupole {ele_name} missing length.")
-
-        shift_x, shift_y, rotation  = get_element_misalignments(ele_vars)
-
-        if "k2" in ele_vars:
-            if not isinstance(rotation, float):
-                k2l     = f"{ele_vars["k2"]}"
-            else:
-
-                if np.isclose(rotation, +np.pi / 6, atol = 1E-6):
-                    if isinstance(ele_vars["k2"], (float, int)):
-                        k2sl    = -ele_vars["k2"]
-                    else:
-                        k2sl    = f"-{ele_vars["k2"]}"
-                    shift_x, shift_y, rotation  = get_element_misalignments(
-                        ele_vars            = ele_vars,
-                        rotation_correction = -np.pi / 6)
-
-                elif np.isclose(rotation, -np.pi / 6, atol = 1E-6):
-                    if isinstance(ele_vars["k2"], (float, int)):
-                        k2sl    = +ele_vars["k2"]
-                    else:
-                        k2sl    = f"+{ele_vars["k2"]}"
-                    shift_x, shift_y, rotation  = get_element_misalignments(
-                        ele_vars            = ele_vars,
-                        rotation_correction = +np.pi / 6)
-
-                else:
-                    k2l     = ele_vars["k2"]
-
-        if isinstance(k2l, float):
-            k2  = k2l / ele_vars["l"]
-        else:
-            k2  = f"{k2l} / {ele_vars["l"]}"
-
-        if isinstance(k2sl, float):
-            k2s = k2sl / ele_vars["l"]
-        else:
-            k2s = f"{k2sl} / {ele_vars["l"]}"
-
-        ########################################
-        # Create variables
-        ########################################
-        if k2 != 0:
-            environment[f"k2_{ele_name}"]   = k2
-            k2                              = f"k2_{ele_name}"
-        if k2s != 0:
-            environment[f"k2s_{ele_name}"]  = k2s
-            k2s                             = f"k2s_{ele_name}"
-
-        ########################################
-        # Create Element
-        ########################################
-        environment.new(
-            name        = ele_name,
-            parent      = xt.Sextupole,
-            length      = length,
-            k2          = k2,
-            k2s         = k2s,
-            shift_x     = shift_x,
-            shift_y     = shift_y,
-            rot_s_rad   = rotation)
-        continue
+    convert_magnets(parsed_elements["sext"], MAGNET_SCHEMAS["sext"], environment)
 
 ################################################################################
 # Convert Octupoles
@@ -698,95 +777,58 @@ def convert_octupoles(parsed_elements, environment):
     """
     Convert octupoles from the SAD parsed data
     """
+    convert_magnets(parsed_elements["oct"], MAGNET_SCHEMAS["oct"], environment)
 
-    octs    = parsed_elements["oct"]
-
-    for ele_name, ele_vars in octs.items():
-
-        if "l" not in ele_vars:
-            # TODO: Improve the handling of this
-            print(f"Warning! Octupole {ele_name} missing length and installed as marker")
-            environment.new(
-                name                = ele_name,
-                parent              = xt.Marker)
-            continue
-
-        ########################################
-        # Initialise parameters
-        ########################################
-        length      = 0.0
-        k3l         = 0.0
-        k3sl        = 0.0
-
-        ########################################
-        # Read values
-        ########################################
-        if "l" in ele_vars:
-            length      = parse_expression(ele_vars["l"])
-        else:
-            raise ValueError(f"Error! Octupole {ele_name} missing length.")
-
-        shift_x, shift_y, rotation  = get_element_misalignments(ele_vars)
-
-        if "k3" in ele_vars:
-            if not isinstance(rotation, float):
-                k3l     = f"{ele_vars["k3"]}"
+################################################################################
+# User Defined Multipole Replacements
+################################################################################
+class MultipoleReplacements:
+    """
+    User multipole replacements, compiled for lookup by element name
+
+    Keys are name prefixes, matched through a character trie so that a
+    lookup costs one step per character of the name, and the longest
+    matching prefix wins
+    Keys starting with "re:" are regular expressions and keys starting with
+    "glob:" are glob patterns, both matched from the start of the name and
+    tried in order only if no prefix matches
+    """
+    def __init__(self, replacements: dict[str, str]):
+        self.trie:      dict                = {}
+        self.patterns:  list[tuple]         = []
+
+        for key, replace_type in replacements.items():
+            if key.startswith("re:"):
+                self.patterns.append((re.compile(key[3:]), replace_type))
+            elif key.startswith("glob:"):
+                self.patterns.append(
+                    (re.compile(fnmatch.translate(key[5:])), replace_type))
             else:
-
-                if np.isclose(rotation, +np.pi / 8, atol = 1E-6):
-                    if isinstance(ele_vars["k3"], (float, int)):
-                        k3sl    = -ele_vars["k3"]
-                    else:
-                        k3sl    = f"-{ele_vars["k3"]}"
-                    shift_x, shift_y, rotation  = get_element_misalignments(
-                        ele_vars            = ele_vars,
-                        rotation_correction = -np.pi / 8)
-
-                elif np.isclose(rotation, -np.pi / 8, atol = 1E-6):
-                    if isinstance(ele_vars["k3"], (float, int)):
-                        k3sl    = +ele_vars["k3"]
-                    else:
-                        k3sl    = f"+{ele_vars["k3"]}"
-                    shift_x, shift_y, rotation  = get_element_misalignments(
-                        ele_vars            = ele_vars,
-                        rotation_correction = +np.pi / 8)
-
-                else:
-                    k3l     = ele_vars["k3"]
-
-        if isinstance(k3l, float):
-            k3  = k3l / ele_vars["l"]
-        else:
-            k3  = f"{k3l} / {ele_vars["l"]}"
-
-        if isinstance(k3sl, float):
-            k3s = k3sl / ele_vars["l"]
-        else:
-            k3s = f"{k3sl} / {ele_vars["l"]}"
-
-        ########################################
-        # Create variables
-        ########################################
-        if k3 != 0:
-            environment[f"k3_{ele_name}"]   = k3
-            k3                              = f"k3_{ele_name}"
-        if k3s != 0:
-            environment[f"k3s_{ele_name}"]  = k3s
-            k3s                             = f"k3s_{ele_name}"
-
-        ########################################
-        # Create Element
-        ########################################
-        environment.new(
-            name        = ele_name,
-            parent      = xt.Octupole,
-            length      = length,
-            k3          = k3,
-            k3s         = k3s,
-            shift_x     = shift_x,
-            shift_y     = shift_y,
-            rot_s_rad   = rotation)
-        continue
+                node    = self.trie
+                for character in key:
+                    node    = node.setdefault(character, {})
+                # None marks the end of a prefix, as no character is None
+                node[None]  = replace_type
+
+    def get(self, ele_name: str) -> str | None:
+        """
+        Replacement type of an element, or None if it is not replaced
+        """
+        node            = self.trie
+        replace_type    = node.get(None)
+        for character in ele_name:
+            node    = node.get(character)
+            if node is None:
+                break
+            replace_type    = node.get(None, replace_type)
+
+        if replace_type is not None:
+            return replace_type
+
+        for pattern, pattern_type in self.patterns:
+            if pattern.match(ele_name):
+                return pattern_type
+        return None
 
 ################################################################################
 # Convert Multipoles
@@ -802,6 +844,10 @@ def convert_multipoles(
 
     mults   = parsed_elements["mult"]
 
+    replacements    = None
+    if user_multipole_replacements is not None:
+        replacements    = MultipoleReplacements(user_multipole_replacements)
+
     for ele_name, ele_vars in mults.items():
 
         ########################################
@@ -832,9 +878,10 @@ def convert_multipoles(
         ########################################
         # User Defined Multipole Replacements
         ########################################
-        if user_multipole_replacements is not None:
-            if any(ele_name.startswith(test_key) for test_key in user_multipole_replacements):
-                replace_type    = None
+        if replacements is not None:
+            # Longest matching prefix (or the first matching pattern)
+            replace_type    = replacements.get(ele_name)
+            if replace_type is not None:
 
                 if not "l" in ele_vars:
                     print(
@@ -842,11 +889,6 @@ def convert_multipoles(
                         "replacement not supported for thin lens")
                     continue
 
-                # Search the multipole replacements dict for the type of element
-                for replacement in user_multipole_replacements:
-                    if ele_name.startswith(replacement):
-                        replace_type    = user_multipole_replacements[replacement]
-
                 ########################################
                 # Bend Replacement (kick)
                 ########################################
@@ -1219,14 +1261,17 @@ def convert_multipoles(
         ########################################
         # True multipole element
         ########################################
+        # Only up to the highest non zero order, as tracking loops over all
+        order   = get_multipole_order(knl, ksl, config.KNL_ZERO_TOL)
+
         environment.new(
             name        = ele_name,
             parent      = xt.Multipole,
             _isthick    = True,
             length      = length,
-            knl         = knl,
-            ksl         = ksl,
-            order       = config.MAX_KNL_ORDER,
+            knl         = knl[:order + 1],
+            ksl         = ksl[:order + 1],
+            order       = order,
             shift_x     = shift_x,
             shift_y     = shift_y,
             rot_s_rad   = rotation)
@@ -1602,7 +1647,8 @@ def convert_solenoids(
             environment.new(
                 name    = f"{ele_name}_bound",
                 parent  = xt.UniformSolenoid,
-                ks      = ks)
+                ks      = ks,
+                order   = 0)
 
             environment.new(
                 name    = f"{ele_name}_dxy",
@@ -1651,7 +1697,8 @@ def convert_solenoids(
             environment.new(
                 name    = f"{ele_name}",
                 parent  = xt.UniformSolenoid,
-                ks      = ks)
+                ks      = ks,
+                order   = 0)
             continue
 
 ################################################################################
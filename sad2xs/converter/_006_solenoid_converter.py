@@ -214,7 +214,8 @@ def convert_solenoids(
                             name    = new_element_name,
                             parent  = xt.UniformSolenoid,
                             length  = length,
-                            ks      = ks)
+                            ks      = ks,
+                            order   = 0)
                     line.element_names[idx] = new_element_name
 
                     if config._verbose:
@@ -250,7 +251,7 @@ def convert_solenoids(
                             length      = length,
                             ks          = ks,
                             knl         = knl,
-                            order       = config.MAX_KNL_ORDER,
+                            order       = len(knl) - 1,
                             shift_x     = shift_x,
                             shift_y     = shift_y,
                             rot_s_rad   = rotation,
@@ -292,7 +293,7 @@ def convert_solenoids(
                             ks					= ks,
                             knl					= knl,
                             ksl					= ksl,
-                            order				= config.MAX_KNL_ORDER,
+                            order				= len(knl) - 1,
                             shift_x		        = shift_x,
                             shift_y		        = shift_y,
                             rot_s_rad           = rotation,
@@ -333,7 +334,7 @@ def convert_solenoids(
                             ks					= ks,
                             knl					= knl,
                             ksl					= ksl,
-                            order				= config.MAX_KNL_ORDER,
+                            order				= len(knl) - 1,
                             shift_x		        = shift_x,
                             shift_y		        = shift_y,
                             rot_s_rad           = rotation,
@@ -374,7 +375,7 @@ def convert_solenoids(
                             ks					= ks,
                             knl					= knl,
                             ksl					= ksl,
-                            order				= config.MAX_KNL_ORDER,
+                            order				= len(knl) - 1,
                             shift_x		        = shift_x,
                             shift_y		        = shift_y,
                             rot_s_rad           = rotation,
@@ -394,6 +395,7 @@ def convert_solenoids(
                     length      = line[element].length
                     knl         = line[element].knl
                     ksl         = line[element].ksl
+                    order       = line[element].order
                     shift_x     = line[element].shift_x
                     shift_y     = line[element].shift_y
                     rotation    = line[element].rot_s_rad
@@ -411,7 +413,7 @@ def convert_solenoids(
                         ks					= ks,
                         knl					= knl,
                         ksl					= ksl,
-                        order				= config.MAX_KNL_ORDER,
+                        order				= order,
                         shift_x		        = shift_x,
                         shift_y		        = shift_y,
                         rot_s_rad           = rotation,
@@ -13,6 +13,7 @@ from scipy.constants import c as clight
 
 from ..types import ConfigLike
 from ..helpers import print_section_heading
+from ..element_store import get_parameter_values
 
 ################################################################################
 # Exclude particular elements
@@ -42,11 +43,11 @@ def convert_harmonic_rf(
         print("No cavities in line")
         return line
 
-    has_harmonic_cavities   = any(
-        isinstance(v, dict) and "harm" in v
-        for v in parsed_lattice_data["elements"]["cavi"].values())
+    # Works for both element dictionaries and the columnar store
+    harmonic_numbers    = get_parameter_values(
+        parsed_lattice_data["elements"]["cavi"], "harm")
 
-    if not has_harmonic_cavities:
+    if len(harmonic_numbers) == 0:
         print("No harmonic cavities in line")
         return line
 
@@ -62,20 +63,16 @@ def convert_harmonic_rf(
     ########################################
     # Go through the elements
     ########################################
-    for cavity, properties in parsed_lattice_data["elements"]["cavi"].items():
+    for cavity, harmonic_number in harmonic_numbers.items():
 
-        is_harmonic = isinstance(properties, dict) and "harm" in properties
+        frequency   = harmonic_number * f_rev
 
-        if is_harmonic:
-            harmonic_number    = properties["harm"]
-            frequency          = harmonic_number * f_rev
+        if config._verbose:
+            print(
+                f"Converting cavity {cavity} with harmonic number " +\
+                f"{harmonic_number} to frequency {frequency:.3f} Hz")
 
-            if config._verbose:
-                print(
-                    f"Converting cavity {cavity} with harmonic number " +\
-                    f"{harmonic_number} to frequency {frequency:.3f} Hz")
-
-            # Update in the line
-            line[cavity].frequency = frequency
+        # Update in the line
+        line[cavity].frequency = frequency
 
     return line
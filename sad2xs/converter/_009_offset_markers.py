@@ -12,6 +12,8 @@ Date:       09-12-2025
 import numpy as np
 import xtrack as xt
 
+from ..element_store import get_parameter_values
+
 ################################################################################
 # Conversion Function
 ################################################################################
@@ -42,9 +44,8 @@ def convert_offset_markers(
     # Markers in Xsuite can come from mark, moni or beam-beam elements
     for marker_type in ["mark", "moni", "beambeam"]:
         if marker_type in parsed_elements:
-            for marker_name, marker in parsed_elements[marker_type].items():
-                if "offset" in marker:
-                    offset_marker_offsets[marker_name] = marker["offset"]
+            offset_marker_offsets.update(get_parameter_values(
+                parsed_elements[marker_type], "offset"))
 
     ########################################
     # Return if there are no offset markers
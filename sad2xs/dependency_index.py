@@ -0,0 +1,263 @@
+"""
+(Unofficial) SAD to XSuite Converter: Variable to Element Dependency Index
+=============================================
+Author(s):  John P T Salvesen
+Email:      john.salvesen@cern.ch
+Date:       09-12-2025
+"""
+
+################################################################################
+# Required Modules
+################################################################################
+import numpy as np
+import xtrack as xt
+
+from xdeps.refs import AttrRef, ItemRef
+
+################################################################################
+# Dependency Index
+################################################################################
+class DependencyIndex:
+    """
+    Which element attributes each variable drives, and the reverse
+
+    Variables include those each attribute depends on through other
+    variables, so e.g. a knob maps to every element its k1_* variables drive
+    Stored as compressed sparse rows of integer arrays:
+        variable_pointers[i]:variable_pointers[i + 1] are the entries of
+        variable i in entry_elements and entry_attributes
+        element_pointers[j]:element_pointers[j + 1] are the variables of
+        element j in element_variables
+        position_pointers[j]:position_pointers[j + 1] are the positions of
+        element j in the line in element_positions, as an element may be
+        installed several times
+    """
+    def __init__(
+            self,
+            variable_names:     list[str],
+            element_names:      list[str],
+            attribute_names:    list[str],
+            variable_pointers:  np.ndarray,
+            entry_elements:     np.ndarray,
+            entry_attributes:   np.ndarray,
+            element_pointers:   np.ndarray,
+            element_variables:  np.ndarray,
+            position_pointers:  np.ndarray,
+            element_positions:  np.ndarray):
+        self.variable_names     = variable_names
+        self.element_names      = element_names
+        self.attribute_names    = attribute_names
+        self.variable_pointers  = variable_pointers
+        self.entry_elements     = entry_elements
+        self.entry_attributes   = entry_attributes
+        self.element_pointers   = element_pointers
+        self.element_variables  = element_variables
+        self.position_pointers  = position_pointers
+        self.element_positions  = element_positions
+
+        self.variable_indices   = {
+            name: index for index, name in enumerate(variable_names)}
+        self.element_indices    = {
+            name: index for index, name in enumerate(element_names)}
+
+    def __repr__(self) -> str:
+        return f"DependencyIndex({len(self.variable_names)} variables, " +\
+            f"{len(self.element_names)} elements, " +\
+            f"{len(self.entry_elements)} attribute dependencies)"
+
+    ########################################
+    # Variable to elements
+    ########################################
+    def get_element_indices(self, variable: str) -> np.ndarray:
+        """
+        Indices (into element_names) of the elements a variable drives
+        """
+        if variable not in self.variable_indices:
+            return np.zeros(0, dtype = np.int32)
+        index   = self.variable_indices[variable]
+        return np.unique(self.entry_elements[
+            self.variable_pointers[index]:self.variable_pointers[index + 1]])
+
+    def get_elements(self, variable: str) -> list[tuple[str, str]]:
+        """
+        (element, attribute) pairs a variable drives
+        """
+        if variable not in self.variable_indices:
+            return []
+        index   = self.variable_indices[variable]
+        entries = slice(
+            self.variable_pointers[index], self.variable_pointers[index + 1])
+        return [
+            (self.element_names[element], self.attribute_names[attribute])
+            for element, attribute in zip(
+                self.entry_elements[entries], self.entry_attributes[entries])]
+
+    def get_line_positions(self, variable: str) -> np.ndarray:
+        """
+        Sorted positions in the line of the elements a variable drives,
+        including every occurrence of elements installed several times
+        """
+        elements    = self.get_element_indices(variable)
+        return np.sort(np.concatenate([
+            self.element_positions[
+                self.position_pointers[element]:self.position_pointers[element + 1]]
+            for element in elements] + [np.zeros(0, dtype = np.int32)]))
+
+    ########################################
+    # Element to variables
+    ########################################
+    def get_variables(self, element: str) -> list[str]:
+        """
+        Variables the attributes of an element depend on
+        """
+        if element not in self.element_indices:
+            return []
+        index   = self.element_indices[element]
+        return [
+            self.variable_names[variable]
+            for variable in self.element_variables[
+                self.element_pointers[index]:self.element_pointers[index + 1]]]
+
+################################################################################
+# Build from a line
+################################################################################
+def get_variable_closures(manager) -> dict[str, tuple[str, ...]]:
+    """
+    For every variable set by an expression, all variables it depends on
+    (directly or through other variables)
+    """
+    vars_ref    = manager.containers["vars"]
+    direct      = {}
+    for target, task in manager.tasks.items():
+        if getattr(target, "_owner", None) is vars_ref:
+            direct[target._key] = [
+                dependency._key for dependency in task.dependencies
+                if getattr(dependency, "_owner", None) is vars_ref]
+
+    ########################################
+    # Depth first, without recursion as chains may be long
+    ########################################
+    closures    = {}
+    for root in direct:
+        stack   = [root]
+        while stack:
+            name    = stack[-1]
+            if name in closures:
+                stack.pop()
+                continue
+            pending = [
+                dependency for dependency in direct.get(name, [])
+                if dependency in direct and dependency not in closures]
+            if pending:
+                stack.extend(pending)
+                continue
+
+            closure = dict.fromkeys(direct[name])
+            for dependency in direct[name]:
+                closure.update(dict.fromkeys(closures.get(dependency, ())))
+            closures[name]  = tuple(closure)
+            stack.pop()
+
+    return closures
+
+def get_element_attribute(target, elements_ref) -> tuple[str, str] | None:
+    """
+    (element, attribute) of an element attribute reference, e.g.
+    element_refs['qf'].knl[2] gives ('qf', 'knl[2]')
+    """
+    path    = []
+    while isinstance(target, (AttrRef, ItemRef)):
+        if target._owner is elements_ref:
+            return target._key, "".join(reversed(path)).lstrip(".")
+        if isinstance(target, AttrRef):
+            path.append(f".{target._key}")
+        else:
+            path.append(f"[{target._key}]")
+        target  = target._owner
+    return None
+
+def build_dependency_index(line: xt.Line) -> DependencyIndex:
+    """
+    Index which elements and attributes of the line each variable drives
+
+    Parameters:
+    ----------
+    line: xt.Line
+        Converted line
+
+    Outputs
+    ----------
+    dependency_index: DependencyIndex
+        Variable to element attribute index, and the reverse
+    """
+    manager         = line.env.ref_manager
+    vars_ref        = manager.containers["vars"]
+    elements_ref    = manager.containers["element_refs"]
+    line_positions  = {}
+    for index, name in enumerate(line.element_names):
+        line_positions.setdefault(name, []).append(index)
+    closures        = get_variable_closures(manager)
+
+    ########################################
+    # Variables of every element attribute in the line
+    ########################################
+    variable_indices    = {}
+    element_indices     = {}
+    attribute_indices   = {}
+    entries             = []
+    for target, task in manager.tasks.items():
+        element_attribute   = get_element_attribute(target, elements_ref)
+        if element_attribute is None or element_attribute[0] not in line_positions:
+            continue
+        element, attribute  = element_attribute
+
+        variables   = {}
+        for dependency in task.dependencies:
+            if getattr(dependency, "_owner", None) is vars_ref:
+                variables[dependency._key] = None
+                variables.update(dict.fromkeys(closures.get(dependency._key, ())))
+
+        element_index   = element_indices.setdefault(element, len(element_indices))
+        attribute_index = attribute_indices.setdefault(
+            attribute, len(attribute_indices))
+        for variable in variables:
+            entries.append((
+                variable_indices.setdefault(variable, len(variable_indices)),
+                element_index,
+                attribute_index))
+
+    ########################################
+    # Compressed sparse rows, both ways
+    ########################################
+    entries     = np.array(entries, dtype = np.int32).reshape(-1, 3)
+    n_variables = len(variable_indices)
+    n_elements  = len(element_indices)
+
+    order               = np.argsort(entries[:, 0], kind = "stable")
+    variable_pointers   = np.zeros(n_variables + 1, dtype = np.int32)
+    np.cumsum(np.bincount(entries[:, 0], minlength = n_variables),
+        out = variable_pointers[1:])
+
+    pairs               = np.unique(entries[:, [1, 0]], axis = 0)
+    element_pointers    = np.zeros(n_elements + 1, dtype = np.int32)
+    np.cumsum(np.bincount(pairs[:, 0], minlength = n_elements),
+        out = element_pointers[1:])
+
+    element_names       = list(element_indices)
+    position_pointers   = np.zeros(n_elements + 1, dtype = np.int32)
+    np.cumsum([len(line_positions[name]) for name in element_names],
+        out = position_pointers[1:])
+
+    return DependencyIndex(
+        variable_names      = list(variable_indices),
+        element_names       = element_names,
+        attribute_names     = list(attribute_indices),
+        variable_pointers   = variable_pointers,
+        entry_elements      = entries[order, 1],
+        entry_attributes    = entries[order, 2],
+        element_pointers    = element_pointers,
+        element_variables   = pairs[:, 1].astype(np.int32),
+        position_pointers   = position_pointers,
+        element_positions   = np.array(
+            [position for name in element_names for position in line_positions[name]],
+            dtype = np.int32))
@@ -0,0 +1,198 @@
+"""
+(Unofficial) SAD to XSuite Converter: Columnar Element Store
+=============================================
+Author(s):  John P T Salvesen
+Email:      john.salvesen@cern.ch
+Date:       09-12-2025
+"""
+
+################################################################################
+# Required Modules
+################################################################################
+import numpy as np
+
+from collections.abc import Mapping, MutableMapping, Iterator
+
+################################################################################
+# Element Row
+################################################################################
+class ElementRow(Mapping):
+    """
+    Read-only view of one element in an ElementTable
+
+    Behaves as the parameter dictionary of the element, e.g. {"l": 1.0}
+    """
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: "ElementTable", row: int):
+        self._table = table
+        self._row   = row
+
+    def __getitem__(self, parameter: str) -> float | str:
+        strings = self._table._strings.get(parameter)
+        if strings is not None and self._row in strings:
+            return strings[self._row]
+
+        column  = self._table._columns.get(parameter)
+        if column is None or np.isnan(column[self._row]):
+            raise KeyError(parameter)
+        return float(column[self._row])
+
+    def __contains__(self, parameter: object) -> bool:
+        strings = self._table._strings.get(parameter)
+        if strings is not None and self._row in strings:
+            return True
+
+        column  = self._table._columns.get(parameter)
+        return column is not None and not np.isnan(column[self._row])
+
+    def __iter__(self) -> Iterator[str]:
+        for parameter in self._table._columns:
+            if parameter in self:
+                yield parameter
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+################################################################################
+# Element Table
+################################################################################
+class ElementTable(MutableMapping):
+    """
+    Columnar store of all elements of one SAD type
+
+    Maps element name to an ElementRow, so converters can read it as the
+    dictionary of element dictionaries produced by the parser
+    Numeric parameters are stored in float64 columns, NaN where unset
+    Expression strings are stored in a side table of row to string
+    """
+    INITIAL_CAPACITY    = 64
+
+    def __init__(self):
+        self._rows:     dict[str, int]              = {}
+        self._columns:  dict[str, np.ndarray]       = {}
+        self._strings:  dict[str, dict[int, str]]   = {}
+        self._n_rows    = 0
+        self._capacity  = 0
+
+    ########################################
+    # Storage
+    ########################################
+    def _new_row(self) -> int:
+        """
+        Allocate a row, growing every column if needed
+        """
+        if self._n_rows == self._capacity:
+            self._capacity  = max(2 * self._capacity, self.INITIAL_CAPACITY)
+            for parameter, column in self._columns.items():
+                grown   = np.full(self._capacity, np.nan)
+                grown[:self._n_rows]        = column[:self._n_rows]
+                self._columns[parameter]    = grown
+
+        self._n_rows    += 1
+        return self._n_rows - 1
+
+    def _clear_row(self, row: int) -> None:
+        """
+        Unset every parameter of a row
+        """
+        for column in self._columns.values():
+            column[row] = np.nan
+        for strings in self._strings.values():
+            strings.pop(row, None)
+
+    ########################################
+    # Mapping interface
+    ########################################
+    def __getitem__(self, name: str) -> ElementRow:
+        return ElementRow(self, self._rows[name])
+
+    def __setitem__(self, name: str, parameters: Mapping) -> None:
+        if name in self._rows:
+            row = self._rows[name]
+            self._clear_row(row)
+        else:
+            row = self._new_row()
+            self._rows[name]    = row
+
+        for parameter, value in parameters.items():
+            if parameter not in self._columns:
+                self._columns[parameter]    = np.full(self._capacity, np.nan)
+
+            if isinstance(value, str):
+                self._strings.setdefault(parameter, {})[row] = value
+            else:
+                self._columns[parameter][row] = value
+
+    def __delitem__(self, name: str) -> None:
+        row = self._rows.pop(name)
+        self._clear_row(row)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __repr__(self) -> str:
+        return f"ElementTable({len(self)} elements, parameters {list(self._columns)})"
+
+    ########################################
+    # Column access
+    ########################################
+    def get_column(self, parameter: str) -> np.ndarray:
+        """
+        Numeric values of a parameter, in element order (NaN where unset
+        or given as an expression)
+        """
+        rows    = np.fromiter(self._rows.values(), dtype = int, count = len(self))
+        column  = self._columns.get(parameter)
+        if column is None:
+            return np.full(len(self), np.nan)
+        return column[rows]
+
+    def get_parameter_values(self, parameter: str) -> dict[str, float | str]:
+        """
+        Values of a parameter for the elements that set it
+        """
+        names   = list(self._rows)
+        column  = self.get_column(parameter)
+        values  = {
+            names[index]: float(column[index])
+            for index in np.flatnonzero(~np.isnan(column))}
+
+        strings = self._strings.get(parameter, {})
+        if len(strings) > 0:
+            for name, row in self._rows.items():
+                if row in strings:
+                    values[name] = strings[row]
+            # Keep element order
+            values  = {name: values[name] for name in names if name in values}
+
+        return values
+
+################################################################################
+# Stage Helpers
+################################################################################
+def get_parameter_values(
+        elements:   Mapping,
+        parameter:  str) -> dict[str, float | str]:
+    """
+    Values of a parameter for the elements that set it
+
+    Uses the columns directly for an ElementTable, and otherwise reads the
+    element dictionaries
+    """
+    if isinstance(elements, ElementTable):
+        return elements.get_parameter_values(parameter)
+
+    return {
+        name: element[parameter]
+        for name, element in elements.items()
+        if isinstance(element, Mapping) and parameter in element}
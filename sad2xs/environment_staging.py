@@ -0,0 +1,298 @@
+"""
+(Unofficial) SAD to XSuite Converter: Environment Staging
+=============================================
+Author(s):  John P T Salvesen
+Email:      john.salvesen@cern.ch
+Date:       09-12-2025
+"""
+
+################################################################################
+# Required Modules
+################################################################################
+import numpy as np
+import xtrack as xt
+
+################################################################################
+# Bulk Variable Creation
+################################################################################
+def set_variables(
+        environment:    xt.Environment,
+        variables:      dict[str, float | str]) -> None:
+    """
+    Create many variables in the environment at once, in order
+
+    The variables are set through the public bulk update of the environment
+    variables, the same entry point xtrack uses when loading variables
+    """
+    for name in variables:
+        if name in environment.element_dict or name in environment.lines:
+            raise ValueError(f"There is already an element or line named {name}")
+
+    try:
+        environment.vars.update(variables)
+    except KeyError as error:
+        raise ValueError(
+            f"Variables depend on undefined {error}. " +\
+            "Check the input data.") from error
+
+################################################################################
+# Bulk Element Creation
+################################################################################
+# Classes whose parameters are independent fields, so that a copy of an
+# element with its parameters set is the same as a newly created element
+# Elements of these classes are built in bulk rather than through
+# environment.new; tests/test_014_environment_staging.py checks that they match
+# the elements environment.new creates, attribute by attribute
+BULK_ELEMENT_CLASSES    = (
+    xt.Drift,
+    xt.Marker,
+    xt.Quadrupole,
+    xt.Sextupole,
+    xt.Octupole,
+    xt.Cavity,
+    xt.LimitEllipse,
+    xt.LimitRect,
+    xt.XYShift,
+    xt.ZetaShift,
+    xt.XRotation,
+    xt.YRotation,
+    xt.SRotation)
+
+def is_bulk_creation(method: str, kwargs: dict) -> bool:
+    """
+    Whether a staged creation is of a bulk class with scalar parameters
+    """
+    return method == "new" \
+        and kwargs["parent"] in BULK_ELEMENT_CLASSES \
+        and all(
+            isinstance(value, (float, int, str))
+            for key, value in kwargs.items() if key not in ("name", "parent"))
+
+def is_expression(parent, key: str, value) -> bool:
+    """
+    Whether a parameter of an element creation is an expression
+    Strings of the fields the class does not allow expressions for (e.g. the
+    drift model) are values, as in environment.new
+    """
+    return isinstance(value, str) \
+        and key not in ("name", "parent") \
+        and key not in getattr(parent, "_noexpr_fields", ())
+
+def create_elements(
+        environment:    xt.Environment,
+        creations:      list[dict]) -> None:
+    """
+    Create many elements of the bulk classes at once, in order
+
+    Elements of the same class that set the same parameters are built
+    together: the first is created from its values, and the others are
+    copies of it with their values set
+    The elements are added to the environment elements, and their expressions
+    set with environment.set, the public entry points environment.new
+    documents for elements created outside of it
+    """
+    names   = set()
+    for kwargs in creations:
+        if kwargs["name"] in names \
+                or kwargs["name"] in environment.element_dict \
+                or kwargs["name"] in environment.lines \
+                or kwargs["name"] in environment.vars:
+            raise ValueError(f"There is already an element named {kwargs['name']}")
+        names.add(kwargs["name"])
+
+    ########################################
+    # Group by class and parameters
+    ########################################
+    groups  = {}
+    for kwargs in creations:
+        parent      = kwargs["parent"]
+        values      = tuple(sorted(
+            key for key, value in kwargs.items()
+            if key not in ("name", "parent")
+            and not is_expression(parent, key, value)))
+        expressions = tuple(sorted(
+            key for key, value in kwargs.items()
+            if is_expression(parent, key, value)))
+        groups.setdefault((parent, values, expressions), []).append(kwargs)
+
+    ########################################
+    # Build the elements of each group
+    ########################################
+    elements    = {}
+    for (parent, values, _), group in groups.items():
+        prototype       = parent(**{key: group[0][key] for key in values})
+        # As environment.new does for elements created from a class
+        prototype.prototype = None
+
+        elements[group[0]["name"]]  = prototype
+        for kwargs in group[1:]:
+            element = prototype.copy()
+            for key in values:
+                setattr(element, key, kwargs[key])
+            elements[kwargs["name"]]    = element
+
+    ########################################
+    # Add them in order, then set their expressions
+    ########################################
+    for kwargs in creations:
+        environment.elements[kwargs["name"]]    = elements[kwargs["name"]]
+
+    for kwargs in creations:
+        expressions = {
+            key: value for key, value in kwargs.items()
+            if is_expression(kwargs["parent"], key, value)}
+        if len(expressions) == 0:
+            continue
+        try:
+            environment.set(kwargs["name"], **expressions)
+        except KeyError as error:
+            raise ValueError(
+                f"Element {kwargs['name']} depends on undefined {error}. " +\
+                "Check the input data.") from error
+
+################################################################################
+# Element Fingerprints
+################################################################################
+def get_fingerprint(value):
+    """
+    Hashable form of an element parameter
+    Variables and expressions are compared by their text, not their values,
+    so that elements driven by different knobs are never merged
+    Raises a TypeError for parameters that cannot be compared
+    """
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(get_fingerprint(item) for item in value)
+    hash(value)
+    return value
+
+################################################################################
+# Element Specifications
+################################################################################
+class ElementSpecs:
+    """
+    The variables and element creations staged by a converter, without an
+    environment, so that they can be computed in a worker process and
+    returned (they are picklable)
+
+    Reads go to values, a copy of the environment variables converters use
+    """
+    def __init__(self, values: dict[str, float] | None = None):
+        self.values:        dict[str, float]            = dict(values or {})
+        self.variables:     dict[str, float | str]      = {}
+        self.creations:     list[tuple[str, dict]]      = []
+
+    def __setitem__(self, name: str, value: float | str) -> None:
+        self.variables[name]    = value
+
+    def __getitem__(self, name: str):
+        return self.values[name]
+
+    def new(self, name: str, parent, **kwargs) -> None:
+        """
+        Stage the creation of an element
+        """
+        self.creations.append(("new", {"name": name, "parent": parent, **kwargs}))
+
+    def new_line(self, name: str, components: list[str], **kwargs) -> None:
+        """
+        Stage the creation of a line, after the elements staged before it
+        """
+        self.creations.append(
+            ("new_line", {"name": name, "components": components, **kwargs}))
+
+    def extend(self, specs: "ElementSpecs") -> None:
+        """
+        Stage the variables and creations of specs after those staged so far
+        """
+        self.variables.update(specs.variables)
+        self.creations.extend(specs.creations)
+
+################################################################################
+# Staged Environment
+################################################################################
+class StagedEnvironment(ElementSpecs):
+    """
+    Collects the variables and elements of one conversion stage, and adds
+    them to the environment together on commit
+    Elements of the simple classes (BULK_ELEMENT_CLASSES) are built in bulk
+    by create_elements, and others with environment.new
+
+    Converters use it in place of the environment: variables are set with
+    staged[name] = value and elements created with new and new_line
+    Reads go to the environment, so do not include uncommitted variables
+    Specs computed elsewhere (e.g. in worker processes) are staged with extend
+
+    With deduplicate, elements with the same type and parameters (values,
+    or the same variables and expressions) are created as clones of the
+    first of them
+    """
+    def __init__(
+            self,
+            environment:    xt.Environment,
+            deduplicate:    bool = False):
+        super().__init__()
+        self.environment                                = environment
+        self.deduplicate                                = deduplicate
+        self.parents:       dict[tuple, str]            = {}
+        self.n_clones                                   = 0
+
+    def __getitem__(self, name: str):
+        return self.environment[name]
+
+    def deduplicate_creations(self) -> None:
+        """
+        Replace the staged creation of each element identical to an earlier
+        one by a clone of that element
+        """
+        creations   = []
+        for method, kwargs in self.creations:
+            if method != "new" or not isinstance(kwargs["parent"], type):
+                creations.append((method, kwargs))
+                continue
+
+            try:
+                fingerprint = (kwargs["parent"], *sorted(
+                    (key, get_fingerprint(value))
+                    for key, value in kwargs.items() if key != "name"))
+                hash(fingerprint)
+            except TypeError:
+                creations.append((method, kwargs))
+                continue
+
+            parent_name = self.parents.setdefault(fingerprint, kwargs["name"])
+            if parent_name == kwargs["name"]:
+                creations.append((method, kwargs))
+                continue
+
+            creations.append(("new", {
+                "name":     kwargs["name"],
+                "parent":   parent_name,
+                "mode":     "clone"}))
+            self.n_clones   += 1
+
+        self.creations  = creations
+
+    def commit(self) -> None:
+        """
+        Add the staged variables, then the staged elements and lines in order
+        """
+        if self.deduplicate:
+            self.deduplicate_creations()
+
+        set_variables(self.environment, self.variables)
+
+        # Runs of bulk creations are created together, keeping the order
+        bulk_creations  = []
+        for method, kwargs in self.creations:
+            if is_bulk_creation(method, kwargs):
+                bulk_creations.append(kwargs)
+                continue
+            if len(bulk_creations) > 0:
+                create_elements(self.environment, bulk_creations)
+                bulk_creations  = []
+            getattr(self.environment, method)(**kwargs)
+        if len(bulk_creations) > 0:
+            create_elements(self.environment, bulk_creations)
+
+        self.variables  = {}
+        self.creations  = []
@@ -0,0 +1,181 @@
+"""
+(Unofficial) SAD to XSuite Converter: Bulk Expression Evaluation
+=============================================
+Author(s):  John P T Salvesen
+Email:      john.salvesen@cern.ch
+Date:       09-12-2025
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import numpy as np
+import xdeps as xd
+
+from scipy import special
+
+from .expression_translator import SAD_EXPRESSION_TRANSLATOR
+from .converter._003_expression_converter import order_expressions
+
+################################################################################
+# Array Functions
+################################################################################
+# NumPy equivalents of the functions of xdeps expressions
+ARRAY_FUNCTIONS = {
+    "sqrt":     np.sqrt,
+    "log":      np.log,
+    "log10":    np.log10,
+    "exp":      np.exp,
+    "sin":      np.sin,
+    "cos":      np.cos,
+    "tan":      np.tan,
+    "asin":     np.arcsin,
+    "acos":     np.arccos,
+    "atan":     np.arctan,
+    "atan2":    np.arctan2,
+    "sinh":     np.sinh,
+    "cosh":     np.cosh,
+    "tanh":     np.tanh,
+    "sinc":     lambda x: np.sinc(x / np.pi),
+    "abs":      np.abs,
+    "erf":      special.erf,
+    "erfc":     special.erfc,
+    "floor":    np.floor,
+    "ceil":     np.ceil,
+    "round":    np.round,
+    "frac":     lambda x: x % 1}
+
+################################################################################
+# Expression Templates
+################################################################################
+OPERATORS   = {
+    "add":  "+",
+    "sub":  "-",
+    "mul":  "*",
+    "div":  "/",
+    "pow":  "**"}
+
+def get_template(
+        node:           tuple,
+        names:          list[str],
+        coefficients:   list[float]) -> str:
+    """
+    Python text of an expression tree with its variables and numbers
+    replaced by placeholders (_v0, _v1, ... and _c0, _c1, ...)
+
+    Expressions that only differ in their variables or numbers, e.g.
+    kqf * 0.5 and kqd * 0.25, share the same template (_v0 * _c0)
+    The variables and numbers are appended to names and coefficients
+    """
+    kind    = node[0]
+    if kind == "num":
+        coefficients.append(float(node[1]))
+        return f"_c{len(coefficients) - 1}"
+    if kind == "name":
+        names.append(node[1])
+        return f"_v{len(names) - 1}"
+    if kind == "call":
+        if node[1] not in ARRAY_FUNCTIONS:
+            raise ValueError(f"Unknown function {node[1]}")
+        arguments   = [get_template(arg, names, coefficients) for arg in node[2:]]
+        return f"_f['{node[1]}']({', '.join(arguments)})"
+    if kind == "neg":
+        return f"(-{get_template(node[1], names, coefficients)})"
+
+    left    = get_template(node[1], names, coefficients)
+    right   = get_template(node[2], names, coefficients)
+    return f"({left} {OPERATORS[kind]} {right})"
+
+################################################################################
+# Bulk Evaluation
+################################################################################
+def evaluate_expressions(parsed_lattice_data: dict) -> xd.Table:
+    """
+    Numeric value of every parsed expression, evaluated in one batch
+
+    Expressions are evaluated in dependency order, level by level: all
+    expressions of a level only depend on earlier levels, and those with the
+    same template (differing only in variables and numbers) are evaluated
+    together as NumPy arrays
+    Invalid operations (e.g. the square root of a negative number) give nan
+
+    Parameters:
+    ----------
+    parsed_lattice_data: dict
+        Parsed SAD lattice, with its "expressions" and "globals"
+
+    Outputs
+    ----------
+    table: xd.Table
+        Columns name and value, one row per expression in dependency order,
+        e.g. table["value", "kqf"]
+    """
+    expressions = parsed_lattice_data["expressions"]
+    order       = order_expressions(expressions, "expressions")
+
+    ########################################
+    # Values: the expressions, then the numeric globals
+    ########################################
+    globals_    = {
+        name: value
+        for name, value in parsed_lattice_data["globals"].items()
+        if isinstance(value, (int, float)) and name not in expressions}
+    names       = order + list(globals_)
+    indices     = {name: index for index, name in enumerate(names)}
+    values      = np.full(len(names), np.nan)
+    values[len(order):] = list(globals_.values())
+
+    ########################################
+    # Group by dependency level and template
+    ########################################
+    levels  = {}
+    groups  = {}
+    for name in order:
+        expression  = expressions[name]
+        if not isinstance(expression, str):
+            values[indices[name]]   = expression
+            levels[name]            = 0
+            continue
+
+        try:
+            node    = SAD_EXPRESSION_TRANSLATOR.parse(expression.strip())
+        except ValueError as error:
+            raise ValueError(
+                f"Variable {name} could not be parsed ({error}). " +\
+                "Check the input data.") from error
+
+        var_names       = []
+        coefficients    = []
+        template        = get_template(node, var_names, coefficients)
+        for var_name in var_names:
+            if var_name not in indices:
+                raise ValueError(
+                    f"Variable {name} depends on undefined '{var_name}'. " +\
+                    "Check the input data.")
+
+        levels[name]    = 1 + max(
+            (levels.get(var_name, 0) for var_name in var_names), default = 0)
+        groups.setdefault((levels[name], template), []).append(
+            (indices[name], var_names, coefficients))
+
+    ########################################
+    # Evaluate each group as arrays
+    ########################################
+    compiled    = {}
+    with np.errstate(all = "ignore"):
+        for (_, template), members in sorted(groups.items(), key = lambda item: item[0][0]):
+            if template not in compiled:
+                compiled[template]  = compile(template, template, "eval")
+
+            targets, var_names, coefficients    = zip(*members)
+            arguments   = {"_f": ARRAY_FUNCTIONS}
+            for i, column in enumerate(zip(*var_names)):
+                arguments[f"_v{i}"] = values[[indices[name] for name in column]]
+            for i, column in enumerate(zip(*coefficients)):
+                arguments[f"_c{i}"] = np.array(column)
+
+            values[list(targets)]   = eval(compiled[template], {"__builtins__": {}}, arguments)
+
+    return xd.Table({
+        "name":     np.array(order),
+        "value":    values[:len(order)]})
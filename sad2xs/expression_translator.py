@@ -0,0 +1,312 @@
+"""
+(Unofficial) SAD to XSuite Converter: SAD Expression Translator
+=============================================
+Author(s):  John P T Salvesen
+Email:      john.salvesen@cern.ch
+Date:       09-12-2025
+
+Translates SAD (Mathematica style) expressions, e.g. Sqrt[a]^2 * Pi, to
+the syntax of xdeps expressions, e.g. sqrt(a)**2 * 3.141592653589793
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import math
+import re
+
+################################################################################
+# SAD Functions and Constants
+################################################################################
+# Names are lowercase, as the parser lowercases every name
+# Functions with a different name or argument order in xdeps
+SAD_FUNCTIONS   = {
+    "sqrt":     "sqrt",
+    "exp":      "exp",
+    "log":      "log",
+    "sin":      "sin",
+    "cos":      "cos",
+    "tan":      "tan",
+    "arcsin":   "asin",
+    "arccos":   "acos",
+    "arctan":   "atan",
+    "sinh":     "sinh",
+    "cosh":     "cosh",
+    "tanh":     "tanh",
+    "abs":      "abs",
+    "floor":    "floor",
+    "ceiling":  "ceil",
+    "round":    "round",
+    "erf":      "erf",
+    "erfc":     "erfc"}
+
+SAD_CONSTANTS   = {
+    "pi":       repr(math.pi),
+    "degree":   repr(math.pi / 180)}
+
+################################################################################
+# Tokens
+################################################################################
+SAD_EXPRESSION_TOKEN_PATTERN    = re.compile(r"""
+    \s*(?:(?P<NUMBER>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<NAME>[A-Za-z_$][A-Za-z0-9_$.]*)
+    |(?P<OP>\*\*|[-+*/^()\[\],]))
+    """, re.VERBOSE)
+
+def tokenize_expression(expression: str) -> list[tuple[str, str]]:
+    """
+    (kind, value) tokens of an expression, ending with an END token
+    """
+    tokens      = []
+    position    = 0
+    expression  = expression.rstrip()
+    while position < len(expression):
+        match   = SAD_EXPRESSION_TOKEN_PATTERN.match(expression, position)
+        if match is None:
+            raise ValueError(
+                f"Unexpected character '{expression[position:].lstrip()[:1]}'")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position    = match.end()
+    tokens.append(("END", ""))
+    return tokens
+
+################################################################################
+# Translator
+################################################################################
+# Precedence of each node kind in the output, higher binds tighter
+# Negation is an atom in xdeps (-a^2 is (-a)^2 there), so it is always
+# written with its operand bracketed unless that is an atom itself
+PRECEDENCE  = {
+    "add":  1,
+    "sub":  1,
+    "mul":  2,
+    "div":  2,
+    "neg":  3,
+    "pow":  4,
+    "num":  5,
+    "name": 5,
+    "call": 5}
+
+OPERATORS   = {
+    "add":  " + ",
+    "sub":  " - ",
+    "mul":  " * ",
+    "div":  " / ",
+    "pow":  "**"}
+
+# Maximum number of distinct expressions and sub-expressions kept
+TRANSLATION_CACHE_SIZE  = 2**16
+
+class SadExpressionTranslator:
+    """
+    Recursive descent parser of SAD expressions, writing xdeps expressions
+
+    Expressions are parsed to trees of tuples, e.g. a + 2 is
+    ("add", ("name", "a"), ("num", "2")), which are shared between all
+    expressions: identical sub-expressions are parsed to the same node, and
+    each node is written out once
+    Translations are memoized per expression string, as many elements share
+    the same strength expressions
+    """
+    def __init__(self):
+        self.translations:  dict[str, str]      = {}
+        self.nodes:         dict[tuple, tuple]  = {}
+        self.texts:         dict[tuple, str]    = {}
+
+    def clear(self) -> None:
+        self.translations.clear()
+        self.nodes.clear()
+        self.texts.clear()
+
+    def translate(self, expression: str) -> str:
+        """
+        Translate an expression, raising a ValueError if it is not valid
+        """
+        if expression in self.translations:
+            return self.translations[expression]
+
+        if len(self.translations) >= TRANSLATION_CACHE_SIZE:
+            self.clear()
+
+        translation = self.write(self.parse(expression))
+        self.translations[expression]   = translation
+        return translation
+
+    def parse(self, expression: str) -> tuple:
+        """
+        Parse an expression to its tree, raising a ValueError if it is not
+        valid
+        """
+        self.tokens     = tokenize_expression(expression)
+        self.position   = 0
+        node            = self.parse_sum()
+        if self.peek()[0] != "END":
+            raise ValueError(f"Unexpected '{self.peek()[1]}'")
+        return node
+
+    ########################################
+    # Parsing
+    ########################################
+    def peek(self) -> tuple[str, str]:
+        return self.tokens[self.position]
+
+    def pop(self) -> tuple[str, str]:
+        token           = self.tokens[self.position]
+        self.position   += 1
+        return token
+
+    def expect(self, value: str) -> None:
+        kind, token_value   = self.pop()
+        if token_value != value or kind != "OP":
+            raise ValueError(f"Expected '{value}' but found '{token_value}'")
+
+    def node(self, *node: tuple) -> tuple:
+        """
+        The shared node equal to node
+        """
+        return self.nodes.setdefault(node, node)
+
+    def parse_sum(self) -> tuple:
+        node    = self.parse_product()
+        while self.peek() in (("OP", "+"), ("OP", "-")):
+            operator    = "add" if self.pop()[1] == "+" else "sub"
+            node        = self.node(operator, node, self.parse_product())
+        return node
+
+    def parse_product(self) -> tuple:
+        node    = self.parse_unary()
+        while self.peek() in (("OP", "*"), ("OP", "/")):
+            operator    = "mul" if self.pop()[1] == "*" else "div"
+            node        = self.node(operator, node, self.parse_unary())
+        return node
+
+    def parse_unary(self) -> tuple:
+        if self.peek() == ("OP", "-"):
+            self.pop()
+            return self.node("neg", self.parse_unary())
+        if self.peek() == ("OP", "+"):
+            self.pop()
+            return self.parse_unary()
+        return self.parse_power()
+
+    def parse_power(self) -> tuple:
+        # Right associative, and binds tighter than a leading minus, as in SAD
+        node    = self.parse_atom()
+        if self.peek() in (("OP", "^"), ("OP", "**")):
+            self.pop()
+            node    = self.node("pow", node, self.parse_unary())
+        return node
+
+    def parse_atom(self) -> tuple:
+        kind, value = self.pop()
+        if kind == "NUMBER":
+            return self.node("num", value)
+
+        if kind == "NAME":
+            if self.peek() == ("OP", "["):
+                return self.parse_call(value, "]")
+            if self.peek() == ("OP", "("):
+                return self.parse_call(value, ")")
+            if value.lower() in SAD_CONSTANTS:
+                return self.node("num", SAD_CONSTANTS[value.lower()])
+            return self.node("name", value)
+
+        if (kind, value) == ("OP", "("):
+            node    = self.parse_sum()
+            self.expect(")")
+            return node
+
+        raise ValueError(f"Unexpected '{value}'" if kind != "END" else
+            "Unexpected end of expression")
+
+    def parse_call(self, name: str, closing: str) -> tuple:
+        """
+        Function call, f[a, b] in SAD or f(a, b) as already in xdeps syntax
+        """
+        self.pop()
+        arguments   = [self.parse_sum()]
+        while self.peek() == ("OP", ","):
+            self.pop()
+            arguments.append(self.parse_sum())
+        self.expect(closing)
+
+        if closing == ")":
+            return self.node("call", name, *arguments)
+
+        function    = name.lower()
+        if function == "log" and len(arguments) == 2:
+            # Log[b, x] is the logarithm of x to base b
+            return self.node("div",
+                self.node("call", "log", arguments[1]),
+                self.node("call", "log", arguments[0]))
+        if function == "arctan" and len(arguments) == 2:
+            # ArcTan[x, y] is the angle of the point (x, y)
+            return self.node("call", "atan2", arguments[1], arguments[0])
+        if function not in SAD_FUNCTIONS:
+            raise ValueError(f"Unsupported SAD function {name}")
+        return self.node("call", SAD_FUNCTIONS[function], *arguments)
+
+    ########################################
+    # Writing
+    ########################################
+    def write(self, node: tuple) -> str:
+        if node not in self.texts:
+            self.texts[node]    = self.write_node(node)
+        return self.texts[node]
+
+    def write_operand(self, node: tuple, precedence: int) -> str:
+        """
+        Write an operand, bracketed if it binds less tightly than precedence
+        """
+        if PRECEDENCE[node[0]] < precedence:
+            return f"({self.write(node)})"
+        return self.write(node)
+
+    def write_node(self, node: tuple) -> str:
+        kind    = node[0]
+        if kind in ("num", "name"):
+            return node[1]
+        if kind == "call":
+            return f"{node[1]}({', '.join(self.write(arg) for arg in node[2:])})"
+        if kind == "neg":
+            return f"-{self.write_operand(node[1], PRECEDENCE['num'])}"
+
+        ########################################
+        # Binary operators
+        ########################################
+        precedence  = PRECEDENCE[kind]
+        if kind == "pow":
+            # xdeps powers are left associative
+            left    = self.write_operand(node[1], PRECEDENCE["num"])
+            right   = self.write_operand(node[2], PRECEDENCE["num"])
+        else:
+            left    = self.write_operand(node[1], precedence)
+            right   = self.write_operand(node[2], precedence + 1)
+        return f"{left}{OPERATORS[kind]}{right}"
+
+################################################################################
+# Translation Function
+################################################################################
+SAD_EXPRESSION_TRANSLATOR   = SadExpressionTranslator()
+
+def translate_sad_expression(expression: str) -> str:
+    """
+    Translate a SAD expression to an xdeps expression
+
+    Expressions that cannot be parsed are returned stripped but otherwise
+    unchanged, so that the error is reported where they are used
+
+    Parameters:
+    ----------
+    expression: str
+        SAD expression, e.g. "Sqrt[kqf^2 + 1] * Pi"
+
+    Outputs
+    ----------
+    translation: str
+        xdeps expression, e.g. "sqrt(kqf**2 + 1) * 3.141592653589793"
+    """
+    try:
+        return SAD_EXPRESSION_TRANSLATOR.translate(expression)
+    except ValueError:
+        return expression.strip()
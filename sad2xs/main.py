@@ -13,10 +13,11 @@ import xtrack as xt
 
 from .config import Config
 from .helpers import print_section_heading
+from .dependency_index import build_dependency_index
 
-from .converter._001_parser import parse_sad_file
-from .converter._002_element_exclusion import exclude_elements
-from .converter._003_expression_converter import convert_expressions
+from .converter._001_parser import parse_sad_file, copy_parsed_data, IncrementalSadParser
+from .converter._002_element_exclusion import exclude_elements, select_line, exclude_unselected_lines
+from .converter._003_expression_converter import fold_constant_expressions, prune_unused_variables, convert_expressions
 from .converter._004_element_converter import convert_elements
 from .converter._005_line_converter import convert_lines
 from .converter._006_solenoid_converter import convert_solenoids, solenoid_reference_shift_corrections
@@ -30,7 +31,7 @@ from .converter._011_write_optics import write_optics
 # Overall Function
 ################################################################################
 def convert_sad_to_xsuite(
-        sad_lattice_path:               str,
+        sad_lattice_path:               str | list[str],
         output_directory:               str,
         output_filename:                str | None  = None,
         line_name:                      str | None  = None,
@@ -41,6 +42,8 @@ def convert_sad_to_xsuite(
         reverse_bend_direction:         bool        = False,
         reverse_charge:                 bool        = False,
         install_apertures_as_markers:   bool        = False,
+        incremental_parser:             IncrementalSadParser | None = None,
+        return_dependency_index:        bool        = False,
         **kwargs):
     
     ############################################################################
@@ -61,9 +64,16 @@ def convert_sad_to_xsuite(
     if config._verbose:
         print_section_heading("Parsing SAD File", mode = 'section')
 
-    parsed_lattice_data = parse_sad_file(
-        sad_lattice_path    = sad_lattice_path,
-        config              = config)
+    if incremental_parser is not None:
+        # Only the edited parts of the deck are re-parsed, and later stages
+        # modify the parsed data, so they work on a copy
+        incremental_parser.check_config(config)
+        parsed_lattice_data = copy_parsed_data(
+            incremental_parser.parse(sad_lattice_path))
+    else:
+        parsed_lattice_data = parse_sad_file(
+            sad_lattice_path    = sad_lattice_path,
+            config              = config)
 
     ############################################################################
     # Remove Excluded elements
@@ -95,6 +105,45 @@ def convert_sad_to_xsuite(
                 
                 parsed_lattice_data['elements'].pop("apert")
 
+    ############################################################################
+    # Fold constant expressions
+    ############################################################################
+    if config.FOLD_CONSTANT_EXPRESSIONS:
+        if config._verbose:
+            print_section_heading("Folding Constant Expressions", mode = 'section')
+
+        parsed_lattice_data = fold_constant_expressions(
+            parsed_lattice_data = parsed_lattice_data,
+            config              = config)
+
+    ############################################################################
+    # Remove elements and lines outside the selected line
+    ############################################################################
+    if config.CONVERT_SELECTED_LINE_ONLY:
+        if config._verbose:
+            print_section_heading("Removing Unselected Lines", mode = 'section')
+
+        line_name           = select_line(
+            parsed_lattice_data = parsed_lattice_data,
+            line_name           = line_name,
+            config              = config)
+        parsed_lattice_data = exclude_unselected_lines(
+            parsed_lattice_data = parsed_lattice_data,
+            line_name           = line_name,
+            config              = config)
+
+    ############################################################################
+    # Prune variables the line does not use
+    ############################################################################
+    if config.PRUNE_UNUSED_VARIABLES:
+        if config._verbose:
+            print_section_heading("Pruning Unused Variables", mode = 'section')
+
+        parsed_lattice_data = prune_unused_variables(
+            parsed_lattice_data = parsed_lattice_data,
+            line_name           = line_name,
+            config              = config)
+
     ############################################################################
     # Build Environment
     ############################################################################
@@ -310,6 +359,8 @@ def convert_sad_to_xsuite(
     if config._test_mode:
         if config._verbose:
             print_section_heading("Converter Breakpoint: Test mode active", mode = 'section')
+        if return_dependency_index:
+            return line, build_dependency_index(line)
         return line
 
     ############################################################################
@@ -320,7 +371,10 @@ def convert_sad_to_xsuite(
     # Filename
     ########################################
     if output_filename is None:
-        output_filename = sad_lattice_path.split('/')[-1].replace('.sad', '')
+        # For several files, name the output after the first (base) file
+        base_lattice_path   = sad_lattice_path if isinstance(sad_lattice_path, str) \
+            else sad_lattice_path[0]
+        output_filename = base_lattice_path.split('/')[-1].replace('.sad', '')
     else:
         assert isinstance(output_filename, str), "output_filename must be a string"
 
@@ -378,4 +432,7 @@ def convert_sad_to_xsuite(
     ############################################################################
     # Return the line
     ############################################################################
+    if return_dependency_index:
+        # Which elements each variable drives, and the reverse
+        return line, build_dependency_index(line)
     return line
@@ -73,6 +73,11 @@ def create_multipole_lattice_file_information(
 # Base Elements
 ########################################"""
 
+    # Lowest order of the replicas, the others set their own
+    mult_orders = {
+        mult_length: min(line[replica_name].order for replica_name in mults[mult_length])
+        for mult_length in mult_lengths}
+
     for mult_name, mult_length in zip(mult_names, mult_lengths):
         output_string += f"""
 env.new(
@@ -80,7 +85,7 @@ env.new(
     parent              = xt.Multipole,
     length              = {mult_length},
     _isthick            = True,
-    order               = {config.MAX_KNL_ORDER})"""
+    order               = {mult_orders[mult_length]})"""
 
     output_string += "\n"
 
@@ -101,7 +106,10 @@ env.new(
                 if root_name not in mults[mult_length]:
                     replica_name        = root_name
 
-            if check_is_simple_unpowered_multipole(line, replica_name):
+            order   = line[replica_name].order
+
+            if check_is_simple_unpowered_multipole(line, replica_name) and \
+                    order == mult_orders[mult_length]:
                 output_string += f"""
 env.new(name = '{replica_name}', parent = '{mult}')"""
 
@@ -119,6 +127,11 @@ env.new(
     name        = '{replica_name}',
     parent      = '{mult}'"""
 
+                # Order, if above that of the base element
+                if order != mult_orders[mult_length]:
+                    mult_generation += f""",
+    order       = {order}"""
+
                 # Strength information                    
                 if knl != "[]":
                     mult_generation += f""",
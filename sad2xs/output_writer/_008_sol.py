@@ -72,13 +72,18 @@ def create_solenoid_lattice_file_information(
 # Base Elements
 ########################################"""
 
+    # Lowest order of the replicas, the others set their own
+    sol_orders  = {
+        sol_length: min(line[replica_name].order for replica_name in sols[sol_length])
+        for sol_length in sol_lengths}
+
     for sol_name, sol_length in zip(sol_names, sol_lengths):
         output_string += f"""
 env.new(
     name                = '{sol_name}',
     parent              = xt.UniformSolenoid,
     length              = {sol_length},
-    order               = {config.MAX_KNL_ORDER})"""
+    order               = {sol_orders[sol_length]})"""
 
     output_string += "\n"
 
@@ -95,6 +100,7 @@ env.new(
 
             # Get the replica information
             ks          = line[replica_name].ks
+            order       = line[replica_name].order
             knl         = get_knl_string(line[replica_name].knl)
             ksl         = get_knl_string(line[replica_name].ksl)
             shift_x     = line[replica_name].shift_x
@@ -121,6 +127,11 @@ env.new(
     name        = '{replica_name}',
     parent      = '{sol}'"""
 
+            # Order, if above that of the base element
+            if order != sol_orders[sol_length]:
+                sol_generation += f""",
+    order       = {order}"""
+
             # Strength information
             if ks != 0:
                 sol_generation += f""",
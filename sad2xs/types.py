@@ -28,6 +28,26 @@ class ConfigLike(Protocol):
     ASCII_LOGO:                     str
 
     SAD_ALLOWED_ELEMENTS:           set[str]
+
+    PARSE_CACHE_DIRECTORY:          str | None
+    PARSE_CACHE_MAX_BYTES:          int
+
+    PARSE_WORKERS:                  int
+    PARSE_PARALLEL_MIN_BYTES:       int
+
+    COLUMNAR_ELEMENT_STORE:         bool
+
+    LAZY_ELEMENT_PARAMETERS:        bool
+
+    FOLD_CONSTANT_EXPRESSIONS:      bool
+    KNOB_VARIABLES:                 set[str]
+
+    PRUNE_UNUSED_VARIABLES:         bool
+    CONVERT_SELECTED_LINE_ONLY:     bool
+    DEDUPLICATE_ELEMENTS:           bool
+
+    ELEMENT_WORKERS:                int
+    ELEMENT_PARALLEL_MIN_ELEMENTS:  int
         
     ref_particle_mass0:             float | None
     ref_particle_q0:                float | None
@@ -0,0 +1,58 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import numpy as np
+import xtrack as xt
+
+from sad2xs.dependency_index import build_dependency_index
+
+################################################################################
+# Test Line
+################################################################################
+def make_line() -> xt.Line:
+    """
+    Line with a knob driving a focusing quadrupole installed three times
+    """
+    env = xt.Environment()
+    env["kq"]       = 0.1
+    env["kqf"]      = "kq"
+    env["kqd"]      = "-kq"
+    env["kd_len"]   = 1.0
+
+    env.new("qf", xt.Quadrupole, length = 0.5, k1 = "kqf")
+    env.new("qd", xt.Quadrupole, length = 0.5, k1 = "kqd")
+    env.new("d", xt.Drift, length = "kd_len")
+
+    return env.new_line(components = ["qf", "d", "qd", "d", "qf", "d", "qf"])
+
+################################################################################
+# PyTest Functions
+################################################################################
+def test_repeated_element_positions():
+    """
+    Every position of an element installed several times is returned
+    """
+    index   = build_dependency_index(make_line())
+
+    assert np.array_equal(index.get_line_positions("kqf"), [0, 4, 6])
+    assert np.array_equal(index.get_line_positions("kqd"), [2])
+    assert np.array_equal(index.get_line_positions("kd_len"), [1, 3, 5])
+    assert np.array_equal(index.get_line_positions("kq"), [0, 2, 4, 6])
+    assert len(index.get_line_positions("undefined")) == 0
+
+def test_variables_and_elements():
+    """
+    Variables map to the element attributes they drive, also through other
+    variables, and elements map back to their variables
+    """
+    index   = build_dependency_index(make_line())
+
+    assert index.get_elements("kqf") == [("qf", "k1")]
+    assert sorted(index.get_elements("kq")) == [("qd", "k1"), ("qf", "k1")]
+    assert sorted(index.get_variables("qf")) == ["kq", "kqf"]
+    assert index.get_variables("d") == ["kd_len"]
+    assert index.get_elements("undefined") == []
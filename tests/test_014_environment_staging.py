@@ -0,0 +1,194 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import numpy as np
+import pytest
+import xtrack as xt
+
+from sad2xs.environment_staging import (
+    BULK_ELEMENT_CLASSES, create_elements, set_variables, StagedEnvironment)
+
+################################################################################
+# Element Parameters
+################################################################################
+# Two sets of parameters per bulk class, the same parameters with different
+# values, so that the second element is built as a copy of the first
+BULK_PARAMETERS = {
+    xt.Drift:           [
+        {"length": 1.0, "model": "exact"},
+        {"length": "l_d", "model": "expanded"}],
+    xt.Marker:          [{}, {}],
+    xt.Quadrupole:      [
+        {"length": 0.5, "k1": "k_q", "k1s": 0.01, "shift_x": 1E-3,
+            "rot_s_rad": 0.2, "edge_entry_active": 0, "integrator": "yoshida4",
+            "num_multipole_kicks": 3},
+        {"length": 0.7, "k1": "-k_q", "k1s": -0.02, "shift_x": -2E-3,
+            "rot_s_rad": -0.1, "edge_entry_active": 1, "integrator": "uniform",
+            "num_multipole_kicks": 5}],
+    xt.Sextupole:       [
+        {"length": 0.3, "k2": "k_s", "k2s": 0.5, "rot_s_rad": "a_r"},
+        {"length": 0.0, "k2": "2 * k_s", "k2s": 0.0, "rot_s_rad": "-a_r"}],
+    xt.Octupole:        [
+        {"length": 0.2, "k3": 10.0, "shift_y": 1E-3, "model": "drift-kick-drift-exact"},
+        {"length": 0.4, "k3": -5.0, "shift_y": 0.0, "model": "mat-kick-mat"}],
+    xt.Cavity:          [
+        {"length": 0.0, "voltage": "v_c", "frequency": 500E6, "lag": 180.0},
+        {"length": 1.0, "voltage": "2 * v_c", "frequency": 400E6, "lag": 0.0}],
+    xt.LimitEllipse:    [
+        {"a": 0.01, "b": 0.02},
+        {"a": 0.03, "b": 0.01}],
+    xt.LimitRect:       [
+        {"min_x": -0.01, "max_x": 0.01, "min_y": -0.02, "max_y": 0.02},
+        {"min_x": -0.03, "max_x": 0.02, "min_y": -0.01, "max_y": 0.01}],
+    xt.XYShift:         [
+        {"dx": 1E-3, "dy": "a_r * 1E-3"},
+        {"dx": -2E-3, "dy": "-a_r * 1E-3"}],
+    xt.ZetaShift:       [{"dzeta": 0.1}, {"dzeta": -0.2}],
+    xt.XRotation:       [{"angle": 0.1}, {"angle": "a_r"}],
+    xt.YRotation:       [{"angle": -0.1}, {"angle": "2 * a_r"}],
+    xt.SRotation:       [{"angle": 30.0}, {"angle": "a_r * 10"}]}
+
+################################################################################
+# Support Functions
+################################################################################
+def make_environment():
+    """
+    Environment with the variables used in BULK_PARAMETERS
+    """
+    env = xt.Environment()
+    env["l_d"]  = 2.0
+    env["k_q"]  = 0.1
+    env["k_s"]  = 1.5
+    env["a_r"]  = 0.05
+    env["v_c"]  = 1E6
+    return env
+
+################################################################################
+# PyTest Functions
+################################################################################
+def test_bulk_elements():
+    """
+    Elements created in bulk have their values and expressions set
+    """
+    env = xt.Environment()
+    env["kqf"]  = 0.1
+
+    create_elements(env, [
+        {"name": "qf", "parent": xt.Quadrupole, "length": 0.5, "k1": "kqf"},
+        {"name": "qd", "parent": xt.Quadrupole, "length": 0.6, "k1": -0.2},
+        {"name": "d", "parent": xt.Drift, "length": 1.0}])
+
+    assert env["qf"].length == 0.5
+    assert env["qf"].k1 == 0.1
+    assert env["qd"].length == 0.6
+    assert env["qd"].k1 == -0.2
+    assert env["d"].length == 1.0
+
+    env["kqf"]  = 0.3
+    assert env["qf"].k1 == 0.3
+
+def test_bulk_duplicate_names():
+    """
+    Names repeated in a batch, or already in the environment, are rejected
+    """
+    env = xt.Environment()
+    env.new("d", xt.Drift, length = 1.0)
+
+    with pytest.raises(ValueError, match = "q1"):
+        create_elements(env, [
+            {"name": "q1", "parent": xt.Quadrupole, "length": 0.5, "k1": 0.1},
+            {"name": "q1", "parent": xt.Quadrupole, "length": 0.5, "k1": 0.2}])
+    assert "q1" not in env.element_dict
+
+    with pytest.raises(ValueError, match = "d"):
+        create_elements(env, [{"name": "d", "parent": xt.Drift, "length": 2.0}])
+    assert env["d"].length == 1.0
+
+@pytest.mark.parametrize(
+    "parent", BULK_ELEMENT_CLASSES, ids = lambda parent: parent.__name__)
+def test_bulk_elements_match_new(parent):
+    """
+    Elements created in bulk are the same, attribute by attribute and
+    expression by expression, as those created by environment.new
+    """
+    bulk_env    = make_environment()
+    new_env     = make_environment()
+    names       = [f"e{index}" for index in range(len(BULK_PARAMETERS[parent]))]
+
+    create_elements(bulk_env, [
+        {"name": name, "parent": parent, **kwargs}
+        for name, kwargs in zip(names, BULK_PARAMETERS[parent])])
+    for name, kwargs in zip(names, BULK_PARAMETERS[parent]):
+        new_env.new(name, parent, **kwargs)
+
+    for name in names:
+        bulk_element    = bulk_env.element_dict[name]
+        new_element     = new_env.element_dict[name]
+        assert type(bulk_element) is type(new_element)
+        assert bulk_element.to_dict() == new_element.to_dict()
+        assert bulk_element.prototype == new_element.prototype
+        for field in parent._xofields:
+            if field.startswith("_"):
+                continue
+            assert np.array_equal(
+                getattr(bulk_element, field), getattr(new_element, field)), field
+            assert str(getattr(bulk_env.ref[name], field)._expr) == \
+                str(getattr(new_env.ref[name], field)._expr), field
+
+    for env in (bulk_env, new_env):
+        env["a_r"]  = 0.2
+        env["k_q"]  = 0.3
+    for name in names:
+        assert bulk_env.element_dict[name].to_dict() == \
+            new_env.element_dict[name].to_dict()
+
+def test_deduplicate_keeps_knobs():
+    """
+    Elements with equal values in different variables are not merged, and
+    elements with the same values or variables are created as clones
+    """
+    env     = xt.Environment()
+    staged  = StagedEnvironment(env, deduplicate = True)
+    staged["k1_qf1"]    = 0.1
+    staged["k1_qf2"]    = 0.1
+    staged.new("qf1", xt.Quadrupole, length = 0.5, k1 = "k1_qf1")
+    staged.new("qf2", xt.Quadrupole, length = 0.5, k1 = "k1_qf2")
+    staged.new("qf3", xt.Quadrupole, length = 0.5, k1 = "k1_qf1")
+    staged.new("d1", xt.Drift, length = 1.0)
+    staged.new("d2", xt.Drift, length = 1.0)
+    staged.commit()
+
+    assert staged.n_clones == 2
+    assert "k1_qf2" in env.vars
+
+    env["k1_qf1"]   = 0.5
+    assert env["qf1"].k1 == 0.5
+    assert env["qf2"].k1 == 0.1
+    assert env["qf3"].k1 == 0.5
+    assert env["d2"].length == 1.0
+
+def test_set_variables():
+    """
+    Values, expressions and re-assigned variables are set in order
+    """
+    env = xt.Environment()
+    env["kq"]   = 0.1
+    env.new("qf", xt.Quadrupole, length = 0.5, k1 = "kq")
+
+    set_variables(env, {"k0": 2.0, "kq": "k0 * 3", "k2": "kq + 1"})
+
+    assert env["k0"] == 2.0
+    assert env["kq"] == 6.0
+    assert env["k2"] == 7.0
+    assert env["qf"].k1 == 6.0
+
+    env["k0"]   = 1.0
+    assert env["k2"] == 4.0
+    assert env["qf"].k1 == 3.0
+
+    with pytest.raises(ValueError, match = "qf"):
+        set_variables(env, {"qf": 1.0})
@@ -0,0 +1,72 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import math
+import pytest
+
+from sad2xs.expression_translator import translate_sad_expression
+
+################################################################################
+# PyTest Functions
+################################################################################
+@pytest.mark.parametrize("expression, translation", [
+    ("a + b * c",               "a + b * c"),
+    ("(a + b) * c",             "(a + b) * c"),
+    ("a - (b - c)",             "a - (b - c)"),
+    ("a / (b * c)",             "a / (b * c)"),
+    ("-(a + b)",                "-(a + b)"),
+    ("a*-b",                    "a * -b"),
+    ("-a^2",                    "-(a**2)"),
+    ("(-a)^2",                  "(-a)**2"),
+    ("a^b^c",                   "a**(b**c)"),
+    ("2^-1",                    "2**(-1)"),
+    ("Sqrt[kqf^2 + 1] * Pi",    f"sqrt(kqf**2 + 1) * {math.pi!r}"),
+    ("Log[x]",                  "log(x)"),
+    ("Log[b, x]",               "log(x) / log(b)"),
+    ("ArcTan[y]",               "atan(y)"),
+    ("ArcTan[x, y]",            "atan2(y, x)"),
+    ("sqrt(a)",                 "sqrt(a)")])
+def test_translation(expression, translation):
+    """
+    SAD precedence and functions are translated to xdeps syntax
+    """
+    assert translate_sad_expression(expression) == translation
+
+@pytest.mark.parametrize("expression", [
+    "-a^2",
+    "a^b^c",
+    "a - b - c",
+    "a / b / c",
+    "-(a - b)^2 / c",
+    "Log[b, x] + ArcTan[x, y]"])
+def test_translation_values(expression):
+    """
+    Translated expressions evaluate to the value of the SAD expression
+    """
+    values      = {"a": 1.5, "b": 2.5, "c": 0.7, "x": 0.3, "y": -0.4}
+    functions   = {"log": math.log, "atan2": math.atan2}
+    sad_values  = {
+        "-a^2":                     -(1.5**2),
+        "a^b^c":                    1.5**(2.5**0.7),
+        "a - b - c":                (1.5 - 2.5) - 0.7,
+        "a / b / c":                (1.5 / 2.5) / 0.7,
+        "-(a - b)^2 / c":           -((1.5 - 2.5)**2) / 0.7,
+        "Log[b, x] + ArcTan[x, y]": math.log(0.3, 2.5) + math.atan2(-0.4, 0.3)}
+
+    translation = translate_sad_expression(expression)
+    assert eval(translation, functions, values) == pytest.approx(sad_values[expression])
+
+@pytest.mark.parametrize("expression", [
+    "a +* b",
+    "  a + ( b ",
+    "Foo[x]",
+    "a ? b"])
+def test_untranslatable(expression):
+    """
+    Expressions that cannot be parsed are returned stripped but unchanged
+    """
+    assert translate_sad_expression(expression) == expression.strip()
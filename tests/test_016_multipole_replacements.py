@@ -0,0 +1,55 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+from sad2xs.converter._004_element_converter import MultipoleReplacements
+
+################################################################################
+# PyTest Functions
+################################################################################
+def test_longest_prefix():
+    """
+    The longest matching prefix gives the replacement type
+    """
+    replacements    = MultipoleReplacements({
+        "q":        "Quadrupole",
+        "qf":       "Sextupole",
+        "qfx":      "Octupole"})
+
+    assert replacements.get("qd1") == "Quadrupole"
+    assert replacements.get("qf1") == "Sextupole"
+    assert replacements.get("qfx1") == "Octupole"
+    assert replacements.get("qfx") == "Octupole"
+    assert replacements.get("q") == "Quadrupole"
+    assert replacements.get("sd1") is None
+    assert replacements.get("") is None
+
+def test_patterns():
+    """
+    Regular expressions and globs match from the start of the name, in
+    order, and only if no prefix matches
+    """
+    replacements    = MultipoleReplacements({
+        "re:s[fd]\\d+$":    "Sextupole",
+        "glob:*oct*":       "Octupole",
+        "re:.*":            "Multipole",
+        "sf":               "Quadrupole"})
+
+    assert replacements.get("sf1") == "Quadrupole"
+    assert replacements.get("sd12") == "Sextupole"
+    assert replacements.get("sd12a") == "Multipole"
+    assert replacements.get("xoct1") == "Octupole"
+    assert replacements.get("x") == "Multipole"
+
+def test_empty_prefix():
+    """
+    An empty prefix matches every name
+    """
+    replacements    = MultipoleReplacements({"": "Multipole", "q": "Quadrupole"})
+
+    assert replacements.get("q1") == "Quadrupole"
+    assert replacements.get("s1") == "Multipole"
+    assert MultipoleReplacements({}).get("q1") is None
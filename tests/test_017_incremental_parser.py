@@ -0,0 +1,152 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import pytest
+
+from sad2xs.config import Config
+from sad2xs.converter._001_parser import IncrementalSadParser, parse_sad_file
+
+################################################################################
+# Test Deck
+################################################################################
+SAD_DECK    = """
+MOMENTUM = 45.6 GEV;
+MASS = 0.511 MEV;
+
+kqf = 0.2;
+kqd = -kqf;
+
+DRIFT D1 = (L = 1.0) D2 = (L = 2.0);
+QUAD QF = (L = 0.5 K1 = kqf) QD = (L = 0.5 K1 = kqd);
+
+LINE RING = (D1 QF D2 QD);
+"""
+
+NO_CHANGES  = {"added": [], "removed": [], "changed": []}
+
+################################################################################
+# PyTest Functions
+################################################################################
+def test_first_parse(tmp_path):
+    """
+    The first parse matches a fresh parse, with every name added
+    """
+    config      = Config(_verbose = False)
+    deck_path   = tmp_path / "deck.sad"
+    deck_path.write_text(SAD_DECK)
+
+    parser  = IncrementalSadParser(config)
+    parsed  = parser.parse(str(deck_path))
+
+    assert parsed == parse_sad_file(str(deck_path), config)
+    assert parser.changes["elements"]["added"] == ["d1", "d2", "qd", "qf"]
+    assert parser.changes["lines"]["added"] == ["ring"]
+    assert parser.changes["expressions"]["added"] == ["kqd", "kqf"]
+
+def test_unchanged_deck(tmp_path):
+    """
+    Parsing the same deck again reports no changes
+    """
+    config      = Config(_verbose = False)
+    deck_path   = tmp_path / "deck.sad"
+    deck_path.write_text(SAD_DECK)
+
+    parser  = IncrementalSadParser(config)
+    parser.parse(str(deck_path))
+    parsed  = parser.parse(str(deck_path))
+
+    assert parsed == parse_sad_file(str(deck_path), config)
+    for category in IncrementalSadParser.CATEGORIES:
+        assert parser.changes[category] == NO_CHANGES
+
+@pytest.mark.parametrize("old, new, changes", [
+    # Changed element parameter
+    ("QD = (L = 0.5 K1 = kqd)", "QD = (L = 0.6 K1 = kqd)",
+        {"elements": {"added": [], "removed": [], "changed": ["qd"]}}),
+    # Added and removed elements
+    ("D2 = (L = 2.0);", "D3 = (L = 2.0);\nMARK M1 = ();",
+        {"elements": {"added": ["d3", "m1"], "removed": ["d2"], "changed": []}}),
+    # Changed variable
+    ("kqf = 0.2;", "kqf = 0.3;",
+        {"expressions": {"added": [], "removed": [], "changed": ["kqf"]}}),
+    # Changed line
+    ("(D1 QF D2 QD)", "(D1 QF D2 QD D1)",
+        {"lines": {"added": [], "removed": [], "changed": ["ring"]}}),
+    # Changed global
+    ("MOMENTUM = 45.6 GEV;", "MOMENTUM = 80.0 GEV;",
+        {"globals": {"added": [], "removed": [], "changed": ["p0c"]}})])
+def test_edited_deck(tmp_path, old, new, changes):
+    """
+    After an edit, the parse matches a fresh parse of the edited deck and
+    only the edited names are reported
+    """
+    config      = Config(_verbose = False)
+    deck_path   = tmp_path / "deck.sad"
+    deck_path.write_text(SAD_DECK)
+
+    parser  = IncrementalSadParser(config)
+    first   = parser.parse(str(deck_path))
+
+    assert old in SAD_DECK
+    deck_path.write_text(SAD_DECK.replace(old, new))
+    parsed  = parser.parse(str(deck_path))
+
+    assert parsed is first
+    assert parsed == parse_sad_file(str(deck_path), config)
+    for category in IncrementalSadParser.CATEGORIES:
+        assert parser.changes[category] == changes.get(category, NO_CHANGES)
+
+def test_reverted_deck(tmp_path):
+    """
+    Reverting an edit restores the original parse
+    """
+    config      = Config(_verbose = False)
+    deck_path   = tmp_path / "deck.sad"
+    deck_path.write_text(SAD_DECK)
+
+    parser  = IncrementalSadParser(config)
+    parser.parse(str(deck_path))
+    deck_path.write_text(SAD_DECK.replace("K1 = kqf", "K1 = 0.1"))
+    parser.parse(str(deck_path))
+    deck_path.write_text(SAD_DECK)
+    parsed  = parser.parse(str(deck_path))
+
+    assert parsed == parse_sad_file(str(deck_path), config)
+    assert parser.changes["elements"]["changed"] == ["qf"]
+
+def test_edited_include(tmp_path):
+    """
+    Edits of an included file are picked up, and included in place
+    """
+    config      = Config(_verbose = False)
+    deck_path   = tmp_path / "deck.sad"
+    errors_path = tmp_path / "errors.sad"
+    deck_path.write_text(SAD_DECK + 'GetMAIN["errors.sad"];\n')
+    errors_path.write_text("kqf = 0.25;\n")
+
+    parser  = IncrementalSadParser(config)
+    parser.parse(str(deck_path))
+    errors_path.write_text("kqf = 0.3;\n")
+    parsed  = parser.parse(str(deck_path))
+
+    assert parsed == parse_sad_file(str(deck_path), config)
+    assert parsed["expressions"]["kqf"] == 0.3
+    assert parser.changes["expressions"]["changed"] == ["kqf"]
+
+@pytest.mark.parametrize("setting, value", [
+    ("LAZY_ELEMENT_PARAMETERS",     True),
+    ("COLUMNAR_ELEMENT_STORE",      True),
+    ("ref_particle_p0c",            80E9)])
+def test_check_config(setting, value):
+    """
+    A config that parses differently from the parser config is rejected
+    """
+    parser  = IncrementalSadParser(Config(_verbose = False))
+    parser.check_config(Config(_verbose = False))
+
+    with pytest.raises(ValueError, match = setting):
+        parser.check_config(Config(_verbose = False, **{setting: value}))
@@ -0,0 +1,159 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import os
+import pytest
+
+from sad2xs.config import Config
+from sad2xs.converter._000_parse_cache import (
+    evict_parse_cache, get_parse_cache_key, load_cached_parse, parse_file_cached)
+
+################################################################################
+# Support Functions
+################################################################################
+class CountingParser:
+    """
+    Parse function returning the file contents, counting its calls
+    """
+    def __init__(self):
+        self.n_calls    = 0
+
+    def __call__(self, sad_file_path, config):
+        self.n_calls    += 1
+        with open(sad_file_path) as sad_file:
+            return [{"contents": sad_file.read()}]
+
+def write_entry(path, n_bytes, mtime):
+    """
+    Cache entry of n_bytes, last used at mtime
+    """
+    path.write_bytes(b"x" * n_bytes)
+    os.utime(path, (mtime, mtime))
+
+################################################################################
+# PyTest Functions
+################################################################################
+def test_cache_key(tmp_path):
+    """
+    The key depends on the file contents and parse settings, not the path
+    """
+    config      = Config(_verbose = False)
+    first_path  = tmp_path / "first.sad"
+    second_path = tmp_path / "second.sad"
+    first_path.write_text("DRIFT D1 = (L = 1.0);\n")
+    second_path.write_text("DRIFT D1 = (L = 1.0);\n")
+
+    key = get_parse_cache_key(str(first_path), config)
+    assert get_parse_cache_key(str(second_path), config) == key
+
+    for setting, value in [
+            ("LAZY_ELEMENT_PARAMETERS",     True),
+            ("COLUMNAR_ELEMENT_STORE",      True),
+            ("SAD_ALLOWED_ELEMENTS",        ["drift"])]:
+        assert get_parse_cache_key(
+            str(first_path), Config(_verbose = False, **{setting: value})) != key
+
+    second_path.write_text("DRIFT D1 = (L = 2.0);\n")
+    assert get_parse_cache_key(str(second_path), config) != key
+
+def test_cache_hit_and_miss(tmp_path):
+    """
+    A file is parsed once per contents, and later parses load the cache
+    """
+    config      = Config(_verbose = False, PARSE_CACHE_DIRECTORY = str(tmp_path / "cache"))
+    sad_path    = tmp_path / "deck.sad"
+    sad_path.write_text("DRIFT D1 = (L = 1.0);\n")
+    parser      = CountingParser()
+
+    first   = parse_file_cached(str(sad_path), config, parser)
+    second  = parse_file_cached(str(sad_path), config, parser)
+    assert parser.n_calls == 1
+    assert second == first
+    assert second is not first
+
+    sad_path.write_text("DRIFT D1 = (L = 2.0);\n")
+    third   = parse_file_cached(str(sad_path), config, parser)
+    assert parser.n_calls == 2
+    assert third == [{"contents": "DRIFT D1 = (L = 2.0);\n"}]
+    assert len(os.listdir(tmp_path / "cache")) == 2
+
+def test_no_cache_directory(tmp_path):
+    """
+    Without a cache directory every call parses
+    """
+    config      = Config(_verbose = False)
+    sad_path    = tmp_path / "deck.sad"
+    sad_path.write_text("DRIFT D1 = (L = 1.0);\n")
+    parser      = CountingParser()
+
+    parse_file_cached(str(sad_path), config, parser)
+    parse_file_cached(str(sad_path), config, parser)
+    assert parser.n_calls == 2
+
+@pytest.mark.parametrize("contents", [
+    b"",                                # Empty
+    b"\x80\x05\x95",                    # Truncated
+    b"not a pickle",                    # Corrupt
+    b"cno_such_module\nThing\n.",       # Class from a removed module
+    b"cos\nno_such_function\n."])       # Class removed from a module
+def test_unreadable_entry(tmp_path, contents):
+    """
+    Unreadable and stale entries are a cache miss, and are replaced
+    """
+    config      = Config(_verbose = False, PARSE_CACHE_DIRECTORY = str(tmp_path / "cache"))
+    sad_path    = tmp_path / "deck.sad"
+    sad_path.write_text("DRIFT D1 = (L = 1.0);\n")
+    parser      = CountingParser()
+
+    cache_path  = tmp_path / "cache" / f"{get_parse_cache_key(str(sad_path), config)}.pkl"
+    cache_path.parent.mkdir()
+    cache_path.write_bytes(contents)
+    assert load_cached_parse(str(cache_path)) is None
+
+    parse_file_cached(str(sad_path), config, parser)
+    assert parser.n_calls == 1
+    assert load_cached_parse(str(cache_path)) == [{"contents": "DRIFT D1 = (L = 1.0);\n"}]
+
+def test_eviction(tmp_path):
+    """
+    Least recently used entries are removed until the cache fits
+    """
+    write_entry(tmp_path / "a.pkl", 100, 1000)
+    write_entry(tmp_path / "b.pkl", 100, 3000)
+    write_entry(tmp_path / "c.pkl", 100, 2000)
+    write_entry(tmp_path / "other.txt", 1000, 0)
+
+    assert evict_parse_cache(str(tmp_path), 300) == []
+
+    removed = evict_parse_cache(str(tmp_path), 150)
+    assert [os.path.basename(path) for path in removed] == ["a.pkl", "c.pkl"]
+    assert sorted(os.listdir(tmp_path)) == ["b.pkl", "other.txt"]
+
+def test_eviction_keeps_used_entries(tmp_path):
+    """
+    Loading an entry marks it as recently used
+    """
+    config      = Config(_verbose = False, PARSE_CACHE_DIRECTORY = str(tmp_path / "cache"))
+    parser      = CountingParser()
+    sad_paths   = []
+    for index in range(3):
+        sad_path    = tmp_path / f"deck_{index}.sad"
+        sad_path.write_text(f"DRIFT D1 = (L = {index});\n")
+        parse_file_cached(str(sad_path), config, parser)
+        sad_paths.append(sad_path)
+
+    # Age the entries, oldest first, then use the oldest
+    cache_paths = {
+        sad_path: tmp_path / "cache" / f"{get_parse_cache_key(str(sad_path), config)}.pkl"
+        for sad_path in sad_paths}
+    for index, sad_path in enumerate(sad_paths):
+        os.utime(cache_paths[sad_path], (1000 + index, 1000 + index))
+    load_cached_parse(str(cache_paths[sad_paths[0]]))
+
+    entry_size  = os.path.getsize(cache_paths[sad_paths[0]])
+    removed     = evict_parse_cache(str(tmp_path / "cache"), 2 * entry_size)
+    assert removed == [str(cache_paths[sad_paths[1]])]
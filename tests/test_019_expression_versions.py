@@ -0,0 +1,138 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import pytest
+import xtrack as xt
+
+from sad2xs.config import Config
+from sad2xs.converter._001_parser import (
+    get_expression_version, merge_expression, merge_expressions, parse_sad_file)
+from sad2xs.converter._003_expression_converter import convert_expressions
+
+################################################################################
+# Test Deck
+################################################################################
+SAD_DECK    = """
+MOMENTUM = 45.6 GEV;
+
+k = 0.1;
+k1x = 5;
+QUAD Q1 = (L = 1.0 K1 = k);
+k = k * 2 + k1x;
+QUAD Q2 = (L = 1.0 K1 = k * 3);
+k = k + 1;
+a = k;
+
+LINE RING = (Q1 Q2);
+"""
+
+################################################################################
+# PyTest Functions
+################################################################################
+def test_expression_version():
+    """
+    Versions are numbered from 1, after those already used
+    """
+    assert get_expression_version({}, "k") == "k__v1"
+    assert get_expression_version({"k": 1.0, "k__v1": 0.5}, "k") == "k__v2"
+    assert get_expression_version({"k__v1": 0.5, "kq__v2": 0.5}, "kq") == "kq__v1"
+
+def test_reassignment():
+    """
+    A re-assignment without the variable itself replaces it, and removes
+    the versions only the replaced value referred to
+    """
+    expressions = {}
+    merge_expression(expressions, "k", 0.1)
+    merge_expression(expressions, "k", "k * 2")
+    assert expressions == {"k__v1": 0.1, "k": "k__v1 * 2"}
+
+    merge_expression(expressions, "k", "kq1 + 1")
+    assert expressions == {"k": "kq1 + 1"}
+
+    merge_expression(expressions, "k", 0.3)
+    assert expressions == {"k": 0.3}
+
+def test_self_reference():
+    """
+    Each self reference refers to a new version holding the previous value,
+    and only whole names are replaced
+    """
+    expressions = {"k1": 2.0}
+    merge_expression(expressions, "k", 0.1)
+    merge_expression(expressions, "k", "k + k1")
+    merge_expression(expressions, "k", "Sqrt[k] * k")
+
+    assert expressions == {
+        "k1":       2.0,
+        "k__v1":    0.1,
+        "k__v2":    "k__v1 + k1",
+        "k":        "Sqrt[k__v2] * k__v2"}
+
+def test_merge_expressions():
+    """
+    The versions of a later part are numbered after the existing ones, as if
+    its assignments followed directly
+    """
+    expressions = {}
+    merge_expression(expressions, "k", 0.1)
+    merge_expression(expressions, "k", "k * 2")
+
+    later   = {}
+    merge_expression(later, "k", "k + 1")
+    merge_expression(later, "k", "k * 3")
+    merge_expression(later, "a", "k")
+    assert later == {"k__v1": "k + 1", "k": "k__v1 * 3", "a": "k"}
+
+    merge_expressions(expressions, later)
+    assert expressions == {
+        "k__v1":    0.1,
+        "k__v2":    "k__v1 * 2",
+        "k__v3":    "k__v2 + 1",
+        "k":        "k__v3 * 3",
+        "a":        "k"}
+
+def test_deck_versions(tmp_path):
+    """
+    Re-assignments in a deck give one version per self reference, and
+    elements refer to the variable, so to its last version
+    """
+    deck_path   = tmp_path / "deck.sad"
+    deck_path.write_text(SAD_DECK)
+    parsed      = parse_sad_file(str(deck_path), Config(_verbose = False))
+
+    assert parsed["expressions"] == {
+        "k__v1":    0.1,
+        "k1x":      5.0,
+        "k__v2":    "k__v1 * 2 + k1x",
+        "k":        "k__v2 + 1",
+        "a":        "k"}
+    assert parsed["elements"]["quad"]["q1"]["k1"] == "k"
+    assert parsed["elements"]["quad"]["q2"]["k1"] == "k * 3"
+
+def test_deck_values(tmp_path):
+    """
+    In the environment the versions keep the chain of assignments live
+    """
+    deck_path   = tmp_path / "deck.sad"
+    deck_path.write_text(SAD_DECK)
+    parsed      = parse_sad_file(str(deck_path), Config(_verbose = False))
+
+    env = xt.Environment()
+    convert_expressions(parsed, env, Config(_verbose = False))
+    env.new("q1", xt.Quadrupole, length = 1.0, k1 = parsed["elements"]["quad"]["q1"]["k1"])
+    env.new("q2", xt.Quadrupole, length = 1.0, k1 = parsed["elements"]["quad"]["q2"]["k1"])
+
+    assert env["k__v2"] == pytest.approx(5.2)
+    assert env["k"] == pytest.approx(6.2)
+    assert env["a"] == pytest.approx(6.2)
+    assert env["q1"].k1 == pytest.approx(6.2)
+    assert env["q2"].k1 == pytest.approx(18.6)
+
+    env["k__v1"]    = 0.5
+    assert env["k"] == pytest.approx(7.0)
+    assert env["q1"].k1 == pytest.approx(7.0)
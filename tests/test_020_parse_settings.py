@@ -0,0 +1,104 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import glob
+import itertools
+import os
+import pytest
+
+from collections.abc import Mapping
+
+from sad2xs.config import Config
+from sad2xs.converter._001_parser import parse_sad_file
+
+################################################################################
+# Test Lattices and Settings
+################################################################################
+LATTICE_PATHS   = sorted(glob.glob(os.path.join(
+    os.path.dirname(__file__), "..", "lattice_tests", "lattices", "*.sad")))
+
+# Deck re-assigning a variable with itself throughout, so that the versions
+# of the re-assignments are spread over the chunks of a parallel parse
+REASSIGNMENT_DECK   = "MOMENTUM = 45.6 GEV;\nk = 0.1;\n" + "".join(
+    f"k = k * 2 + {index};\n" +\
+    f"QUAD Q{index} = (L = 0.5 K1 = k);\n" +\
+    f"DRIFT D{index} = (L = {index + 1}.0);\n"
+    for index in range(50)) + \
+    "LINE RING = (" + " ".join(f"Q{index} D{index}" for index in range(50)) + ");\n"
+
+# Every combination of the optional parse settings; parallel parsing is
+# forced for the small test lattices
+PARSE_SETTINGS  = {
+    "lazy":         {"LAZY_ELEMENT_PARAMETERS": True},
+    "columnar":     {"COLUMNAR_ELEMENT_STORE": True},
+    "parallel":     {"PARSE_WORKERS": 2, "PARSE_PARALLEL_MIN_BYTES": 0}}
+SETTING_COMBINATIONS    = [
+    combination
+    for n_settings in range(1, len(PARSE_SETTINGS) + 1)
+    for combination in itertools.combinations(PARSE_SETTINGS, n_settings)]
+
+################################################################################
+# Support Functions
+################################################################################
+def to_plain(value):
+    """
+    Parsed data with lazy and columnar mappings replaced by dicts
+    """
+    if isinstance(value, Mapping):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_plain(item) for item in value]
+    return value
+
+################################################################################
+# PyTest Functions
+################################################################################
+@pytest.fixture(
+    scope   = "module",
+    params  = LATTICE_PATHS + ["reassignments"],
+    ids     = os.path.basename)
+def default_parse(request, tmp_path_factory):
+    """
+    A test lattice and its parse with the default settings
+    """
+    lattice_path    = request.param
+    if lattice_path == "reassignments":
+        lattice_path    = tmp_path_factory.mktemp("decks") / "reassignments.sad"
+        lattice_path.write_text(REASSIGNMENT_DECK)
+        lattice_path    = str(lattice_path)
+
+    return lattice_path, parse_sad_file(lattice_path, Config(_verbose = False))
+
+def test_reassignment_deck(tmp_path):
+    """
+    Every re-assignment of the re-assignment deck is versioned
+    """
+    lattice_path    = tmp_path / "reassignments.sad"
+    lattice_path.write_text(REASSIGNMENT_DECK)
+    parsed_data     = parse_sad_file(str(lattice_path), Config(_verbose = False))
+
+    assert parsed_data["expressions"]["k__v1"] == 0.1
+    assert parsed_data["expressions"]["k__v50"] == "k__v49 * 2 + 48"
+    assert parsed_data["expressions"]["k"] == "k__v50 * 2 + 49"
+
+@pytest.mark.parametrize(
+    "combination", SETTING_COMBINATIONS, ids = lambda combination: "+".join(combination))
+def test_parse_settings(default_parse, combination):
+    """
+    The optional parse settings give the same parsed data as the default
+    """
+    lattice_path, default_data  = default_parse
+    settings    = {}
+    for setting in combination:
+        settings.update(PARSE_SETTINGS[setting])
+
+    parsed_data = parse_sad_file(lattice_path, Config(_verbose = False, **settings))
+    plain_data  = to_plain(parsed_data)
+
+    assert plain_data.keys() == default_data.keys()
+    for category in default_data:
+        assert plain_data[category] == default_data[category], category
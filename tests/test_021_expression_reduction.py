@@ -0,0 +1,208 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import copy
+import os
+import pytest
+import xtrack as xt
+
+from sad2xs.config import Config
+from sad2xs.converter._001_parser import parse_sad_file
+from sad2xs.converter._002_element_exclusion import expand_lines
+from sad2xs.converter._003_expression_converter import (
+    convert_expressions, fold_constant_expressions, parse_expression,
+    prune_unused_variables)
+
+################################################################################
+# Test Data
+################################################################################
+def make_parsed_data() -> dict:
+    """
+    Parsed lattice with a selected line (ring), a sub-line, and a line
+    outside of it
+    """
+    return {
+        "globals":      {"p0c": 45.6E9, "mass0": 0.511E6, "q0": 1, "fshift": 0.0},
+        "expressions":  {
+            "kbase":    0.1,
+            "kqf":      "kbase * 2",
+            "kqd":      "-kqf + knob_d",
+            "knob_d":   0.01,
+            "knob":     0.5,
+            "knob_x":   "knob * 2",
+            "ld":       1.0,
+            "lq":       "Sqrt[ld] / 2",
+            "kqx":      0.3,
+            "unused":   "kbase * 5",
+            "broken":   "undefined_x + 1"},
+        "elements":     {
+            "drift":    {"d1": {"l": "ld"}},
+            "quad":     {
+                "qf":   {"l": "lq", "k1": "kqf"},
+                "qd":   {"l": 0.5, "k1": "kqd"},
+                "qx":   {"l": 0.5, "k1": "kqx"}}},
+        "lines":        {
+            "ring":     ["d1", "qf", "arc"],
+            "arc":      ["d1", "-qd"],
+            "other":    ["d1", "qx"]}}
+
+def get_environment(parsed_data: dict) -> xt.Environment:
+    """
+    Environment with the variables of the parsed data
+    """
+    env = xt.Environment()
+    convert_expressions(parsed_data, env, Config(_verbose = False))
+    return env
+
+def get_line_values(
+        parsed_data:    dict,
+        line_name:      str) -> dict:
+    """
+    Value of every parameter of the elements of a line, in its environment
+    """
+    env                 = get_environment(parsed_data)
+    line_elements, _    = expand_lines(parsed_data["lines"], [line_name])
+
+    values  = {}
+    for section_dict in parsed_data["elements"].values():
+        for ele_name in line_elements & section_dict.keys():
+            for parameter, value in section_dict[ele_name].items():
+                value   = parse_expression(value)
+                values[ele_name, parameter] = \
+                    env.eval(value) if isinstance(value, str) else value
+    return values
+
+################################################################################
+# PyTest Functions: Constant Folding
+################################################################################
+def test_fold_constants():
+    """
+    Expressions without knobs are replaced by their value, and those that
+    depend on a knob, directly or not, or cannot be evaluated are kept
+    """
+    config      = Config(_verbose = False, KNOB_VARIABLES = {"knob", "knob_d"})
+    parsed_data = fold_constant_expressions(make_parsed_data(), config)
+    expressions = parsed_data["expressions"]
+
+    assert expressions["kqf"] == 0.2
+    assert expressions["lq"] == pytest.approx(0.5)
+    assert expressions["unused"] == pytest.approx(0.5)
+    assert expressions["knob"] == 0.5
+    assert expressions["knob_d"] == 0.01
+
+    assert expressions["kqd"] == "-kqf + knob_d"
+    assert expressions["knob_x"] == "knob * 2"
+    assert expressions["broken"] == "undefined_x + 1"
+
+def test_fold_keeps_knobs_live():
+    """
+    In the environment, knobs still drive the expressions using them
+    """
+    config      = Config(_verbose = False, KNOB_VARIABLES = {"knob", "knob_d"})
+    parsed_data = fold_constant_expressions(make_parsed_data(), config)
+    del parsed_data["expressions"]["broken"]
+    env         = get_environment(parsed_data)
+
+    assert env["kqd"] == pytest.approx(-0.19)
+    env["knob_d"]   = 0.1
+    assert env["kqd"] == pytest.approx(-0.1)
+    env["knob"]     = 1.0
+    assert env["knob_x"] == 2.0
+
+    # Folded variables are plain values
+    env["kbase"]    = 1.0
+    assert env["kqf"] == 0.2
+
+def test_fold_values_unchanged():
+    """
+    Folding does not change the value of any element parameter
+    """
+    config      = Config(_verbose = False, KNOB_VARIABLES = {"knob"})
+    parsed_data = make_parsed_data()
+    del parsed_data["expressions"]["broken"]
+
+    values      = get_line_values(parsed_data, "ring")
+    folded      = get_line_values(
+        fold_constant_expressions(copy.deepcopy(parsed_data), config), "ring")
+    assert folded.keys() == values.keys()
+    for key, value in values.items():
+        assert folded[key] == pytest.approx(value), key
+
+################################################################################
+# PyTest Functions: Unused Variable Pruning
+################################################################################
+def test_prune_variables():
+    """
+    Only the variables the selected line uses, directly or through other
+    variables, and the knobs are kept
+    """
+    config      = Config(_verbose = False, KNOB_VARIABLES = {"knob_x"})
+    parsed_data = prune_unused_variables(make_parsed_data(), "RING", config)
+
+    assert set(parsed_data["expressions"]) == {
+        "kbase", "kqf", "kqd", "knob_d", "knob", "knob_x", "ld", "lq"}
+
+def test_prune_outside_line():
+    """
+    Elements outside the selected line that use a pruned variable are
+    removed, with the lines using them
+    """
+    config      = Config(_verbose = False)
+    parsed_data = prune_unused_variables(make_parsed_data(), "ring", config)
+
+    assert "qx" not in parsed_data["elements"]["quad"]
+    assert set(parsed_data["lines"]) == {"ring", "arc"}
+    assert set(parsed_data["elements"]["quad"]) == {"qf", "qd"}
+
+def test_prune_all_lines():
+    """
+    Without a selected line, the variables of every line are kept
+    """
+    config      = Config(_verbose = False)
+    parsed_data = prune_unused_variables(make_parsed_data(), None, config)
+
+    assert "kqx" in parsed_data["expressions"]
+    assert "unused" not in parsed_data["expressions"]
+    assert set(parsed_data["lines"]) == {"ring", "arc", "other"}
+
+def test_prune_line_unchanged():
+    """
+    The elements of the selected line and their values are unchanged
+    """
+    config      = Config(_verbose = False)
+    parsed_data = make_parsed_data()
+    del parsed_data["expressions"]["broken"]
+
+    pruned      = prune_unused_variables(copy.deepcopy(parsed_data), "ring", config)
+    assert pruned["lines"]["ring"] == parsed_data["lines"]["ring"]
+    assert pruned["lines"]["arc"] == parsed_data["lines"]["arc"]
+    assert get_line_values(pruned, "ring") == get_line_values(parsed_data, "ring")
+
+@pytest.mark.parametrize("lattice_name", ["fccee_sol.sad", "fccee_zh.sad"])
+def test_prune_lattice(lattice_name):
+    """
+    Pruning a test lattice keeps its line and every variable its elements
+    use
+    """
+    lattice_path    = os.path.join(
+        os.path.dirname(__file__), "..", "lattice_tests", "lattices", lattice_name)
+    parsed_data     = parse_sad_file(lattice_path, Config(_verbose = False))
+    line_name       = max(
+        parsed_data["lines"], key = lambda name: len(parsed_data["lines"][name]))
+
+    pruned          = prune_unused_variables(
+        copy.deepcopy(parsed_data), line_name, Config(_verbose = False))
+    line_elements, line_names   = expand_lines(parsed_data["lines"], [line_name])
+
+    assert len(pruned["expressions"]) <= len(parsed_data["expressions"])
+    for name in line_names:
+        assert pruned["lines"][name] == parsed_data["lines"][name]
+    for element_type, section_dict in parsed_data["elements"].items():
+        for ele_name in line_elements & section_dict.keys():
+            assert pruned["elements"][element_type][ele_name] == section_dict[ele_name]
+    assert get_line_values(pruned, line_name) == \
+        get_line_values(parsed_data, line_name)
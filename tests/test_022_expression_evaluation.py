@@ -0,0 +1,105 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import os
+import numpy as np
+import pytest
+import xtrack as xt
+
+from sad2xs import evaluate_expressions
+from sad2xs.config import Config
+from sad2xs.converter._001_parser import parse_sad_file
+from sad2xs.converter._003_expression_converter import convert_expressions
+
+################################################################################
+# Test Deck
+################################################################################
+SAD_DECK    = """
+MOMENTUM = 45.6 GEV;
+
+k0 = 0.1;
+k1 = k0 * 2 + 1e-3;
+k2 = Sqrt[k1] - k0^2;
+k3 = -k2 / (k1 + 1);
+k4 = ArcTan[k3, k2] + Log[k1] + Pi;
+k5 = k4 * k3 + k2 * k1 + k0;
+kq = 0.5 * k5;
+kd = -kq * 0.5;
+kp = k0 * p0c / 1e9;
+
+QUAD QF = (L = 0.5 K1 = kq) QD = (L = 0.5 K1 = kd);
+LINE RING = (QF QD);
+"""
+
+################################################################################
+# Support Functions
+################################################################################
+def get_environment_values(parsed_data: dict) -> dict[str, float]:
+    """
+    Value of every parsed expression, as evaluated by the environment
+    """
+    env = xt.Environment()
+    convert_expressions(parsed_data, env, Config(_verbose = False))
+    return {name: env[name] for name in parsed_data["expressions"]}
+
+################################################################################
+# PyTest Functions
+################################################################################
+def test_deck_values(tmp_path):
+    """
+    The table holds the values the environment evaluates, through a chain
+    of dependencies several levels deep
+    """
+    deck_path   = tmp_path / "deck.sad"
+    deck_path.write_text(SAD_DECK)
+    parsed_data = parse_sad_file(str(deck_path), Config(_verbose = False))
+
+    table       = evaluate_expressions(parsed_data)
+    env_values  = get_environment_values(parsed_data)
+
+    assert sorted(table.name) == sorted(parsed_data["expressions"])
+    for name, value in env_values.items():
+        assert table["value", name] == pytest.approx(value, rel = 1E-14), name
+
+    # Each expression follows those it depends on
+    order   = list(table.name)
+    assert order.index("k0") < order.index("k1") < order.index("k2") \
+        < order.index("k3") < order.index("k4") < order.index("k5") \
+        < order.index("kq") < order.index("kd")
+
+def test_invalid_values(tmp_path):
+    """
+    Invalid operations give nan, and undefined variables raise
+    """
+    parsed_data = {
+        "globals":      {},
+        "expressions":  {"a": -1.0, "b": "Sqrt[a]", "c": "b + 1"}}
+    table       = evaluate_expressions(parsed_data)
+    assert np.isnan(table["value", "b"])
+    assert np.isnan(table["value", "c"])
+
+    parsed_data["expressions"]["d"] = "e + 1"
+    with pytest.raises(ValueError, match = "'e'"):
+        evaluate_expressions(parsed_data)
+
+@pytest.mark.parametrize("lattice_name", [
+    "fccee_sol.sad", "fccee_tt_collimation.sad", "fccee_zh.sad"])
+def test_lattice_values(lattice_name):
+    """
+    The table matches the environment for the test lattices
+    """
+    lattice_path    = os.path.join(
+        os.path.dirname(__file__), "..", "lattice_tests", "lattices", lattice_name)
+    parsed_data     = parse_sad_file(lattice_path, Config(_verbose = False))
+
+    table           = evaluate_expressions(parsed_data)
+    env_values      = get_environment_values(parsed_data)
+
+    np.testing.assert_allclose(
+        [table["value", name] for name in env_values],
+        list(env_values.values()),
+        rtol    = 1E-13)
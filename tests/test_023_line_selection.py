@@ -0,0 +1,105 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import pytest
+
+from sad2xs.config import Config
+from sad2xs.converter._002_element_exclusion import get_line_sizes, select_line
+
+################################################################################
+# Test Data
+################################################################################
+def make_parsed_data() -> dict:
+    """
+    Parsed lattice with nested and reversed sub-lines, where the line with
+    the most elements is not the longest
+    """
+    return {
+        "globals":      {},
+        "expressions":  {"ld": 2.0, "lq": "ld / 4"},
+        "elements":     {
+            "drift":    {"d1": {"l": "ld"}, "d2": {"l": 0.25}},
+            "quad":     {"qf": {"l": 0.5, "k1": 0.1}, "qd": {"l": "lq", "k1": -0.1}},
+            "mark":     {"m1": {}}},
+        "lines":        {
+            "cell":     ["qf", "d1", "-qd", "d1"],
+            "arc":      ["cell", "-cell", "m1"],
+            "ring":     ["m1", "arc", "d2", "-arc"],
+            "ir":       ["m1", "d2", "m1", "d2", "m1", "d2", "m1", "d2", "m1",
+                        "d2", "m1", "d2", "m1", "d2", "m1", "d2", "m1", "d2", "m1"]}}
+
+################################################################################
+# PyTest Functions
+################################################################################
+def test_nested_line_sizes():
+    """
+    Sub-lines count with all their elements, whether reversed or not, and
+    lengths given by a name take its number value, otherwise zero
+    """
+    line_sizes  = get_line_sizes(make_parsed_data())
+
+    assert line_sizes["cell"] == (4.5, 4)
+    assert line_sizes["arc"] == (9.0, 9)
+    assert line_sizes["ring"] == (18.25, 20)
+    assert line_sizes["ir"] == (2.25, 19)
+
+def test_select_longest():
+    """
+    Without a name, the longest line is selected, not the one with the most
+    elements
+    """
+    config  = Config(_verbose = False)
+    assert select_line(make_parsed_data(), None, config) == "ring"
+
+    parsed_data = make_parsed_data()
+    parsed_data["lines"]["ir"] += ["d1"] * 10
+    assert select_line(parsed_data, None, config) == "ir"
+
+def test_select_most_elements():
+    """
+    If every line has zero length, the line with the most elements is
+    selected
+    """
+    parsed_data = {
+        "globals":      {},
+        "expressions":  {},
+        "elements":     {"mark": {"m1": {}, "m2": {}}},
+        "lines":        {
+            "short":    ["m1", "m2"],
+            "long":     ["short", "-short", "m1"],
+            "single":   ["m2"]}}
+    assert select_line(parsed_data, None, Config(_verbose = False)) == "long"
+
+def test_select_named():
+    """
+    A given name is selected whatever its case, and an unknown name raises
+    """
+    config  = Config(_verbose = False)
+    assert select_line(make_parsed_data(), "ARC", config) == "arc"
+    assert select_line(make_parsed_data(), "Cell", config) == "cell"
+
+    with pytest.raises(ValueError, match = "Line missing not found"):
+        select_line(make_parsed_data(), "missing", config)
+
+def test_cyclic_lines():
+    """
+    Lines containing each other, directly or through a reversed sub-line,
+    raise
+    """
+    config      = Config(_verbose = False)
+    parsed_data = make_parsed_data()
+    parsed_data["lines"]["cell"].append("-arc")
+
+    with pytest.raises(ValueError, match = "Circular dependency between lines"):
+        get_line_sizes(parsed_data)
+    with pytest.raises(ValueError, match = "Circular dependency between lines"):
+        select_line(parsed_data, None, config)
+
+    parsed_data = make_parsed_data()
+    parsed_data["lines"]["self"] = ["m1", "self"]
+    with pytest.raises(ValueError, match = "self -> self"):
+        get_line_sizes(parsed_data)
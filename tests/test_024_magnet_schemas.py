@@ -0,0 +1,126 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import pytest
+import xtrack as xt
+
+from sad2xs.converter._004_element_converter import MAGNET_SCHEMAS, convert_magnets
+from sad2xs.environment_staging import StagedEnvironment
+
+################################################################################
+# Support Functions
+################################################################################
+def get_environment(
+        section:        dict,
+        element_type:   str,
+        variables:      dict[str, float] | None = None) -> xt.Environment:
+    """
+    Environment with the magnets of a section converted by their schema
+    """
+    env                 = xt.Environment()
+    for name, value in (variables or {}).items():
+        env[name]   = value
+    staged_environment  = StagedEnvironment(environment = env)
+    convert_magnets(section, MAGNET_SCHEMAS[element_type], staged_environment)
+    staged_environment.commit()
+    return env
+
+def make_section(strength: str, skew_angle: float, length, value, rotation) -> dict:
+    """
+    Magnets with the same strength, rotated by an angle, and made skew by a
+    rotation of each sign
+    """
+    return {
+        "mrot":     {"l": length, strength: value, "rotate": rotation, "dx": 1E-3},
+        "mskewp":   {"l": length, strength: value, "rotate": -skew_angle, "dy": 2E-3},
+        "mskewm":   {"l": length, strength: value, "rotate": +skew_angle}}
+
+################################################################################
+# PyTest Functions
+################################################################################
+@pytest.mark.parametrize("element_type", MAGNET_SCHEMAS)
+def test_rotated_magnets(element_type):
+    """
+    Strengths are per unit length, SAD rotations change sign, and magnets
+    rotated by the skew angle get the skew strength without the rotation
+    """
+    schema      = MAGNET_SCHEMAS[element_type]
+    normal      = schema["normal"]
+    skew        = schema["skew"]
+    env         = get_environment(
+        make_section(schema["strength"], schema["skew_angle"], 0.5, 0.2, 0.1),
+        element_type)
+
+    for name in ("mrot", "mskewp", "mskewm"):
+        assert isinstance(env[name], schema["parent"])
+        assert env[name].length == 0.5
+
+    assert env["mrot"].rot_s_rad == pytest.approx(-0.1)
+    assert env["mrot"].shift_x == 1E-3
+    assert getattr(env["mrot"], normal) == pytest.approx(0.4)
+    assert getattr(env["mrot"], skew) == 0.0
+    assert env[f"{normal}_mrot"] == pytest.approx(0.4)
+
+    assert env["mskewp"].rot_s_rad == pytest.approx(0.0)
+    assert env["mskewp"].shift_y == 2E-3
+    assert getattr(env["mskewp"], normal) == 0.0
+    assert getattr(env["mskewp"], skew) == pytest.approx(-0.4)
+
+    assert env["mskewm"].rot_s_rad == pytest.approx(0.0)
+    assert getattr(env["mskewm"], skew) == pytest.approx(+0.4)
+
+@pytest.mark.parametrize("element_type", MAGNET_SCHEMAS)
+def test_rotated_magnet_expressions(element_type):
+    """
+    Magnets with expressions get the same values as with numbers, and the
+    expressions stay live
+    """
+    schema      = MAGNET_SCHEMAS[element_type]
+    normal      = schema["normal"]
+    skew        = schema["skew"]
+    variables   = {"lm": 0.5, "km": 0.2, "am": 0.1}
+    env         = get_environment(
+        make_section(schema["strength"], schema["skew_angle"], "lm", "km + 0", "am"),
+        element_type,
+        variables)
+    numeric_env = get_environment(
+        make_section(schema["strength"], schema["skew_angle"], 0.5, 0.2, 0.1),
+        element_type)
+
+    for name in ("mrot", "mskewp", "mskewm"):
+        for attribute in ("length", normal, skew, "rot_s_rad", "shift_x", "shift_y"):
+            assert getattr(env[name], attribute) == pytest.approx(
+                getattr(numeric_env[name], attribute), abs = 1E-15), (name, attribute)
+
+    env["am"]   = 0.3
+    env["km"]   = 0.1
+    assert env["mrot"].rot_s_rad == pytest.approx(-0.3)
+    assert getattr(env["mrot"], normal) == pytest.approx(0.2)
+    assert getattr(env["mskewp"], skew) == pytest.approx(-0.2)
+
+@pytest.mark.parametrize("element_type", MAGNET_SCHEMAS)
+def test_zero_length_magnet(element_type):
+    """
+    A magnet with a zero length raises, with or without a strength
+    """
+    schema  = MAGNET_SCHEMAS[element_type]
+    for parameters in ({"l": 0.0, schema["strength"]: 0.1}, {"l": 0.0}):
+        with pytest.raises(ValueError, match = "m0 has zero length"):
+            get_environment({"m0": parameters}, element_type)
+
+@pytest.mark.parametrize("element_type", MAGNET_SCHEMAS)
+def test_missing_length_magnet(element_type):
+    """
+    A magnet without a length raises, or is installed as a marker
+    """
+    schema  = MAGNET_SCHEMAS[element_type]
+    section = {"m0": {schema["strength"]: 0.1}}
+    if schema["missing_length"] == "marker":
+        assert isinstance(get_environment(section, element_type)["m0"], xt.Marker)
+    else:
+        with pytest.raises(ValueError, match = "m0 missing length"):
+            get_environment(section, element_type)
@@ -0,0 +1,76 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import pytest
+import xtrack as xt
+
+from sad2xs.config import Config
+from sad2xs.converter._004_element_converter import (
+    convert_multipoles, get_multipole_order)
+from sad2xs.environment_staging import StagedEnvironment
+
+################################################################################
+# PyTest Functions
+################################################################################
+def test_multipole_order():
+    """
+    The order is the highest index at which knl or ksl is non zero
+    """
+    assert get_multipole_order([0.0, 0.0, 0.0], [0.0, 0.0], 1E-12) == 0
+    assert get_multipole_order([0.1, 0.0, 0.0], [0.0, 0.0], 1E-12) == 0
+    assert get_multipole_order([0.0, 0.2, 0.0, 0.1, 0.0], [0.0] * 5, 1E-12) == 3
+    assert get_multipole_order([0.0, 0.2, 0.0], [0.0, 0.0, 0.0, 0.0, 0.3], 1E-12) == 4
+    assert get_multipole_order([0.0, 0.0, 0.0, 0.5], [0.0, 0.1], 1E-12) == 3
+    assert get_multipole_order([], [], 1E-12) == 0
+
+def test_multipole_order_tolerance():
+    """
+    Values within the tolerance count as zero, whatever their sign
+    """
+    assert get_multipole_order([0.0, 0.2, 1E-13, -1E-13], [0.0, 0.0, -1E-14], 1E-12) == 1
+    assert get_multipole_order([0.0, 0.2, 1E-13, -1E-11], [0.0], 1E-12) == 3
+    assert get_multipole_order([0.0, 0.2, 0.0, 1E-3], [0.0], 1E-2) == 1
+
+def test_multipole_order_expressions():
+    """
+    Expressions count as non zero, as their value may change, and numeric
+    strings by their value
+    """
+    assert get_multipole_order([0.0, 0.2, "k2_m * 0", 0.0], [0.0], 1E-12) == 2
+    assert get_multipole_order([0.0, 0.2], [0.0, 0.0, 0.0, "-ks"], 1E-12) == 3
+    assert get_multipole_order([0.0, 0.2, "0.0", "1E-15"], [0.0], 1E-12) == 1
+    assert get_multipole_order([0.0, 0.2, "0.0", " 0.3 "], [0.0], 1E-12) == 3
+
+def test_converted_multipole_order():
+    """
+    Multipoles are created with their highest non zero order, and only the
+    strengths up to it
+    """
+    config      = Config(_verbose = False, SIMPLIFY_MULTIPOLES = False)
+    env         = xt.Environment()
+    env["ks"]   = 0.05
+    staged_environment  = StagedEnvironment(environment = env)
+    convert_multipoles(
+        parsed_elements = {"mult": {
+            "m1":   {"l": 0.5, "k1": 0.1, "k2": 0.2},
+            "m2":   {"l": 0.5, "k1": 0.1, "sk5": "ks", "k7": 1E-14},
+            "m3":   {"l": 0.5, "k2": 0.3, "sk3": -1E-13},
+            "m4":   {"l": 0.5}}},
+        environment                 = staged_environment,
+        user_multipole_replacements = None,
+        config                      = config)
+    staged_environment.commit()
+
+    assert [env[name].order for name in ("m1", "m2", "m3", "m4")] == [2, 5, 2, 0]
+    assert list(env["m1"].knl) == [0.0, 0.1, 0.2]
+    assert list(env["m2"].knl) == [0.0, 0.1, 0.0, 0.0, 0.0, 0.0]
+    assert env["m2"].ksl[5] == pytest.approx(0.05)
+    assert list(env["m3"].knl) == [0.0, 0.0, 0.3]
+    assert list(env["m4"].knl) == [0.0]
+
+    env["ks"]   = 0.5
+    assert env["m2"].ksl[5] == pytest.approx(0.5)
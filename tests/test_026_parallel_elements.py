@@ -0,0 +1,89 @@
+"""
+(Unofficial) SAD to XSuite Converter
+"""
+
+################################################################################
+# Required Packages
+################################################################################
+import os
+import numpy as np
+import pytest
+import xtrack as xt
+
+from sad2xs.config import Config
+from sad2xs.converter._001_parser import parse_sad_file
+from sad2xs.converter._003_expression_converter import convert_expressions
+from sad2xs.converter._004_element_converter import convert_elements
+
+################################################################################
+# Support Functions
+################################################################################
+def get_environment(lattice_name: str, **settings) -> xt.Environment:
+    """
+    Environment with the variables and elements of a test lattice
+    """
+    config          = Config(_verbose = False, **settings)
+    lattice_path    = os.path.join(
+        os.path.dirname(__file__), "..", "lattice_tests", "lattices", lattice_name)
+    parsed_data     = parse_sad_file(lattice_path, config)
+
+    env = xt.Environment()
+    convert_expressions(parsed_data, env, config)
+    convert_elements(parsed_data, env, None, config)
+    return env
+
+def get_expressions(env: xt.Environment) -> dict[str, str]:
+    """
+    Expression of every element attribute that has one
+    """
+    expressions = {}
+    for ele_name, element in env.element_dict.items():
+        for field in getattr(type(element), "_xofields", {}):
+            if field.startswith("_"):
+                continue
+            expression  = getattr(env.ref[ele_name], field)._expr
+            if expression is not None:
+                expressions[ele_name, field]    = str(expression)
+    return expressions
+
+################################################################################
+# PyTest Functions
+################################################################################
+@pytest.mark.parametrize("deduplicate", [False, True])
+@pytest.mark.parametrize("lattice_name", [
+    "fccee_sol.sad", "fccee_tt_collimation.sad", "fccee_zh.sad"])
+def test_parallel_elements(lattice_name, deduplicate):
+    """
+    Converting in worker processes gives the same variables and elements,
+    in the same order, as converting serially
+    """
+    serial_env      = get_environment(
+        lattice_name,
+        DEDUPLICATE_ELEMENTS    = deduplicate)
+    parallel_env    = get_environment(
+        lattice_name,
+        DEDUPLICATE_ELEMENTS            = deduplicate,
+        ELEMENT_WORKERS                 = 2,
+        ELEMENT_PARALLEL_MIN_ELEMENTS   = 0)
+
+    assert list(parallel_env.element_dict) == list(serial_env.element_dict)
+    for ele_name, element in serial_env.element_dict.items():
+        np.testing.assert_equal(
+            parallel_env.element_dict[ele_name].to_dict(), element.to_dict(), ele_name)
+    assert get_expressions(parallel_env) == get_expressions(serial_env)
+
+    assert list(parallel_env.vars.keys()) == list(serial_env.vars.keys())
+    for name in serial_env.vars.keys():
+        assert parallel_env[name] == serial_env[name], name
+
+def test_parallel_threshold(monkeypatch):
+    """
+    Lattices with fewer elements than the threshold are converted serially
+    """
+    def fail(*args, **kwargs):
+        raise AssertionError("Converted in worker processes")
+
+    monkeypatch.setattr(
+        "sad2xs.converter._004_element_converter.convert_elements_parallel", fail)
+    env = get_environment("fccee_sol.sad", ELEMENT_WORKERS = 2)
+    assert len(env.element_dict) > 0